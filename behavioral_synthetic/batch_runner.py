@@ -0,0 +1,280 @@
+"""Runs step one of the generation notebook (summary statistics json to synthetic data tsv) for whole batches of tables in one command.
+
+Tables are generated in a pool of worker processes, one table per task.  Each target directory keeps a manifest recording, for every completed output file, the sha256 checksums of the summary statistics it was generated from and of the file itself, along with the time taken and the peak memory of the worker.  A table is skipped when its manifest entry shows that its output is complete and up to date, so an interrupted run can simply be started again.
+
+Example, for two batches:
+    python -m behavioral_synthetic.batch_runner --batch "JSON files/BATCH1" "TSV files/BATCH1" --batch "JSON files/BATCH2" "TSV files/BATCH2" --n-jobs 4
+"""
+
+import argparse
+from collections.abc import Callable, Hashable
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from datetime import datetime
+import hashlib
+import json
+import logging
+import os
+import sys
+import tempfile
+import time
+
+import pandas as pd
+
+from .tables.Table import Table
+
+MANIFEST_NAME = "manifest.json"
+
+logger = logging.getLogger(__name__)
+
+def file_sha256(path: str) -> str:
+    """Computes the sha256 checksum of a file, reading it in blocks.
+
+    Args:
+        path (str): File path.
+
+    Returns:
+        str: Hexadecimal sha256 digest.
+    """
+
+    digest = hashlib.sha256()
+    with open(path, 'rb') as file:
+        for block in iter(lambda: file.read(1 << 20), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+def read_manifest(directory: str) -> dict:
+    """Reads the manifest of a target directory.
+
+    Args:
+        directory (str): Target directory.
+
+    Returns:
+        dict: Manifest entry of each completed output file, keyed by file name.  Empty if there is no manifest yet.
+    """
+
+    path = os.path.join(directory, MANIFEST_NAME)
+    if not os.path.isfile(path):
+        return {}
+    with open(path, 'r') as file:
+        return json.load(file)
+
+def write_json(path: str, data: dict, sort_keys: bool = True):
+    """Writes a json file.  It is written to a temporary file in the same directory and moved into place, so an interrupted run never leaves a partly written file.
+
+    Args:
+        path (str): File path.
+        data (dict): Data to be written.
+        sort_keys (bool, optional): If True, the keys of every object are written in sorted order. Defaults to True.
+    """
+
+    file_descriptor, temporary_path = tempfile.mkstemp(dir=os.path.dirname(os.path.abspath(path)), suffix='.tmp')
+    try:
+        with os.fdopen(file_descriptor, 'w') as file:
+            json.dump(data, file, indent=4, sort_keys=sort_keys)
+        os.replace(temporary_path, path)
+    except BaseException:
+        os.remove(temporary_path)
+        raise
+
+def write_manifest(directory: str, manifest: dict):
+    """Writes the manifest of a target directory with write_json().
+
+    Args:
+        directory (str): Target directory.
+        manifest (dict): Manifest entry of each completed output file, keyed by file name.
+    """
+
+    write_json(os.path.join(directory, MANIFEST_NAME), manifest)
+
+def is_complete(entry: dict | None, source_path: str, output_path: str) -> bool:
+    """Tests whether an output file is complete and up to date according to its manifest entry.
+
+    Args:
+        entry (dict | None): Manifest entry of the output file, or None if it has none.
+        source_path (str): Path of the summary statistics file.
+        output_path (str): Path of the output file.
+
+    Returns:
+        bool: True if the output file exists, matches its recorded checksum and was generated from the current summary statistics.
+    """
+
+    if entry is None or not os.path.isfile(output_path):
+        return False
+    return entry["source_sha256"] == file_sha256(source_path) and entry["sha256"] == file_sha256(output_path)
+
+def peak_memory_mb() -> float | None:
+    """Gives the peak resident memory of the current process.
+
+    Uses the resource module where it exists (Linux and macOS), and psutil's peak working set on Windows.
+
+    Returns:
+        float | None: Peak resident memory in MiB, or None if it can't be measured.
+    """
+
+    try:
+        import resource
+    except ImportError: # not available on Windows
+        try:
+            import psutil
+        except ImportError:
+            return None
+        return psutil.Process().memory_info().peak_wset / 2**20
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / 2**20 if sys.platform == 'darwin' else peak / 2**10 # bytes on macOS, KiB on Linux
+
+def run_in_workers(function: Callable[[tuple], dict], jobs: dict[Hashable, tuple], n_jobs: int | None, record: Callable[[Hashable, dict | None, BaseException | None], None]):
+    """Runs each job in its own worker process, so the peak memory of a worker is that of a single job.  This holds when running serially too, with a pool of one worker.
+
+    Args:
+        function (Callable[[tuple], dict]): Module-level function run on each job, returning its manifest entry.
+        jobs (dict[Hashable, tuple]): Arguments of each job, by key.
+        n_jobs (int, optional): Number of worker processes.  None or 1 runs the jobs serially, one worker process after another; -1 uses one worker per CPU.
+        record (Callable[[Hashable, dict | None, BaseException | None], None]): Called in this process as each job completes, with its key and either its entry or the exception it raised.
+    """
+
+    if n_jobs is None:
+        max_workers = 1
+    else:
+        max_workers = os.cpu_count() if n_jobs == -1 else n_jobs
+    with ProcessPoolExecutor(max_workers=max_workers, max_tasks_per_child=1) as executor:
+        futures = {executor.submit(function, job): key for key, job in jobs.items()}
+        for future in as_completed(futures):
+            error = future.exception()
+            record(futures[future], None if error is not None else future.result(), error)
+
+def generate_table_file(job: tuple[str, str, int | None, int]) -> dict:
+    """Worker function: generates the synthetic data of one table and writes it to a tsv file, as step one of the generation notebook does.
+
+    Args:
+        job (tuple[str, str, int | None, int]): Path of the summary statistics json file, path of the output file, table-level seed (None for fresh entropy) and number of rows held in memory at once.
+
+    Returns:
+        dict: Manifest entry of the output file.
+    """
+
+    source_path, output_path, seed, chunk_size = job
+    start = time.perf_counter()
+    with open(source_path, 'r') as file:
+        table_definition = json.load(file)
+
+    table = Table(table=pd.DataFrame(), table_name="")
+    table.read_in_table(table_definition)
+    table.generate_to_file(output_path, n_rows=table_definition['Number_of_rows'], format='tsv', chunk_size=chunk_size, seed=seed)
+
+    return {
+        "source": os.path.basename(source_path),
+        "source_sha256": file_sha256(source_path),
+        "sha256": file_sha256(output_path),
+        "rows": table_definition['Number_of_rows'],
+        "seed": seed,
+        "seconds": round(time.perf_counter() - start, 3),
+        "peak_memory_mb": peak_memory_mb(),
+        "completed": datetime.now().strftime("%Y-%m-%dT%H:%M:%S")
+    }
+
+def plan_jobs(source_directory: str, target_directory: str, files: list[str] | None = None, overwrite: bool = False) -> list[tuple[str, str]]:
+    """Lists the tables of a batch that still need to be generated.
+
+    Args:
+        source_directory (str): Directory of the summary statistics json files.
+        target_directory (str): Directory of the output tsv files and the manifest.
+        files (list[str], optional): Names of the tables to generate, without the .json suffix.  If None, every json file in the source directory is used. Defaults to None.
+        overwrite (bool, optional): If True, every table is generated again, even if its output is complete. Defaults to False.
+
+    Returns:
+        list[tuple[str, str]]: Path of the summary statistics file and of the output file of each table to generate.
+    """
+
+    if files is None:
+        files = sorted(os.path.splitext(name)[0] for name in os.listdir(source_directory) if name.endswith('.json'))
+
+    manifest = read_manifest(target_directory)
+    jobs = []
+    for name in files:
+        source_path = os.path.join(source_directory, f"{name}.json")
+        output_path = os.path.join(target_directory, f"{name}.tsv")
+        if not overwrite and is_complete(manifest.get(f"{name}.tsv"), source_path, output_path):
+            logger.info(f"{name}: synthetic data already generated.")
+        else:
+            jobs.append((source_path, output_path))
+    return jobs
+
+def run_batches(batches: list[tuple[str, str]], files: list[str] | None = None, n_jobs: int | None = None, overwrite: bool = False, seed: int | None = None, chunk_size: int = 100000) -> dict[str, list[str]]:
+    """Generates the synthetic data of every table in a set of batches, skipping tables whose output is already complete.
+
+    All the tables of all the batches share one pool of worker processes, and each worker process generates a single table, so its peak memory is that of the table.  This holds when generating serially too, with a pool of one worker.  The manifest of a target directory is updated as each of its tables completes.  A table that fails is logged and left out of the manifest, and the remaining tables carry on.
+
+    Args:
+        batches (list[tuple[str, str]]): Source directory of the summary statistics json files and target directory of the output tsv files of each batch.
+        files (list[str], optional): Names of the tables to generate in every batch, without the .json suffix.  If None, every json file in each source directory is used. Defaults to None.
+        n_jobs (int, optional): Number of worker processes.  None or 1 generates the tables serially, one worker process after another; -1 uses one worker per CPU. Defaults to None.
+        overwrite (bool, optional): If True, every table is generated again, even if its output is complete. Defaults to False.
+        seed (int, optional): Table-level seed used for every table.  If None, fresh entropy is used. Defaults to None.
+        chunk_size (int, optional): Number of rows held in memory at once while generating a table. Defaults to 100000.
+
+    Returns:
+        dict[str, list[str]]: Paths of the output files that were generated ("generated") and that failed ("failed").
+    """
+
+    jobs = []
+    for source_directory, target_directory in batches:
+        os.makedirs(target_directory, exist_ok=True)
+        jobs.extend(plan_jobs(source_directory, target_directory, files, overwrite))
+    logger.info(f"Generating {len(jobs)} tables.")
+
+    results = {"generated": [], "failed": []}
+
+    def record(output_path: str, entry: dict | None, error: BaseException | None):
+        if error is not None:
+            logger.error(f"{output_path}: generation failed: {error!r}")
+            results["failed"].append(output_path)
+            return
+        target_directory, output_file = os.path.split(output_path)
+        manifest = read_manifest(target_directory)
+        manifest[output_file] = entry
+        write_manifest(target_directory, manifest)
+        logger.info(f"{output_path}: {entry['rows']} rows in {entry['seconds']}s, peak memory {entry['peak_memory_mb']} MiB.")
+        results["generated"].append(output_path)
+
+    run_in_workers(generate_table_file, {output_path: (source_path, output_path, seed, chunk_size) for source_path, output_path in jobs}, n_jobs, record)
+    return results
+
+def main(argv: list[str] | None = None) -> int:
+    """Command line entry point.  Logs to the console and to a log file in each target directory, named as in the generation notebook.
+
+    Args:
+        argv (list[str], optional): Command line arguments.  If None, those of the current process are used. Defaults to None.
+
+    Returns:
+        int: Exit status: 0 if every table was generated, 1 otherwise.
+    """
+
+    parser = argparse.ArgumentParser(description="Generate synthetic data tsv files from summary statistics json files, for whole batches of tables.")
+    parser.add_argument("--batch", nargs=2, action='append', required=True, metavar=("SOURCE_DIRECTORY", "TARGET_DIRECTORY"), help="Directory of the summary statistics json files and directory of the output tsv files.  Repeat for each batch.")
+    parser.add_argument("--files", nargs='+', default=None, help="Names of the tables to generate, without the .json suffix.  Defaults to every json file in each source directory.")
+    parser.add_argument("--n-jobs", type=int, default=None, help="Number of worker processes; -1 uses one per CPU.  Defaults to generating serially.")
+    parser.add_argument("--overwrite", action='store_true', help="Generate every table again, even if its output is complete.")
+    parser.add_argument("--seed", type=int, default=None, help="Table-level seed used for every table.  Defaults to fresh entropy.")
+    parser.add_argument("--chunk-size", type=int, default=100000, help="Number of rows held in memory at once while generating a table.")
+    arguments = parser.parse_args(argv)
+
+    timestamp = datetime.now().strftime("%Y-%m-%dT%H_%M_%S")
+    handlers = [logging.StreamHandler()]
+    for _, target_directory in arguments.batch:
+        os.makedirs(target_directory, exist_ok=True)
+        handlers.append(logging.FileHandler(os.path.join(target_directory, f"SD_generation_log_{timestamp}.txt")))
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s: %(message)s", datefmt="%Y-%m-%dT%H:%M:%S", handlers=handlers, force=True)
+
+    results = run_batches(
+        [tuple(batch) for batch in arguments.batch],
+        files=arguments.files,
+        n_jobs=arguments.n_jobs,
+        overwrite=arguments.overwrite,
+        seed=arguments.seed,
+        chunk_size=arguments.chunk_size
+        )
+    logger.info(f"Generated {len(results['generated'])} tables, {len(results['failed'])} failed.")
+    return 1 if len(results["failed"]) > 0 else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,366 @@
+"""Generates the synthetic data of one large table as several shards, in worker processes on one machine or on several machines sharing a filesystem, then merges the shards into a single tsv file.
+
+A shard plan is written first.  It holds the table definition, the seed, and the rows of each shard, so any machine that can read the plan generates exactly the same shard from it.  Each shard is written with Table.generate_shard_to_file() to its own tsv file (only the first with the column header), together with a shard manifest recording its checksum, row count and per-column missing counts.  The merge step checks that every shard is complete, reads each shard file back to check its counts, checks that the row counts add up to the full table and that each column's missing values add up to the number given by its missing value frequency in the table definition, then concatenates the shard files and records the table in the manifest of the target directory with the per-column missing totals, as the batch runner does.
+
+Example, with the shards split over two machines:
+    python -m behavioral_synthetic.shard_runner plan "JSON files/BATCH1/large_table.json" "TSV files/BATCH1" --n-shards 8 --seed 1
+    python -m behavioral_synthetic.shard_runner run "TSV files/BATCH1/large_table.shards.json" --shards 0 1 2 3 --n-jobs 4    (on the first machine)
+    python -m behavioral_synthetic.shard_runner run "TSV files/BATCH1/large_table.shards.json" --shards 4 5 6 7 --n-jobs 4    (on the second machine)
+    python -m behavioral_synthetic.shard_runner merge "TSV files/BATCH1/large_table.shards.json"
+"""
+
+import argparse
+from datetime import datetime
+import json
+import logging
+import os
+import platform
+import shutil
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+from .batch_runner import file_sha256, peak_memory_mb, read_manifest, run_in_workers, write_json, write_manifest
+from .tables.Table import Table, shard_range, RANGE_BLOCK_SIZE
+
+PLAN_SUFFIX = ".shards.json"
+
+logger = logging.getLogger(__name__)
+
+def shard_file_name(name: str, shard_index: int, n_shards: int) -> str:
+    """Gives the file name of one shard of a table, without a suffix.
+
+    Args:
+        name (str): Table name, i.e. the name of its summary statistics file without the .json suffix.
+        shard_index (int): Position of the shard.
+        n_shards (int): Number of shards.
+
+    Returns:
+        str: File name of the shard, e.g. 'large_table.part00003-of-00008'.
+    """
+
+    return f"{name}.part{shard_index:05d}-of-{n_shards:05d}"
+
+def read_plan(plan_path: str) -> dict:
+    """Reads a shard plan written by plan_shards().
+
+    Args:
+        plan_path (str): Path of the shard plan.
+
+    Returns:
+        dict: The shard plan.
+    """
+
+    with open(plan_path, 'r') as file:
+        return json.load(file)
+
+def plan_shards(source_path: str, target_directory: str, n_shards: int, seed: int | None = None) -> str:
+    """Writes the shard plan of a table to its target directory.
+
+    The plan is written with its keys in their original order, since the order of the values of a categorical column in the table definition decides which values its random draws give.
+
+    Args:
+        source_path (str): Path of the summary statistics json file.
+        target_directory (str): Directory of the shard files, their manifests and the merged tsv file.
+        n_shards (int): Number of shards.
+        seed (int, optional): Table-level seed.  If None, one is drawn from fresh entropy and recorded in the plan, so that every shard uses the same one. Defaults to None.
+
+    Returns:
+        str: Path of the shard plan.
+    """
+
+    with open(source_path, 'r') as file:
+        table_definition = json.load(file)
+    if seed is None:
+        seed = np.random.SeedSequence().entropy
+    name = os.path.splitext(os.path.basename(source_path))[0]
+    total_rows = table_definition['Number_of_rows']
+
+    shards = []
+    for shard_index in range(n_shards):
+        start, stop = shard_range(shard_index, n_shards, total_rows)
+        shards.append({"index": shard_index, "start": start, "stop": stop, "file": f"{shard_file_name(name, shard_index, n_shards)}.tsv"})
+
+    os.makedirs(target_directory, exist_ok=True)
+    plan_path = os.path.join(target_directory, f"{name}{PLAN_SUFFIX}")
+    write_json(plan_path, {
+        "name": name,
+        "source": os.path.basename(source_path),
+        "source_sha256": file_sha256(source_path),
+        "table_definition": table_definition,
+        "total_rows": total_rows,
+        "n_shards": n_shards,
+        "seed": seed,
+        "range_block_size": RANGE_BLOCK_SIZE,
+        "shards": shards
+    }, sort_keys=False)
+    return plan_path
+
+def shard_manifest_path(plan_path: str, plan: dict, shard_index: int) -> str:
+    """Gives the path of the manifest of one shard, next to the shard plan."""
+
+    return os.path.join(os.path.dirname(plan_path), f"{shard_file_name(plan['name'], shard_index, plan['n_shards'])}.json")
+
+def is_shard_complete(plan_path: str, plan: dict, shard_index: int) -> bool:
+    """Tests whether a shard is complete according to its manifest.
+
+    Args:
+        plan_path (str): Path of the shard plan.
+        plan (dict): The shard plan.
+        shard_index (int): Position of the shard.
+
+    Returns:
+        bool: True if the shard file exists, matches its recorded checksum and was generated from the current plan.
+    """
+
+    manifest_path = shard_manifest_path(plan_path, plan, shard_index)
+    output_path = os.path.join(os.path.dirname(plan_path), plan["shards"][shard_index]["file"])
+    if not os.path.isfile(manifest_path) or not os.path.isfile(output_path):
+        return False
+    with open(manifest_path, 'r') as file:
+        entry = json.load(file)
+    return entry["plan_sha256"] == file_sha256(plan_path) and entry["sha256"] == file_sha256(output_path)
+
+def generate_shard_file(job: tuple[str, int, int]) -> dict:
+    """Worker function: generates one shard of a table and writes its tsv file and its manifest.
+
+    Args:
+        job (tuple[str, int, int]): Path of the shard plan, position of the shard and number of rows held in memory at once.
+
+    Raises:
+        ValueError: If the plan was made with a different RANGE_BLOCK_SIZE, so this machine would generate different rows.
+
+    Returns:
+        dict: Manifest of the shard.
+    """
+
+    plan_path, shard_index, chunk_size = job
+    start_time = time.perf_counter()
+    plan = read_plan(plan_path)
+    if plan["range_block_size"] != RANGE_BLOCK_SIZE:
+        raise ValueError(f"The shard plan of {plan['name']} uses row blocks of {plan['range_block_size']} rows, but this version of the library generates blocks of {RANGE_BLOCK_SIZE} rows.")
+    output_path = os.path.join(os.path.dirname(plan_path), plan["shards"][shard_index]["file"])
+
+    table = Table(table=pd.DataFrame(), table_name="")
+    table.read_in_table(plan["table_definition"])
+    written = table.generate_shard_to_file(output_path, shard_index, plan["n_shards"], plan["total_rows"], plan["seed"], format='tsv', chunk_size=chunk_size)
+
+    entry = {
+        "index": shard_index,
+        "plan_sha256": file_sha256(plan_path),
+        "sha256": file_sha256(output_path),
+        "start": written["start"],
+        "stop": written["stop"],
+        "rows": written["rows"],
+        "missing": written["missing"],
+        "empty": written["empty"],
+        "host": platform.node(),
+        "seconds": round(time.perf_counter() - start_time, 3),
+        "peak_memory_mb": peak_memory_mb(),
+        "completed": datetime.now().strftime("%Y-%m-%dT%H:%M:%S")
+    }
+    write_json(shard_manifest_path(plan_path, plan, shard_index), entry)
+    return entry
+
+def run_shards(plan_path: str, shards: list[int] | None = None, n_jobs: int | None = None, overwrite: bool = False, chunk_size: int = 100000) -> dict[str, list[int]]:
+    """Generates shards of a table, skipping shards that are already complete.
+
+    Each worker process generates a single shard, so its peak memory is that of the shard.  This holds when generating serially too, with a pool of one worker.  A shard that fails is logged and gets no manifest, and the remaining shards carry on.
+
+    Args:
+        plan_path (str): Path of the shard plan.
+        shards (list[int], optional): Positions of the shards to generate, e.g. the share of this machine.  If None, every shard is generated. Defaults to None.
+        n_jobs (int, optional): Number of worker processes.  None or 1 generates the shards serially, one worker process after another; -1 uses one worker per CPU. Defaults to None.
+        overwrite (bool, optional): If True, every shard is generated again, even if it is complete. Defaults to False.
+        chunk_size (int, optional): Number of rows held in memory at once while generating a shard. Defaults to 100000.
+
+    Returns:
+        dict[str, list[int]]: Positions of the shards that were generated ("generated") and that failed ("failed").
+    """
+
+    plan = read_plan(plan_path)
+    if shards is None:
+        shards = list(range(plan["n_shards"]))
+    jobs = []
+    for shard_index in shards:
+        if not overwrite and is_shard_complete(plan_path, plan, shard_index):
+            logger.info(f"{plan['name']}: shard {shard_index} already generated.")
+        else:
+            jobs.append(shard_index)
+    logger.info(f"{plan['name']}: generating {len(jobs)} of {plan['n_shards']} shards.")
+
+    results = {"generated": [], "failed": []}
+
+    def record(shard_index: int, entry: dict | None, error: BaseException | None):
+        if error is not None:
+            logger.error(f"{plan['name']}: shard {shard_index} failed: {error!r}")
+            results["failed"].append(shard_index)
+            return
+        logger.info(f"{plan['name']}: shard {shard_index}, {entry['rows']} rows in {entry['seconds']}s, peak memory {entry['peak_memory_mb']} MiB.")
+        results["generated"].append(shard_index)
+
+    run_in_workers(generate_shard_file, {shard_index: (plan_path, shard_index, chunk_size) for shard_index in jobs}, n_jobs, record)
+    return results
+
+def count_shard_file(path: str, columns: list[str], header: bool, chunk_size: int = 100000) -> tuple[int, dict[str, int]]:
+    """Counts the rows and the empty fields of each column in a shard file by reading it back.  Missing values and empty strings are both written as empty fields, so these are compared with the "empty" counts of the shard manifest.
+
+    Args:
+        path (str): Path of the shard file.
+        columns (list[str]): Column names, in order.
+        header (bool): Whether the file starts with the column header.
+        chunk_size (int, optional): Number of rows read at a time. Defaults to 100000.
+
+    Returns:
+        tuple[int, dict[str, int]]: Number of rows and number of empty fields in each column.
+    """
+
+    rows = 0
+    empty = {column: 0 for column in columns}
+    reader = pd.read_csv(path, sep='\t', header=0 if header else None, names=columns, dtype=str, keep_default_na=False, na_values=[''], chunksize=chunk_size)
+    for block in reader:
+        rows += len(block.index)
+        for column, count in block.isna().sum().items():
+            empty[column] += int(count)
+    return rows, empty
+
+def merge_shards(plan_path: str, recount: bool = True) -> dict:
+    """Checks that the shards of a table are complete and consistent, then concatenates them into the tsv file of the full table.
+
+    The checks are that every shard has a manifest from the current plan and matches its checksum, that each shard has the rows given to it by the plan, and that every shard counted missing values for the same columns.  With recount, each shard file is also read back to check its row and empty field counts against its manifest.  Then the shards' row counts must add up to the full table, and the missing values of each column to the number given by its missing value frequency in the table definition (see VariableType.missing_count()), which the generators place exactly.  The merged file is recorded in the manifest of the target directory, with the per-column missing totals, so the batch runner treats it as complete.
+
+    Args:
+        plan_path (str): Path of the shard plan.
+        recount (bool, optional): If True, the row and empty field counts of each shard file are checked by reading it. Defaults to True.
+
+    Raises:
+        ValueError: If any check fails.  The shard files are left as they are.
+
+    Returns:
+        dict: Manifest entry of the merged file.
+    """
+
+    start_time = time.perf_counter()
+    plan = read_plan(plan_path)
+    target_directory = os.path.dirname(plan_path)
+    plan_sha256 = file_sha256(plan_path)
+    table = Table(table=pd.DataFrame(), table_name="")
+    table.read_in_table(plan["table_definition"])
+    expected_missing = {column.COLUMN_NAME: column.missing_count(plan["total_rows"]) for column in table.column_types}
+    columns = list(expected_missing)
+
+    problems = []
+    entries = []
+    for shard in plan["shards"]:
+        manifest_path = shard_manifest_path(plan_path, plan, shard["index"])
+        output_path = os.path.join(target_directory, shard["file"])
+        if not os.path.isfile(manifest_path) or not os.path.isfile(output_path):
+            problems.append(f"shard {shard['index']} has not been generated")
+            continue
+        with open(manifest_path, 'r') as file:
+            entry = json.load(file)
+        if entry["plan_sha256"] != plan_sha256:
+            problems.append(f"shard {shard['index']} was generated from a different plan")
+        elif entry["sha256"] != file_sha256(output_path):
+            problems.append(f"shard {shard['index']} does not match its checksum")
+        elif (entry["start"], entry["stop"]) != (shard["start"], shard["stop"]) or entry["rows"] != shard["stop"] - shard["start"]:
+            problems.append(f"shard {shard['index']} has {entry['rows']} rows, not rows {shard['start']} to {shard['stop']}")
+        elif sorted(entry["missing"]) != sorted(columns) or sorted(entry["empty"]) != sorted(columns):
+            problems.append(f"shard {shard['index']} counted missing values for columns {sorted(entry['missing'])}, not {sorted(columns)}")
+        elif recount and count_shard_file(output_path, columns, header=(shard["index"] == 0)) != (entry["rows"], {column: entry["empty"][column] for column in columns}):
+            problems.append(f"shard {shard['index']} does not have the row or empty field counts in its manifest")
+        entries.append(entry)
+
+    rows = sum(entry["rows"] for entry in entries)
+    missing = {column: sum(entry["missing"][column] for entry in entries) for column in columns}
+    if not problems:
+        if rows != plan["total_rows"]:
+            problems.append(f"the shards have {rows} rows in total, not {plan['total_rows']}")
+        for column in columns:
+            if missing[column] != expected_missing[column]:
+                problems.append(f"column {column} has {missing[column]} missing values in total, not the {expected_missing[column]} given by the table definition")
+    if problems:
+        raise ValueError(f"Shards of {plan['name']} cannot be merged: " + "; ".join(problems) + ".")
+
+    output_file = f"{plan['name']}.tsv"
+    output_path = os.path.join(target_directory, output_file)
+    temporary_path = f"{output_path}.tmp"
+    with open(temporary_path, 'wb') as output:
+        for shard in plan["shards"]:
+            with open(os.path.join(target_directory, shard["file"]), 'rb') as file:
+                shutil.copyfileobj(file, output)
+    os.replace(temporary_path, output_path)
+
+    merged = {
+        "source": plan["source"],
+        "source_sha256": plan["source_sha256"],
+        "sha256": file_sha256(output_path),
+        "rows": rows,
+        "missing": missing,
+        "seed": plan["seed"],
+        "shards": plan["n_shards"],
+        "seconds": round(sum(entry["seconds"] for entry in entries) + time.perf_counter() - start_time, 3),
+        "peak_memory_mb": max((entry["peak_memory_mb"] for entry in entries if entry["peak_memory_mb"] is not None), default=None),
+        "completed": datetime.now().strftime("%Y-%m-%dT%H:%M:%S")
+    }
+    manifest = read_manifest(target_directory)
+    manifest[output_file] = merged
+    write_manifest(target_directory, manifest)
+    return merged
+
+def main(argv: list[str] | None = None) -> int:
+    """Command line entry point.  Logs to the console and to a log file in the target directory, named as in the generation notebook.
+
+    Args:
+        argv (list[str], optional): Command line arguments.  If None, those of the current process are used. Defaults to None.
+
+    Returns:
+        int: Exit status: 0 if the command succeeded, 1 otherwise.
+    """
+
+    parser = argparse.ArgumentParser(description="Generate the synthetic data tsv file of one large table as shards, on one or several machines.")
+    commands = parser.add_subparsers(dest="command", required=True)
+    plan_parser = commands.add_parser("plan", help="Write the shard plan of a table.")
+    plan_parser.add_argument("source", help="Path of the summary statistics json file.")
+    plan_parser.add_argument("target_directory", help="Directory of the shard files and the merged tsv file.")
+    plan_parser.add_argument("--n-shards", type=int, required=True, help="Number of shards.")
+    plan_parser.add_argument("--seed", type=int, default=None, help="Table-level seed.  Defaults to fresh entropy, recorded in the plan.")
+    run_parser = commands.add_parser("run", help="Generate shards of a planned table.")
+    run_parser.add_argument("plan", help="Path of the shard plan.")
+    run_parser.add_argument("--shards", type=int, nargs='+', default=None, help="Positions of the shards to generate.  Defaults to every shard.")
+    run_parser.add_argument("--n-jobs", type=int, default=None, help="Number of worker processes; -1 uses one per CPU.  Defaults to generating serially.")
+    run_parser.add_argument("--overwrite", action='store_true', help="Generate every shard again, even if it is complete.")
+    run_parser.add_argument("--chunk-size", type=int, default=100000, help="Number of rows held in memory at once while generating a shard.")
+    merge_parser = commands.add_parser("merge", help="Check the shards of a planned table and concatenate them.")
+    merge_parser.add_argument("plan", help="Path of the shard plan.")
+    merge_parser.add_argument("--skip-recount", action='store_true', help="Don't read each shard file back to check its row and empty field counts.")
+    arguments = parser.parse_args(argv)
+
+    target_directory = arguments.target_directory if arguments.command == "plan" else os.path.dirname(os.path.abspath(arguments.plan))
+    os.makedirs(target_directory, exist_ok=True)
+    timestamp = datetime.now().strftime("%Y-%m-%dT%H_%M_%S")
+    handlers = [logging.StreamHandler(), logging.FileHandler(os.path.join(target_directory, f"SD_generation_log_{timestamp}.txt"))]
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s: %(message)s", datefmt="%Y-%m-%dT%H:%M:%S", handlers=handlers, force=True)
+
+    match arguments.command:
+        case "plan":
+            plan_path = plan_shards(arguments.source, arguments.target_directory, arguments.n_shards, arguments.seed)
+            logger.info(f"Shard plan written to {plan_path}.")
+            return 0
+        case "run":
+            results = run_shards(arguments.plan, shards=arguments.shards, n_jobs=arguments.n_jobs, overwrite=arguments.overwrite, chunk_size=arguments.chunk_size)
+            logger.info(f"Generated {len(results['generated'])} shards, {len(results['failed'])} failed.")
+            return 1 if len(results["failed"]) > 0 else 0
+        case "merge":
+            try:
+                merged = merge_shards(arguments.plan, recount=not arguments.skip_recount)
+            except ValueError as error:
+                logger.error(str(error))
+                return 1
+            logger.info(f"Merged {merged['shards']} shards into {merged['rows']} rows.")
+            return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
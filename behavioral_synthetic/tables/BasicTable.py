@@ -3,11 +3,11 @@
 
 from abc import ABC, abstractmethod
 import gc
-import warnings
 
 import pandas as pd
 
 from .columns.NumericalVariable import NumericalVariable
+from .columns.ColumnProfile import ColumnProfile
 from .columns.CategoricalVariable import CategoricalVariable
 from .columns.DatetimeVariable import DatetimeVariable
 from .columns.EmptyVariable import EmptyVariable
@@ -23,8 +23,11 @@ class BasicTable(ABC):
             generate: Abstract method. Placeholder for subclass method generating a dataframe of synthetic data.
             dictionary_out: Abstract method. Placeholder for subclass method that outputs a description of the table in terms of column summary statistics.
             identify_variable_type: Contains heuristics used in automatically detecting column types.  Used by some subclasses.
+            identify_column_type: Applies the column type heuristics to a column passed in directly rather than by name, so it can be run away from the table (e.g. in a worker process).
     """
     
+    __SAMPLE_SEED = 0 # fixed, so that sampled type identification is reproducible.
+    
     @abstractmethod
     def __init__(self, table: pd.DataFrame, table_name: str, table_type: str):
         """Abstract constructor for tables.  
@@ -46,7 +49,9 @@ class BasicTable(ABC):
     def __strip_table_whitespace(self, table: pd.DataFrame) -> pd.DataFrame:
         """Private method for removing leading and trailing whitespace from strings in table.
         
-        This locates variables in the table that might be strings, and strips leading and trailing whitespace from them using lambda functions.
+        Only columns that can hold strings are touched, and each is stripped with a single vectorised pandas string operation and written back in place.  Numeric and datetime columns are left as they are.
+        
+        Object and string dtype columns are converted to str before stripping, so missing values become the text 'nan' (or '<NA>' for string dtype columns).  The column types rely on this: the string and categorical analyses turn 'nan' back into a missing value.  String dtype columns backed by pyarrow are stripped by Arrow before the conversion.  Categorical columns only have their categories stripped.
 
         Args:
             table (pandas.DataFrame): Table data to be stripped.
@@ -55,15 +60,13 @@ class BasicTable(ABC):
             pandas.DataFrame: Stripped data.
         """
         
-        for column in table.columns: # written to optimise memory
-            column_data = table[[column]].copy(deep=True)
-            column_data = column_data.map(lambda x: x.strip() if isinstance(x, str) else x)
-            #cols = original_data.select_dtypes(['object']).columns
-            if column_data[column].dtype == object:
-                column_data = column_data.astype(str).apply(lambda x: x.str.strip())
-            table[column]=column_data
-            del [[column_data]] #delete working column from memory
-            gc.collect() #garbage collect to make sure it's gone
+        for position, dtype in enumerate(table.dtypes): # by position, so that duplicated column names are handled
+            if dtype == object:
+                table.isetitem(position, table.iloc[:, position].astype(str).str.strip())
+            elif isinstance(dtype, pd.StringDtype):
+                table.isetitem(position, table.iloc[:, position].str.strip().astype(str))
+            elif isinstance(dtype, pd.CategoricalDtype):
+                table.isetitem(position, table.iloc[:, position].map(lambda x: x.strip() if isinstance(x, str) else x))
         return table
              
     def delete_table(self):
@@ -86,11 +89,12 @@ class BasicTable(ABC):
         raise NotImplementedError
     
     @abstractmethod
-    def generate(self, new_column_length: int) -> pd.DataFrame:
+    def generate(self, new_column_length: int, seed: int | None = None) -> pd.DataFrame:
         """Abstract placeholder for public method for generating synthetic version of a table.
 
         Args:
             new_column_length (int): Number of rows in each column
+            seed (int, optional): Table-level seed for the random number generators. Defaults to None.
 
         Raises:
             NotImplementedError: Is a placeholder method.
@@ -114,84 +118,169 @@ class BasicTable(ABC):
         
         raise NotImplementedError
     
-    def __check_if_datetime(self, column: pd.Series) -> bool:
+    @staticmethod
+    def __check_if_datetime(column: pd.Series, confidence: float = 1.0) -> bool:
         """Private method defining the heuristic for detecting datetime
 
         Args:
             column (pandas.Series): Column data.
+            confidence (float, optional): Share of values that must parse. Defaults to 1.0.
 
         Returns:
             bool: True if column is datetime, False otherwise.
         """
         
-        try:
-            # this would normally issue "UserWarning: Could not infer format, so each element will be parsed individually, falling back to `dateutil`. To ensure parsing is consistent and as-expected, please specify a format."
-            # However, we're only interested in whether it thinks the column as a whole is datetime rather than parsing specific values so we can suppress this without worry.
-            with warnings.catch_warnings():
-                warnings.simplefilter("ignore")
-                pd.to_datetime(column)
-        except (RuntimeError, TypeError, NameError, IOError, ValueError):
-            return False
-        else:
-            return True
+        return ColumnProfile(column).parses_as_datetime(confidence)
     
-    def __check_if_numeric(self, column: pd.Series) -> bool:
+    @staticmethod
+    def __check_if_numeric(column: pd.Series, confidence: float = 1.0) -> bool:
         """Private method defining the heuristic for detecting numerical columns.
 
         Args:
             column (pandas.Series): Column data.
+            confidence (float, optional): Share of values that must parse. Defaults to 1.0.
 
         Returns:
             bool: True if column is numeric, false if otherwise.
         """
         
-        try:
-            pd.to_numeric(column)
-        except (RuntimeError, TypeError, NameError, IOError, ValueError):
-            return False
+        return ColumnProfile(column).parses_as_numeric(confidence)
+    
+    @staticmethod
+    def __is_numeric(profile: ColumnProfile, confidence: float = 1.0) -> bool:
+        """Private method. The heuristic for numerical columns: the column is numeric, or predominantly numeric with a few distinct exceptions containing letters.
+
+        Args:
+            profile (ColumnProfile): Profile of the column.
+            confidence (float, optional): Share of values that must parse. Defaults to 1.0.
+
+        Returns:
+            bool: True if the column is numerical.
+        """
+        
+        column = profile.column
+        return (profile.parses_as_numeric(confidence) or
+                (profile.has_alpha.any() == True and 
+                 column[profile.has_alpha].nunique()<11 and 
+                 BasicTable.__check_if_numeric(column[profile.has_non_alpha], confidence) == True))
+    
+    @staticmethod
+    def __is_datetime(profile: ColumnProfile, confidence: float = 1.0) -> bool:
+        """Private method. The heuristic for datetime columns: the column is datetime, or predominantly datetime with a few distinct exceptions containing no numbers.
+
+        Args:
+            profile (ColumnProfile): Profile of the column.
+            confidence (float, optional): Share of values that must parse. Defaults to 1.0.
+
+        Returns:
+            bool: True if the column is datetime.
+        """
+        
+        column = profile.column
+        return (profile.parses_as_datetime(confidence) or
+                (profile.text[profile.has_digit == False].nunique() < 11 and
+                 BasicTable.__check_if_datetime(column[profile.has_digit == True], confidence) == True))
+    
+    @staticmethod
+    def __identify_content_type(profile: ColumnProfile, confidence: float = 1.0) -> str:
+        """Private method applying the heuristics that look at the content of the values, once the column is known to be neither empty nor categorical.
+
+        Args:
+            profile (ColumnProfile): Profile of the column.
+            confidence (float, optional): Share of values that must parse for the numerical and datetime tests. Defaults to 1.0.
+
+        Returns:
+            str: 'string', 'numeric' or 'datetime'.
+        """
+        
+        # If no numbers are present, we classify it as a string:
+        if(profile.has_digit.any() == False):
+            return 'string'
+        # We then check if it's numeric, or predominantly numeric with some exceptions:
+        elif(BasicTable.__is_numeric(profile, confidence)):
+            return 'numeric'
+        # next, we check if it's a date or a time, or predominantly datetime with some exceptions:
+        elif(BasicTable.__is_datetime(profile, confidence)):
+            return 'datetime'
+        # If none of the above apply, we classify the variable as string:
         else:
-            return True
+            return 'string'
 
     
-    def identify_variable_type(self, column_name: str, decimal_precision: int) -> EmptyVariable | CategoricalVariable | StringVariable | NumericalVariable | DatetimeVariable:
+    def identify_variable_type(self, column_name: str, decimal_precision: int, sample_size: int | None = None, confidence: float = 1.0, report: list | None = None) -> EmptyVariable | CategoricalVariable | StringVariable | NumericalVariable | DatetimeVariable:
         """Public method containing heuristics used to automatically identify column types and return an initialised column value of the appropriate type. Usually called by subclasses.
         
-        A series of heuristic tests is applied in a specific order to a column, ruling out possibilities in turn.  If all identifications fail, the column is assumered to consist of strings.
+        A series of heuristic tests is applied in a specific order to a column, ruling out possibilities in turn.  If all identifications fail, the column is assumered to consist of strings.  The counts, masks and trial parses the tests rely on are read from a ColumnProfile, so each is computed at most once, and a successful full column parse is handed to the variable type for reuse in its analyse() method.  See identify_column_type() for the sampling options.
 
         Args:
             column_name (str): Name of the column in the stored dataframe.
             decimal_precision (int): Numerical precision of numerical variables.
+            sample_size (int, optional): Number of non-null values sampled to choose a candidate type. If None, every test is run on the full column. Defaults to None.
+            confidence (float, optional): Share of the sampled values that must parse for the sample to count as numerical or datetime. Defaults to 1.0.
+            report (list, optional): List to which disagreements between the sample and the full column are appended. Defaults to None.
+
+        Returns:
+            EmptyVariable | CategoricalVariable | StringVariable | NumericalVariable | DatetimeVariable: Initialised column type value.
+        """
+        
+        return self.identify_column_type(self.table[column_name], decimal_precision, sample_size, confidence, report)
+    
+    @staticmethod
+    def identify_column_type(column: pd.Series, decimal_precision: int, sample_size: int | None = None, confidence: float = 1.0, report: list | None = None) -> EmptyVariable | CategoricalVariable | StringVariable | NumericalVariable | DatetimeVariable:
+        """Public method containing the heuristics behind identify_variable_type(), applied to a column passed in directly.  As it needs nothing from the table, it can be run in a worker process that has been sent a single column.
+        
+        The empty and categorical tests only count values, and always use the full column.  The remaining tests look at the content of the values, and their trial parses dominate the cost on large columns.  If sample_size is given and the column has more non-null values than that, these tests are first applied to a random sample of sample_size non-null values to choose a candidate type, with a parse counted as successful if at least the confidence share of the sample parses.  Only the candidate's own test is then run on the full column.  If the full column fails it, the full set of tests is run on the full column instead, and the disagreement is added to report.  A string candidate is accepted without a full column test, as confirming it would need the very trial parses that sampling avoids.
+
+        Args:
+            column (pandas.Series): Column data.
+            decimal_precision (int): Numerical precision of numerical variables.
+            sample_size (int, optional): Number of non-null values sampled to choose a candidate type.  If None, or the column has no more non-null values than this, every test is run on the full column. Defaults to None.
+            confidence (float, optional): Share of the sampled values that must parse for the sample to count as numerical or datetime. Defaults to 1.0.
+            report (list, optional): If given, a dictionary with keys "Name", "sample_type" and "full_type" is appended to it whenever the full column does not confirm the candidate type. Defaults to None.
+
+        Raises:
+            ValueError: If sample_size is not a positive integer or confidence is not in the interval (0, 1].
 
         Returns:
             EmptyVariable | CategoricalVariable | StringVariable | NumericalVariable | DatetimeVariable: Initialised column type value.
         """
         
+        if sample_size is not None and sample_size < 1:
+            raise ValueError(f"Sample size must be a positive integer, not {sample_size}.")
+        if not 0 < confidence <= 1:
+            raise ValueError(f"Confidence must be greater than 0 and at most 1, not {confidence}.")
+        
         #TODO: Pull out the magic numbers and replace wit private constants.
-        column = self.table[column_name]
+        profile = ColumnProfile(column)
         # Is the column empty? If so, it will be classified as 'NA':
-        if (column.dropna().empty == True):
+        if (profile.non_null_count == 0):
             return EmptyVariable(column)
         # Is the variable categorical? We check the number of unique values:
-        if ((column.dropna().shape[0] >= 300 and column.dropna().nunique()<100) or (column.dropna().nunique()<len(column)*0.3 and column.dropna().shape[0] < 300)):
+        if ((profile.non_null_count >= 300 and profile.unique_count<100) or (profile.unique_count<profile.length*0.3 and profile.non_null_count < 300)):
             return CategoricalVariable(column)
-        # If no numbers are present, we classify it as a string:
-        elif(column.astype(str).str.contains(r"[0-9]").any() == False):
-            return StringVariable(column)
-        # We then check if it's numeric, or predominantly numeric with some exceptions:
-        elif(self.__check_if_numeric(column) == True): 
-            type = NumericalVariable(column, decimal_precision)
-            return type #NumericalVariable(column, decimal_precision)
-        elif(column.astype(str).str.contains(r"[a-zA-Z]").any() == True and 
-             column[column.astype(str).str.contains(r"[a-zA-Z]")].nunique()<11 and 
-             self.__check_if_numeric(column[column.astype(str).str.contains(r"[^a-zA-Z]")]) == True):
-            type = NumericalVariable(column, decimal_precision)
-            return type # NumericalVariable(column, decimal_precision)
-        # next, we check if it's a date or a time, or predominantly datetime with some exceptions:
-        elif(self.__check_if_datetime(column) == True):
-            return DatetimeVariable(column)
-        elif(column.astype(str)[column.astype(str).str.contains(r"[0-9]") == False].nunique() < 11 and
-             self.__check_if_datetime(column[column.astype(str).str.contains(r"[0-9]") == True]) == True):
-            return DatetimeVariable(column)
-        # If none of the above apply, we classify the variable as string:
+        
+        if sample_size is None or profile.non_null_count <= sample_size:
+            content_type = BasicTable.__identify_content_type(profile)
         else:
-            return StringVariable(column)
+            sample = profile.non_null.sample(n=sample_size, random_state=BasicTable.__SAMPLE_SEED)
+            content_type = BasicTable.__identify_content_type(ColumnProfile(sample), confidence)
+            match content_type:
+                case 'numeric':
+                    confirmed = BasicTable.__is_numeric(profile)
+                case 'datetime':
+                    confirmed = BasicTable.__is_datetime(profile)
+                case _:
+                    confirmed = True
+            if not confirmed:
+                full_type = BasicTable.__identify_content_type(profile)
+                if report is not None:
+                    report.append({"Name": column.name, "sample_type": content_type, "full_type": full_type})
+                content_type = full_type
+        
+        match content_type:
+            case 'numeric':
+                return NumericalVariable(column, decimal_precision, parsed_column=profile.numeric)
+            case 'datetime':
+                return DatetimeVariable(column, parsed_column=profile.reusable_datetime)
+            case _:
+                return StringVariable(column)
@@ -1,17 +1,207 @@
 """Contains the class Table, which generates synthetic data from real data contained in a standard pandas dataframe.
 """
 
-import gc
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from contextlib import nullcontext
+from itertools import islice
+import json
+import os
+from typing import Callable, Iterable, Iterator
 
+import numpy as np
 import pandas as pd
 
 from .BasicTable import BasicTable
+from .TableCache import TableCache
+from .file_writers import open_writer
 
 from .columns.NumericalVariable import NumericalVariable
 from .columns.CategoricalVariable import CategoricalVariable
 from .columns.DatetimeVariable import DatetimeVariable
 from .columns.EmptyVariable import EmptyVariable
 from .columns.StringVariable import StringVariable
+from .columns.VariableType import VariableType
+from .columns.PartialStatistics import PartialStatistics
+from .columns.general_functions import read_data_chunks, split_count
+
+PARALLEL_BACKENDS = ['process', 'thread']
+RANGE_BLOCK_SIZE = 4096 # rows in each block of Table.generate_range(); changing it changes the data generated for a given seed
+
+def _worker_pool(n_jobs: int | None = None, backend: str = 'process') -> Executor | nullcontext:
+    """Opens a pool of worker processes or threads, to be used as a context manager and passed to _map_in_order() by every call made within it, so that a run of many blocks starts its workers only once.
+
+    Args:
+        n_jobs (int, optional): Number of workers.  None or 1 runs serially in this process; -1 uses one worker per CPU. Defaults to None.
+        backend (str, optional): 'process' or 'thread'. Defaults to 'process'.
+
+    Raises:
+        ValueError: If backend is not one of PARALLEL_BACKENDS.
+
+    Returns:
+        Executor | contextlib.nullcontext: The pool, or a context giving None if the work is to run serially.
+    """
+    
+    if backend not in PARALLEL_BACKENDS:
+        raise ValueError(f"Parallel backend {backend} is not supported. Use one of {PARALLEL_BACKENDS}.")
+    if n_jobs is None or n_jobs == 1:
+        return nullcontext(None)
+    
+    max_workers = os.cpu_count() if n_jobs == -1 else n_jobs
+    executor = ProcessPoolExecutor if backend == 'process' else ThreadPoolExecutor
+    return executor(max_workers=max_workers)
+
+def _map_in_order(function: Callable, arguments: Iterable, n_jobs: int | None = None, backend: str = 'process', pool: Executor | None = None) -> list:
+    """Applies a function to each argument, optionally in a pool of worker processes or threads, and returns the results in the order of the arguments.
+
+    Args:
+        function (Callable): Function of one argument.  Must be defined at module level if the process backend is used.
+        arguments (Iterable): Arguments to apply the function to.  Each one is sent to its worker once.
+        n_jobs (int, optional): Number of workers.  None or 1 runs serially in this process; -1 uses one worker per CPU.  Ignored if pool is given. Defaults to None.
+        backend (str, optional): 'process' or 'thread'.  Ignored if pool is given. Defaults to 'process'.
+        pool (Executor, optional): Pool opened by _worker_pool() to reuse.  If None, a pool is opened for this call only. Defaults to None.
+
+    Raises:
+        ValueError: If backend is not one of PARALLEL_BACKENDS.
+
+    Returns:
+        list: Results of the function, in the order of the arguments.
+    """
+    
+    if pool is not None:
+        return list(pool.map(function, arguments))
+    with _worker_pool(n_jobs, backend) as pool:
+        if pool is None:
+            return [function(argument) for argument in arguments]
+        return list(pool.map(function, arguments))
+
+def _identify_and_analyse(column_and_options: tuple[pd.Series, int, int | None, float]) -> tuple[VariableType, list[dict]]:
+    """Worker function: identifies the type of a single column using the table heuristics and analyses it.  Any disagreement found by sampled identification is returned alongside."""
+    
+    column, decimal_accuracy, sample_size, confidence = column_and_options
+    report = []
+    column_type = BasicTable.identify_column_type(column, decimal_accuracy, sample_size, confidence, report)
+    column_type.analyse()
+    return column_type, report
+
+def _analyse_column_type(column_type: VariableType) -> VariableType:
+    """Worker function: analyses a column whose type has already been assigned."""
+    
+    column_type.analyse()
+    return column_type
+
+def _update_partials(partials_and_block: tuple[list[PartialStatistics], pd.DataFrame]) -> list[PartialStatistics]:
+    """Worker function: strips the whitespace from a block of rows as the Table constructor does, then adds each of its columns to the matching partial statistics."""
+    
+    partials, block = partials_and_block
+    block = Table(table=block.copy(deep=False), table_name='').table
+    for i, partial in enumerate(partials):
+        partial.update(block.iloc[:, i])
+    return partials
+
+def _filtered_blocks(chunks: Iterable[pd.DataFrame], chunksize: int, filter: Callable[[pd.DataFrame], pd.Series] | None = None) -> Iterator[pd.DataFrame]:
+    """Keeps the rows of each block for which the filter is True and regroups them into blocks of chunksize rows (the last one may be shorter), so that filtering out most of a block doesn't leave a small first block to identify the column types from."""
+    
+    pending = []
+    pending_rows = 0
+    for chunk in chunks:
+        if filter is not None:
+            chunk = chunk[filter(chunk).to_numpy(dtype=bool)]
+        pending.append(chunk)
+        pending_rows += len(chunk.index)
+        if pending_rows >= chunksize:
+            combined = pd.concat(pending, ignore_index=True)
+            for start in range(0, pending_rows - chunksize + 1, chunksize):
+                yield combined.iloc[start:start + chunksize]
+            pending = [combined.iloc[pending_rows - pending_rows % chunksize:]]
+            pending_rows = pending_rows % chunksize
+    if pending_rows > 0:
+        yield pd.concat(pending, ignore_index=True)
+
+def _generate_column(column_length_and_rng: tuple[VariableType, int, np.random.Generator, int]) -> tuple[pd.Series, np.random.Generator]:
+    """Worker function: generates a block of a single column with a given number of missing rows.  The generator is returned as well, as a worker process advances its own copy of it."""
+    
+    column_type, new_column_length, rng, n_missing = column_length_and_rng
+    return column_type.generate(new_column_length, rng, n_missing), rng
+
+def shard_range(shard_index: int, n_shards: int, total_rows: int) -> tuple[int, int]:
+    """Gives the rows of one shard of a table split into n_shards contiguous shards of as near equal size as possible.
+
+    Args:
+        shard_index (int): Position of the shard, from 0 to n_shards - 1.
+        n_shards (int): Number of shards.
+        total_rows (int): Number of rows in the full table.
+
+    Raises:
+        ValueError: If n_shards is not a positive integer or shard_index is not a shard of it.
+
+    Returns:
+        tuple[int, int]: Row number of the first row of the shard and row number after its last row.
+    """
+    
+    if n_shards < 1:
+        raise ValueError(f"Number of shards must be a positive integer, not {n_shards}.")
+    if not 0 <= shard_index < n_shards:
+        raise ValueError(f"Shard {shard_index} is not one of the {n_shards} shards.")
+    return shard_index * total_rows // n_shards, (shard_index + 1) * total_rows // n_shards
+
+def _range_generator(seed: int, column_index: int, block_index: int) -> np.random.Generator:
+    """Creates the counter-based (Philox) random number generator of one row block of one column, keyed by the table-level seed, the position of the column and the position of the block."""
+    
+    return np.random.Generator(np.random.Philox(np.random.SeedSequence(seed, spawn_key=(column_index, 0, block_index))))
+
+def _split_generator(seed: int, column_index: int, first_block: int, stop_block: int) -> np.random.Generator:
+    """Creates the counter-based (Philox) random number generator that splits the missing values of a run of row blocks of one column between its two halves, keyed by the table-level seed, the position of the column and the run of blocks."""
+    
+    return np.random.Generator(np.random.Philox(np.random.SeedSequence(seed, spawn_key=(column_index, 1, first_block, stop_block))))
+
+def _block_missing_counts(n_missing: int, total_rows: int, seed: int, column_index: int, first_block: int, stop_block: int) -> dict[int, int]:
+    """Gives the number of missing values in each of a run of row blocks of one column, from the number in the whole column.
+    
+    The blocks of the column are halved repeatedly, and the missing values of each run of blocks are split between its halves with general_functions.split_count(), drawing from a generator keyed by the run.  Only the runs containing the wanted blocks are split, so any block's count can be found on its own, in a number of draws that grows with the logarithm of the number of blocks, and the counts of all the blocks add up to n_missing exactly.
+
+    Args:
+        n_missing (int): Number of missing values in the column.
+        total_rows (int): Number of rows in the column.
+        seed (int): Table-level seed.
+        column_index (int): Position of the column.
+        first_block (int): Position of the first wanted block.
+        stop_block (int): Position after the last wanted block.
+
+    Returns:
+        dict[int, int]: Number of missing values in each wanted block, keyed by block position.
+    """
+    
+    counts = {}
+    runs = [(0, -(-total_rows // RANGE_BLOCK_SIZE), n_missing)]
+    while runs:
+        low, high, count = runs.pop()
+        if high - low == 1:
+            counts[low] = count
+            continue
+        middle = (low + high) // 2
+        rows = min(high * RANGE_BLOCK_SIZE, total_rows) - low * RANGE_BLOCK_SIZE
+        low_count = split_count(count, rows, (middle - low) * RANGE_BLOCK_SIZE, _split_generator(seed, column_index, low, high))
+        if low < stop_block and middle > first_block:
+            runs.append((low, middle, low_count))
+        if middle < stop_block and high > first_block:
+            runs.append((middle, high, count - low_count))
+    return counts
+
+def _generate_column_range(column_and_range: tuple[VariableType, int, int, int, int, int]) -> pd.Series:
+    """Worker function: generates rows start to stop (exclusive) of a single column of a table of total_rows rows.  Each row block of RANGE_BLOCK_SIZE rows overlapping the range is generated in full from its own generator, with its share of the missing values of the column, and trimmed to the range."""
+    
+    column_type, column_index, start, stop, total_rows, seed = column_and_range
+    first_block, stop_block = start // RANGE_BLOCK_SIZE, -(-stop // RANGE_BLOCK_SIZE)
+    if first_block >= stop_block:
+        return column_type.generate(0, _range_generator(seed, column_index, first_block), 0)
+    
+    missing = _block_missing_counts(column_type.missing_count(total_rows), total_rows, seed, column_index, first_block, stop_block)
+    pieces = []
+    for block_index in range(first_block, stop_block):
+        block_start = block_index * RANGE_BLOCK_SIZE
+        block = column_type.generate(min(RANGE_BLOCK_SIZE, total_rows - block_start), _range_generator(seed, column_index, block_index), missing[block_index])
+        pieces.append(block.iloc[max(start - block_start, 0):stop - block_start])
+    return pd.concat(pieces, ignore_index=True)
 
 class Table(BasicTable):
     """ Subclass extending BasicTable. This contains methods for producing a dataframe of synthetic data from a dataframe of real data.
@@ -20,7 +210,18 @@ class Table(BasicTable):
             __init__: Constructor. Extends BasicTable.__init__().
             analyse: Uses heuristics to automatically determine the column type.  Overrides BasicTable.analyse().
             analyse_with_column_list: Specify column types using a list of dictionaries.
+            update_columns: Re-analyses only the columns whose data has changed.  Only use after invoking Table.analyse() or Table.analyse_with_column_list().
+            from_path: Creates a Table analysed straight from a data file read in blocks of rows.
+            analyse_chunk: Adds a block of rows to an analysis made one block at a time, for tables too large to hold in memory.
+            finalise_chunked_analysis: Completes an analysis made with analyse_chunk().
+            analyse_chunks: Analyses a table given as a sequence of row blocks, optionally in a pool of workers.
             generate: Use to generate a table containing SD.  Only use after invoking Table.analyse(), Table.analyse_with_column_list(), or Table.read_in_table(). Overrides BasicTable.generate().
+            generate_chunks: Use to generate a table containing SD as a sequence of row blocks.  Only use after invoking Table.analyse(), Table.analyse_with_column_list(), or Table.read_in_table().
+            generate_to_file: Use to generate a table containing SD and write it to a tsv, csv, parquet or feather file block by block.  Only use after invoking Table.analyse(), Table.analyse_with_column_list(), or Table.read_in_table().
+            generate_range: Use to generate any range of rows of a table containing SD independently of the rows before it.  Only use after invoking Table.analyse(), Table.analyse_with_column_list(), or Table.read_in_table().
+            generate_shard: Use to generate one of several shards of a table containing SD, which concatenate into the full table.  Only use after invoking Table.analyse(), Table.analyse_with_column_list(), or Table.read_in_table().
+            generate_shard_to_file: Use to generate one shard of a table containing SD and write it to a file block by block.  Only use after invoking Table.analyse(), Table.analyse_with_column_list(), or Table.read_in_table().
+            column_generators: Creates the per-column random number generators used by generate from a table-level seed.
             dictionary_out: Outputs a dictionary containing summary statistics of each table column.  Only use after invoking Table.analyse(), Table.analyse_with_column_list(), or Table.read_in_table(). Overrides BasicTable.dictionary_out().
             read_in_table: Reads in a table definition generated by Table.dictionary_out().
             delete_table: Mark real data in dataframe for deletion and call garbage collector.  Inherited from BasicTable.
@@ -40,46 +241,306 @@ class Table(BasicTable):
         """
         
         super().__init__(table, table_name, 'normal_table')
+        self.analyse_options = None # set by analyse(), and used by update_columns() to analyse corrected columns the same way
+        self.columns_list = None # set by analyse_with_column_list(), for the same purpose
+        self.partial_statistics = None # partial statistics of each column during a chunked analysis
+        self.chunk_columns = None # columns of the first block of a chunked analysis
         
-    def analyse(self, decimal_accuracy: int):
+    def analyse(self, decimal_accuracy: int, n_jobs: int | None = None, backend: str = 'process', sample_size: int | None = None, confidence: float = 1.0, cache: TableCache | None = None):
         """Public method. This uses a set of preset heuristics in order to automatically determine the nature and properties of each column.
         
         Each column in turn is subjected to the heuristics, which return a VariableType subclass instance corresponding to the column type.  The subclass analyse() method is called and the instance added to a list of column VariableType subclass instances that when complete corresponds to each column.
         
+        Columns are independent of each other, so if n_jobs is set they are analysed in a pool of workers.  Each worker is sent a single column rather than the whole table, and the results are collected in the original column order.
+        
+        For very large columns, sample_size makes the heuristics choose a candidate type from a random sample of the values and only confirm it on the full column (see BasicTable.identify_column_type()).  Columns where the full column disagreed with the sample are listed in type_inference_report.
+        
+        If a cache is given, each column is looked up by a fingerprint of its data and the analysis options, and only columns that are not in the cache are analysed (and then added to it).
+        
         Overrides BasicTable.analyse().
 
         Args:
             decimal_accuracy (int): Number of decimal places to use in numerical data columns.
+            n_jobs (int, optional): Number of workers.  None or 1 analyses the columns serially; -1 uses one worker per CPU. Defaults to None.
+            backend (str, optional): 'process' or 'thread'. Defaults to 'process'.
+            sample_size (int, optional): Number of non-null values sampled from each column to choose a candidate type.  If None, the heuristics are applied to the full columns. Defaults to None.
+            confidence (float, optional): Share of the sampled values that must parse for a column to be a numerical or datetime candidate. Defaults to 1.0.
+            cache (TableCache, optional): Cache of analysed columns. Defaults to None.
         """
         
-        self.column_types = []
-        for column in self.table.columns:
-            column_type = super().identify_variable_type(column, decimal_accuracy)
-            column_type.analyse()
-            self.column_types.append(column_type)
+        results = self.__map_with_cache(
+            _identify_and_analyse,
+            [(self.table[column], decimal_accuracy, sample_size, confidence) for column in self.table.columns],
+            [('heuristic', decimal_accuracy, sample_size, confidence) for _ in self.table.columns],
+            cache=cache,
+            n_jobs=n_jobs,
+            backend=backend
+            )
+        self.column_types = [column_type for column_type, _ in results]
+        self.type_inference_report = [disagreement for _, report in results for disagreement in report]
+        self.analyse_options = {"decimal_accuracy": decimal_accuracy, "sample_size": sample_size, "confidence": confidence}
+        self.columns_list = None
             
-    def generate(self, new_column_length: int) -> pd.DataFrame:
-        """Public method.   Generates synthetic data based on the table properties provided by analysis or input methods. Note that the garbage collector is called by this method.  Only call after invoking Table.analyse(), Table.analyse_with_column_list(), or Table.read_in_table().
+    def generate(self, new_column_length: int, seed: int | None = None, n_jobs: int | None = None, backend: str = 'process') -> pd.DataFrame:
+        """Public method.   Generates synthetic data based on the table properties provided by analysis or input methods.  Only call after invoking Table.analyse(), Table.analyse_with_column_list(), or Table.read_in_table().
         
-        For each column in the list of VariableType subclasses provided by Table.analyse(), Table.analyse_with_column_list(), or Table.read_in_table(), generate a pandas Series of synthetic data, append it column-wise to a new Dataframe, mark the data for deletion and call the garbage collector.
+        For each column in the list of VariableType subclasses provided by Table.analyse(), Table.analyse_with_column_list(), or Table.read_in_table(), generate a pandas Series of synthetic data, then join the columns into a new Dataframe.
+        
+        Each column draws from its own random number generator, spawned from the table-level seed, so the output is reproducible for a given seed.  As columns depend only on their own summary statistics and generator, they can be generated in a pool of workers; the output for a given seed is the same for any number of workers.
         
         Overrides BasicTable.generate().
 
         Args:
             new_column_length (int): number of rows in each column.
+            seed (int, optional): Table-level seed for the random number generators.  If None, fresh entropy is used. Defaults to None.
+            n_jobs (int, optional): Number of workers.  None or 1 generates the columns serially; -1 uses one worker per CPU. Defaults to None.
+            backend (str, optional): 'process' or 'thread'.  Threads are worthwhile where the column generators spend their time in NumPy. Defaults to 'process'.
 
         Returns:
             pandas.DataFrame: A dataframe containing the synthetic data.
         """
         
-        new_table = pd.DataFrame()
-        for column in self.column_types:
-            column_data = column.generate(new_column_length)
-            new_table[column_data.name] = column_data
-            del [[column_data]]
-            gc.collect()
-            
-        return new_table
+        missing = [column.missing_count(new_column_length) for column in self.column_types]
+        with _worker_pool(n_jobs, backend) as pool:
+            return self.__generate_block(self.column_generators(seed), missing, 0, new_column_length, new_column_length, pool)
+    
+    def generate_chunks(self, n_rows: int, chunk_size: int = 100000, seed: int | None = None, n_jobs: int | None = None, backend: str = 'process') -> Iterator[pd.DataFrame]:
+        """Public method. Generates synthetic data as a sequence of row blocks rather than one dataframe.  Only call after invoking Table.analyse(), Table.analyse_with_column_list(), or Table.read_in_table().
+        
+        Each column keeps its own random number generator across blocks, so only one block of the table is held in memory at a time.  The number of missing values of each column is worked out once for all n_rows rows, as in Table.generate(), and shared between the blocks, so the table has the same number of missing values however it is divided into blocks.  If n_jobs is set, one pool of workers is opened for all the blocks.  Blocks are indexed by their row numbers in the full table, so concatenating them gives a single table of n_rows rows.
+
+        Args:
+            n_rows (int): Total number of rows to generate.
+            chunk_size (int, optional): Maximum number of rows in each block. Defaults to 100000.
+            seed (int, optional): Table-level seed for the random number generators.  If None, fresh entropy is used. Defaults to None.
+            n_jobs (int, optional): Number of workers used to generate the columns of each block, as in Table.generate(). Defaults to None.
+            backend (str, optional): 'process' or 'thread'. Defaults to 'process'.
+
+        Raises:
+            ValueError: If chunk_size is not a positive integer.
+
+        Yields:
+            pandas.DataFrame: A block of at most chunk_size rows of synthetic data.
+        """
+        
+        if chunk_size < 1:
+            raise ValueError(f"Chunk size must be a positive integer, not {chunk_size}.")
+        
+        generators = self.column_generators(seed)
+        missing = [column.missing_count(n_rows) for column in self.column_types]
+        with _worker_pool(n_jobs, backend) as pool:
+            for start in range(0, n_rows, chunk_size):
+                yield self.__generate_block(generators, missing, start, min(start + chunk_size, n_rows), n_rows, pool)
+    
+    def generate_to_file(self, path: str, n_rows: int, format: str | None = None, chunk_size: int = 100000, seed: int | None = None, metadata: dict | str | None = None, n_jobs: int | None = None, backend: str = 'process'):
+        """Public method. Generates synthetic data and writes it straight to disk, one block of rows at a time.  Only call after invoking Table.analyse(), Table.analyse_with_column_list(), or Table.read_in_table().
+        
+        Blocks from Table.generate_chunks() are appended to the output file as they are produced, so the full table is never held in memory.  The tsv layout is the one read by the QA script (tab separated, with a header row and no index).
+
+        Args:
+            path (str): Path of the output file.
+            n_rows (int): Total number of rows to generate.
+            format (str, optional): One of 'tsv', 'csv', 'parquet' or 'feather'.  If None, it is inferred from the file suffix. Defaults to None.
+            chunk_size (int, optional): Maximum number of rows held in memory at once. Defaults to 100000.
+            seed (int, optional): Table-level seed for the random number generators.  If None, fresh entropy is used. Defaults to None.
+            metadata (dict | str, optional): Metadata for the file header.  In delimited files this is written as a first line starting with '# ' (dictionaries are written as json); in columnar files it is stored in the schema metadata. Defaults to None.
+            n_jobs (int, optional): Number of workers used to generate the columns of each block, as in Table.generate(). Defaults to None.
+            backend (str, optional): 'process' or 'thread'. Defaults to 'process'.
+        """
+        
+        writer = open_writer(path, format=format, metadata=metadata)
+        try:
+            for block in self.generate_chunks(n_rows, chunk_size=chunk_size, seed=seed, n_jobs=n_jobs, backend=backend):
+                writer.write(block)
+        finally:
+            writer.close()
+    
+    def generate_range(self, start: int, stop: int, total_rows: int, seed: int, n_jobs: int | None = None, backend: str = 'process') -> pd.DataFrame:
+        """Public method. Generates rows start to stop (exclusive) of a synthetic table of total_rows rows, without generating the rows before them.  Only call after invoking Table.analyse(), Table.analyse_with_column_list(), or Table.read_in_table().
+        
+        The rows of each column are divided into fixed blocks of RANGE_BLOCK_SIZE rows, and each block draws from its own counter-based (Philox) generator, keyed by the table-level seed, the position of the column and the position of the block.  Any range of rows is therefore the same whichever range it is generated as part of, and costs only the blocks it overlaps, e.g. a damaged part of a large output file can be generated again on its own.
+        
+        The number of missing values of each column is worked out once for all total_rows rows, as in Table.generate(), and split between the blocks by keyed draws (see _block_missing_counts()), so the whole table has exactly that number however it is divided into ranges.
+        
+        The rows differ from those of Table.generate() and Table.generate_chunks() for the same seed, as those draw each column from a single stream.
+
+        Args:
+            start (int): Row number of the first row.
+            stop (int): Row number after the last row.
+            total_rows (int): Number of rows in the full table.
+            seed (int): Table-level seed.  Required, as the range can only be reproduced from a fixed seed.
+            n_jobs (int, optional): Number of workers used to generate the columns, as in Table.generate(). Defaults to None.
+            backend (str, optional): 'process' or 'thread'. Defaults to 'process'.
+
+        Raises:
+            ValueError: If seed is None, or start and stop are not a valid range of row numbers in the table.
+
+        Returns:
+            pandas.DataFrame: A dataframe of stop - start rows, indexed by row number.
+        """
+        
+        if seed is None:
+            raise ValueError("A seed is required to generate a range of rows.")
+        if start < 0 or stop < start or stop > total_rows:
+            raise ValueError(f"Rows {start} to {stop} are not a valid range of row numbers in a table of {total_rows} rows.")
+        
+        with _worker_pool(n_jobs, backend) as pool:
+            return self.__generate_range(start, stop, total_rows, seed, pool)
+    
+    def __generate_range(self, start: int, stop: int, total_rows: int, seed: int, pool: Executor | None = None) -> pd.DataFrame:
+        """Private method. Generates rows start to stop (exclusive) of a synthetic table from the counter-based generators of Table.generate_range(), whose checks it leaves to the caller.
+
+        Args:
+            start (int): Row number of the first row.
+            stop (int): Row number after the last row.
+            total_rows (int): Number of rows in the full table.
+            seed (int): Table-level seed.
+            pool (Executor, optional): Pool of workers from _worker_pool().  None generates the columns serially. Defaults to None.
+
+        Returns:
+            pandas.DataFrame: A dataframe of stop - start rows, indexed by row number.
+        """
+        
+        index = pd.RangeIndex(start, stop)
+        columns = _map_in_order(
+            _generate_column_range,
+            ((column, column_index, start, stop, total_rows, seed) for column_index, column in enumerate(self.column_types)),
+            pool=pool
+            )
+        for column_data in columns:
+            column_data.index = index
+        
+        if not columns:
+            return pd.DataFrame(index=index)
+        return pd.concat(columns, axis=1)
+    
+    def generate_shard(self, shard_index: int, n_shards: int, total_rows: int, seed: int, n_jobs: int | None = None, backend: str = 'process') -> pd.DataFrame:
+        """Public method. Generates one of n_shards contiguous shards of a synthetic table of total_rows rows.  Only call after invoking Table.analyse(), Table.analyse_with_column_list(), or Table.read_in_table().
+        
+        The shard is generated with Table.generate_range(), so the shards can be generated in any order, on any machine, and concatenate into exactly the table given by Table.generate_range(0, total_rows, total_rows, seed).
+
+        Args:
+            shard_index (int): Position of the shard, from 0 to n_shards - 1.
+            n_shards (int): Number of shards.
+            total_rows (int): Number of rows in the full table.
+            seed (int): Table-level seed, the same for every shard.
+            n_jobs (int, optional): Number of workers used to generate the columns, as in Table.generate(). Defaults to None.
+            backend (str, optional): 'process' or 'thread'. Defaults to 'process'.
+
+        Returns:
+            pandas.DataFrame: The rows of the shard (see shard_range()), indexed by row number in the full table.
+        """
+        
+        start, stop = shard_range(shard_index, n_shards, total_rows)
+        return self.generate_range(start, stop, total_rows, seed, n_jobs=n_jobs, backend=backend)
+    
+    def generate_shard_to_file(self, path: str, shard_index: int, n_shards: int, total_rows: int, seed: int, format: str | None = None, chunk_size: int = 100000, n_jobs: int | None = None, backend: str = 'process') -> dict:
+        """Public method. Generates one shard of a synthetic table and writes it to disk, one block of rows at a time.  Only call after invoking Table.analyse(), Table.analyse_with_column_list(), or Table.read_in_table().
+        
+        Only the first shard is written with the column header, so delimited shard files concatenate in order into the file of the full table.  Blocks are aligned to the row blocks of Table.generate_range(), so no row block is generated twice.
+
+        Args:
+            path (str): Path of the output file.
+            shard_index (int): Position of the shard, from 0 to n_shards - 1.
+            n_shards (int): Number of shards.
+            total_rows (int): Number of rows in the full table.
+            seed (int): Table-level seed, the same for every shard.
+            format (str, optional): One of 'tsv', 'csv', 'parquet' or 'feather'.  If None, it is inferred from the file suffix. Defaults to None.
+            chunk_size (int, optional): Approximate number of rows held in memory at once.  Rounded down to a whole number of RANGE_BLOCK_SIZE row blocks, and to at least one. Defaults to 100000.
+            n_jobs (int, optional): Number of workers used to generate the columns of each block, as in Table.generate(). Defaults to None.
+            backend (str, optional): 'process' or 'thread'. Defaults to 'process'.
+
+        Raises:
+            ValueError: If chunk_size is not a positive integer, or seed is None.
+
+        Returns:
+            dict: First and last row numbers of the shard ("start", "stop"), number of rows written ("rows"), number of missing values written in each column ("missing"), and number of empty fields written in each column ("empty"), i.e. the missing values together with any empty strings, which can't be told apart from them in a delimited file.
+        """
+        
+        if chunk_size < 1:
+            raise ValueError(f"Chunk size must be a positive integer, not {chunk_size}.")
+        if seed is None:
+            raise ValueError("A seed is required to generate a range of rows.")
+        
+        start, stop = shard_range(shard_index, n_shards, total_rows)
+        step = max(chunk_size // RANGE_BLOCK_SIZE, 1) * RANGE_BLOCK_SIZE
+        bounds = [start] + list(range((start // step + 1) * step, stop, step)) + [stop]
+        
+        rows = 0
+        missing = {column.COLUMN_NAME: 0 for column in self.column_types}
+        empty = dict(missing)
+        
+        writer = open_writer(path, format=format, header=(shard_index == 0))
+        try:
+            with _worker_pool(n_jobs, backend) as pool:
+                for block_start, block_stop in zip(bounds[:-1], bounds[1:]):
+                    block = self.__generate_range(block_start, block_stop, total_rows, seed, pool)
+                    writer.write(block)
+                    rows += len(block.index)
+                    is_missing = block.isna()
+                    is_empty = is_missing.copy()
+                    for name in block.columns:
+                        if not pd.api.types.is_numeric_dtype(block[name]):
+                            is_empty[name] |= block[name].astype(object).eq('')
+                    for name, count in is_missing.sum().items():
+                        missing[name] += int(count)
+                    for name, count in is_empty.sum().items():
+                        empty[name] += int(count)
+        finally:
+            writer.close()
+        
+        return {"start": start, "stop": stop, "rows": rows, "missing": missing, "empty": empty}
+    
+    def __generate_block(self, generators: list[np.random.Generator], missing: list[int], start: int, stop: int, n_rows: int, pool: Executor | None = None) -> pd.DataFrame:
+        """Private method. Generates rows start to stop (exclusive) of a synthetic table, drawing each column from its own generator.
+        
+        The missing values still to be placed in each column are split between this block and the rows after it with general_functions.split_count().  The generators are replaced by their advanced states, so the next block continues each column's stream even when the columns were generated in worker processes.
+
+        Args:
+            generators (list[numpy.random.Generator]): One random number generator per column.  Updated in place.
+            missing (list[int]): Number of missing values of each column in rows start to n_rows.  Updated in place to the number in rows stop to n_rows.
+            start (int): Row number of the first row of the block.
+            stop (int): Row number after the last row of the block.
+            n_rows (int): Number of rows in the table.
+            pool (Executor, optional): Pool of workers from _worker_pool().  None generates the columns serially. Defaults to None.
+
+        Returns:
+            pandas.DataFrame: A dataframe of stop - start rows, indexed by row number.
+        """
+        
+        index = pd.RangeIndex(start, stop)
+        block_missing = [split_count(missing[i], n_rows - start, stop - start, rng) for i, rng in enumerate(generators)]
+        for i, n_missing in enumerate(block_missing):
+            missing[i] -= n_missing
+        results = _map_in_order(
+            _generate_column, 
+            ((column, stop - start, rng, n_missing) for column, rng, n_missing in zip(self.column_types, generators, block_missing)),
+            pool=pool
+            )
+        
+        columns = []
+        for i, (column_data, rng) in enumerate(results):
+            column_data.index = index
+            columns.append(column_data)
+            generators[i] = rng
+        
+        if not columns:
+            return pd.DataFrame(index=index)
+        return pd.concat(columns, axis=1)
+    
+    def column_generators(self, seed: int | None = None) -> list[np.random.Generator]:
+        """Public method. Creates one random number generator per column from a table-level seed.
+        
+        The child generators are spawned from a single numpy.random.SeedSequence, so each column has an independent stream that depends only on the seed and the position of the column in the table.
+
+        Args:
+            seed (int, optional): Table-level seed.  If None, fresh entropy is used. Defaults to None.
+
+        Returns:
+            list[numpy.random.Generator]: One generator per entry in the list of column types.
+        """
+        
+        return [np.random.default_rng(child) for child in np.random.SeedSequence(seed).spawn(len(self.column_types))]
     
     def dictionary_out(self) -> dict:
         """Public method. Outputs the current table properties provided by analysis or input methods. Only call after invoking Table.analyse(), Table.analyse_with_column_list(), or Table.read_in_table().
@@ -104,6 +565,151 @@ class Table(BasicTable):
             
         return dictionary
     
+    @classmethod
+    def from_path(cls, path: str, table_name: str | None = None, decimal_accuracy: int | None = None, columns_list: list[dict] | None = None, chunksize: int = 100000, usecols: list[str] | None = None, filter: Callable[[pd.DataFrame], pd.Series] | None = None, n_jobs: int | None = None, backend: str = 'process', **read_options) -> 'Table':
+        """Public method. Creates a Table analysed straight from a data file, which is read in blocks of rows by general_functions.read_data_chunks() and passed to Table.analyse_chunks(), so the whole file is never held in memory.
+        
+        The column types are identified as in Table.analyse_chunks(): with the heuristics if decimal_accuracy is given, or from the descriptions in columns_list.  The rows kept by the filter are regrouped into blocks of chunksize rows, so the types are identified from the first chunksize matching rows.  The returned table holds no real data; only its analysis.
+
+        Args:
+            path (str): File path.  File suffixes handled are as in general_functions.read_data().
+            table_name (str, optional): The name of the table.  If None, the file name without its suffix is used. Defaults to None.
+            decimal_accuracy (int, optional): Number of decimal places to use in numerical data columns, if the column types are identified by the heuristics. Defaults to None.
+            columns_list (list[dict], optional): Descriptions of the columns, as in Table.analyse_with_column_list(). Defaults to None.
+            chunksize (int, optional): Number of rows read and analysed at a time. Defaults to 100000.
+            usecols (list[str], optional): Columns to read and analyse.  If None, every column is. Defaults to None.
+            filter (Callable[[pandas.DataFrame], pandas.Series], optional): Function of a block of rows returning a boolean Series that is True for the rows to analyse, e.g. lambda chunk: chunk['Project'] == 12.  The columns it uses must be read, so must be in usecols if that is given.  If None, every row is analysed. Defaults to None.
+            n_jobs (int, optional): Number of workers, as in Table.analyse_chunks(). Defaults to None.
+            backend (str, optional): 'process' or 'thread'. Defaults to 'process'.
+            **read_options: Further keyword arguments passed to the read function, e.g. encoding or dtype.
+
+        Raises:
+            ValueError: If no rows are read (or kept by the filter), neither decimal_accuracy nor columns_list is given, or chunksize is not a positive integer.
+
+        Returns:
+            Table: The analysed table.
+        """
+        
+        if table_name is None:
+            table_name = os.path.splitext(os.path.basename(path))[0]
+        table = cls(table=pd.DataFrame(), table_name=table_name)
+        chunks = read_data_chunks(path, chunksize, usecols=usecols, **read_options)
+        table.analyse_chunks(_filtered_blocks(chunks, chunksize, filter), decimal_accuracy=decimal_accuracy, columns_list=columns_list, n_jobs=n_jobs, backend=backend)
+        return table
+        
+    def analyse_chunk(self, chunk: pd.DataFrame, decimal_accuracy: int | None = None, columns_list: list[dict] | None = None):
+        """Public method. Adds a block of rows to an analysis made one block at a time, so that a table too large to hold in memory can be analysed.  Call Table.finalise_chunked_analysis() once every block has been added.
+        
+        The column types are identified from the first block: with the heuristics as in Table.analyse() if decimal_accuracy is given, or from the descriptions in columns_list as in Table.analyse_with_column_list().  Both are ignored for later blocks.  As the heuristics only see the first block, it should be large enough to be representative; in particular the test for categorical columns depends on the number of rows.  Each block is stripped of whitespace as in the constructor and added to the partial statistics of every column.
+
+        Args:
+            chunk (pandas.DataFrame): Block of rows, with the same columns as the first block.
+            decimal_accuracy (int, optional): Number of decimal places to use in numerical data columns, if the column types are identified by the heuristics. Defaults to None.
+            columns_list (list[dict], optional): Descriptions of the columns, as in Table.analyse_with_column_list(). Defaults to None.
+
+        Raises:
+            ValueError: If neither decimal_accuracy nor columns_list is given with the first block, or a block has different columns from the first.
+        """
+        
+        if self.partial_statistics is None:
+            self.__start_chunked_analysis(chunk, decimal_accuracy, columns_list)
+        self.__check_chunk_columns(chunk)
+        self.TABLE_ROWS += len(chunk.index)
+        self.partial_statistics = _update_partials((self.partial_statistics, chunk))
+        
+    def analyse_chunks(self, chunks: Iterable[pd.DataFrame], decimal_accuracy: int | None = None, columns_list: list[dict] | None = None, n_jobs: int | None = None, backend: str = 'process'):
+        """Public method. Analyses a table given as a sequence of row blocks, e.g. from pandas.read_csv(..., chunksize=...), holding only a few blocks in memory at a time.
+        
+        The column types are identified from the first block as in Table.analyse_chunk().  If n_jobs is set, the blocks are analysed n_jobs at a time in a single pool of workers opened for the whole run, each producing the partial statistics of its own block, which are then merged.  The result does not depend on the number of workers, other than through floating point rounding.
+
+        Args:
+            chunks (Iterable[pandas.DataFrame]): Blocks of rows, all with the same columns.
+            decimal_accuracy (int, optional): Number of decimal places to use in numerical data columns, if the column types are identified by the heuristics. Defaults to None.
+            columns_list (list[dict], optional): Descriptions of the columns, as in Table.analyse_with_column_list(). Defaults to None.
+            n_jobs (int, optional): Number of workers.  None or 1 analyses the blocks serially; -1 uses one worker per CPU. Defaults to None.
+            backend (str, optional): 'process' or 'thread'. Defaults to 'process'.
+
+        Raises:
+            ValueError: If there are no blocks, neither decimal_accuracy nor columns_list is given, or a block has different columns from the first.
+        """
+        
+        chunks = iter(chunks)
+        first_chunk = next(chunks, None)
+        if first_chunk is None:
+            raise ValueError(f"There are no blocks of rows to analyse in table {self.TABLE_NAME}.")
+        self.analyse_chunk(first_chunk, decimal_accuracy, columns_list)
+        
+        batch_size = 1 if n_jobs is None else (os.cpu_count() if n_jobs == -1 else n_jobs)
+        with _worker_pool(n_jobs, backend) as pool:
+            while len(batch := list(islice(chunks, batch_size))) > 0:
+                for chunk in batch:
+                    self.__check_chunk_columns(chunk)
+                    self.TABLE_ROWS += len(chunk.index)
+                block_partials = _map_in_order(
+                    _update_partials,
+                    [([column_type.new_partial() for column_type in self.column_types], chunk) for chunk in batch],
+                    pool=pool
+                    )
+                for partials in block_partials:
+                    for partial, block_partial in zip(self.partial_statistics, partials):
+                        partial.merge(block_partial)
+        
+        self.finalise_chunked_analysis()
+        
+    def finalise_chunked_analysis(self):
+        """Public method. Completes an analysis made one block at a time with Table.analyse_chunk(), setting the summary statistics of every column from its partial statistics.
+
+        Raises:
+            ValueError: If no blocks have been added.
+        """
+        
+        if self.partial_statistics is None:
+            raise ValueError(f"No blocks of rows have been added to table {self.TABLE_NAME}, so there is no chunked analysis to finalise.")
+        
+        for column_type, partial in zip(self.column_types, self.partial_statistics):
+            column_type.analyse_partial(partial)
+        self.partial_statistics = None
+        self.chunk_columns = None
+        
+    def __start_chunked_analysis(self, chunk: pd.DataFrame, decimal_accuracy: int | None, columns_list: list[dict] | None):
+        """Private method identifying the column types from the first block of a chunked analysis and creating their empty partial statistics.
+
+        Args:
+            chunk (pandas.DataFrame): First block of rows.
+            decimal_accuracy (int, optional): Number of decimal places to use in numerical data columns, if the column types are identified by the heuristics.
+            columns_list (list[dict], optional): Descriptions of the columns, as in Table.analyse_with_column_list().
+
+        Raises:
+            ValueError: If neither decimal_accuracy nor columns_list is given.
+        """
+        
+        block = Table(table=chunk.copy(deep=False), table_name=self.TABLE_NAME).table
+        if columns_list is not None:
+            self.column_types = [self.__assign_variable_type(columns_list[i], block[column]) for i, column in enumerate(block.columns)]
+            self.columns_list = list(columns_list)
+            self.analyse_options = None
+        elif decimal_accuracy is not None:
+            self.column_types = [BasicTable.identify_column_type(block[column], decimal_accuracy) for column in block.columns]
+            self.analyse_options = {"decimal_accuracy": decimal_accuracy, "sample_size": None, "confidence": 1.0}
+            self.columns_list = None
+        else:
+            raise ValueError(f"The first block of rows in table {self.TABLE_NAME} needs either a decimal accuracy or a list of column descriptions to identify the column types.")
+        
+        self.type_inference_report = []
+        self.partial_statistics = [column_type.new_partial() for column_type in self.column_types]
+        self.chunk_columns = list(chunk.columns)
+        self.TABLE_ROWS = 0
+        
+    def __check_chunk_columns(self, chunk: pd.DataFrame):
+        """Private method checking that a block has the same columns as the first block of a chunked analysis.
+
+        Raises:
+            ValueError: If the columns differ.
+        """
+        
+        if list(chunk.columns) != self.chunk_columns:
+            raise ValueError(f"A block of rows in table {self.TABLE_NAME} has columns {list(chunk.columns)}, but the first block had {self.chunk_columns}.")
+    
     def read_in_table(self,table_definition: dict):
         """Public method. Reads in a dictionary containing the table summary statistics.
         
@@ -245,20 +851,103 @@ class Table(BasicTable):
                 
             self.column_types.append(temp_column)
     
-    def analyse_with_column_list(self, columns_list: list[dict]) :
+    def analyse_with_column_list(self, columns_list: list[dict], n_jobs: int | None = None, backend: str = 'process', cache: TableCache | None = None):
         """Public method. Analyses columns according to how their type is described in the input list.
         
-        For each column, a VariableType subclass corresponding to the one defined in the input is created, its analyse method invoked, and added to a list corresponding to the table columns.
+        For each column, a VariableType subclass corresponding to the one defined in the input is created, its analyse method invoked, and added to a list corresponding to the table columns.  If n_jobs is set, the analyse methods are run in a pool of workers as in Table.analyse().  If a cache is given, columns whose data and description are unchanged are taken from it as in Table.analyse().
 
         Args:
             columns_list (list[dict]): List of dictionaries. Each dictionary describes a column type and sets associated variables, if any.
+            n_jobs (int, optional): Number of workers.  None or 1 analyses the columns serially; -1 uses one worker per CPU. Defaults to None.
+            backend (str, optional): 'process' or 'thread'. Defaults to 'process'.
+            cache (TableCache, optional): Cache of analysed columns. Defaults to None.
+        """
+        
+        column_types = [self.__assign_variable_type(columns_list[i], self.table[column]) for i, column in enumerate(self.table.columns)]
+        self.column_types = self.__map_with_cache(
+            _analyse_column_type,
+            column_types,
+            [('column_list', json.dumps(columns_list[i], sort_keys=True)) for i in range(len(column_types))],
+            cache=cache,
+            n_jobs=n_jobs,
+            backend=backend
+            )
+        self.columns_list = list(columns_list)
+        self.analyse_options = None
+        
+    def update_columns(self, table_subset: pd.DataFrame, columns_list: list[dict] | None = None, n_jobs: int | None = None, backend: str = 'process', cache: TableCache | None = None):
+        """Public method. Re-analyses only the columns whose data has changed, keeping the analysis of every other column.  Only call after invoking Table.analyse() or Table.analyse_with_column_list().
+        
+        Each column of table_subset replaces the column of the same name, and its VariableType subclass instance is replaced by a newly analysed one, so Table.dictionary_out() describes the complete, corrected table.  The corrected columns are stripped of whitespace as in the constructor and analysed the way the table was: with the heuristics and options of the last Table.analyse() call, or with the descriptions of those columns from the last Table.analyse_with_column_list() call.  New descriptions can be given in columns_list instead.
+
+        Args:
+            table_subset (pandas.DataFrame): Corrected columns, with the same names and number of rows as in the table.
+            columns_list (list[dict], optional): Descriptions of the corrected columns, one per column of table_subset, as in Table.analyse_with_column_list(). Defaults to None.
+            n_jobs (int, optional): Number of workers, as in Table.analyse(). Defaults to None.
+            backend (str, optional): 'process' or 'thread'. Defaults to 'process'.
+            cache (TableCache, optional): Cache of analysed columns, as in Table.analyse(). Defaults to None.
+
+        Raises:
+            ValueError: If the table has not been analysed, a column is not in the table, the number of rows differs from the table, or columns_list doesn't have one description per column.
         """
         
-        self.column_types = []
-        for i, column in enumerate(self.table.columns):
-            column_type = self.__assign_variable_type(columns_list[i], self.table[column])
-            column_type.analyse()
-            self.column_types.append(column_type)
+        if getattr(self, 'column_types', None) is None or (self.analyse_options is None and self.columns_list is None and columns_list is None):
+            raise ValueError(f"Table {self.TABLE_NAME} has not been analysed, so its columns cannot be updated.")
+        
+        positions = {column_type.COLUMN_NAME: i for i, column_type in enumerate(self.column_types)}
+        unknown_columns = [column for column in table_subset.columns if column not in positions]
+        if len(unknown_columns) > 0:
+            raise ValueError(f"Columns {unknown_columns} are not in table {self.TABLE_NAME}.")
+        if len(table_subset.index) != self.TABLE_ROWS:
+            raise ValueError(f"Table {self.TABLE_NAME} has {self.TABLE_ROWS} rows, but the updated columns have {len(table_subset.index)}.")
+        if columns_list is not None and len(columns_list) != len(table_subset.columns):
+            raise ValueError(f"{len(columns_list)} column descriptions were given for {len(table_subset.columns)} columns.")
+        
+        updated = Table(table=table_subset.copy(), table_name=self.TABLE_NAME)
+        if columns_list is None and self.columns_list is not None:
+            columns_list = [self.columns_list[positions[column]] for column in table_subset.columns]
+        if columns_list is None:
+            updated.analyse(n_jobs=n_jobs, backend=backend, cache=cache, **self.analyse_options)
+            self.type_inference_report = [disagreement for disagreement in self.type_inference_report if disagreement["Name"] not in table_subset.columns] + updated.type_inference_report
+        else:
+            updated.analyse_with_column_list(columns_list, n_jobs=n_jobs, backend=backend, cache=cache)
+            if self.columns_list is not None:
+                for column, column_data in zip(table_subset.columns, columns_list):
+                    self.columns_list[positions[column]] = column_data
+        
+        for column, column_type in zip(updated.table.columns, updated.column_types):
+            self.column_types[positions[column]] = column_type
+            if hasattr(self, 'table'): # unless the real data has already been deleted
+                self.table[column] = updated.table[column].set_axis(self.table.index)
+        
+    def __map_with_cache(self, function: Callable, arguments: list, options: list[tuple], cache: TableCache | None = None, n_jobs: int | None = None, backend: str = 'process') -> list:
+        """Private method. Maps an analysis function over the columns of the table as _map_in_order() does, except that results held in the cache are reused and only the remaining columns are analysed.  Their results are then added to the cache.
+
+        Args:
+            function (Callable): Worker function analysing one column.
+            arguments (list): One argument of the function per table column, in column order.
+            options (list[tuple]): For each column, the analysis options that the result depends on.  Combined with the column data in the cache key.
+            cache (TableCache, optional): Cache of analysed columns.  If None, every column is analysed. Defaults to None.
+            n_jobs (int, optional): Number of workers, as in _map_in_order(). Defaults to None.
+            backend (str, optional): 'process' or 'thread'. Defaults to 'process'.
+
+        Returns:
+            list: Results of the function, in column order.
+        """
+        
+        results = [None for _ in arguments]
+        if cache is not None:
+            keys = [TableCache.fingerprint(self.table.iloc[:, i], *options[i]) for i in range(len(arguments))]
+            results = [cache.get(key) for key in keys]
+        
+        to_analyse = [i for i, result in enumerate(results) if result is None]
+        analysed = _map_in_order(function, (arguments[i] for i in to_analyse), n_jobs=n_jobs, backend=backend)
+        for i, result in zip(to_analyse, analysed):
+            results[i] = result
+            if cache is not None:
+                cache.put(keys[i], result)
+        
+        return results
         
     def __assign_variable_type(self, column_data: dict, column: pd.Series) -> EmptyVariable | CategoricalVariable | DatetimeVariable | NumericalVariable | StringVariable:
         """Private method.  For a given column, assigns it a variable type based on the column data input.
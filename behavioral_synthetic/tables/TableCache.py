@@ -0,0 +1,146 @@
+"""Contains the class TableCache, which stores analysed columns on local disk so that unchanged data does not have to be analysed again.
+"""
+
+import hashlib
+import os
+import pickle
+import tempfile
+
+import pandas as pd
+
+class TableCache():
+    """Cache of analysed columns on local disk, keyed by a fingerprint of the column data and the analysis options.
+
+    Each entry is one analysed column (a VariableType subclass instance, along with any type inference report), stored as a pickle file named after its fingerprint.  The fingerprint covers the column name, dtype and values as well as the options passed to the analysis, so an entry is only reused when re-analysing would give the same result.  Re-analysing a table where only some columns have changed therefore only re-fits those columns.
+
+    Reading an entry updates its modification time, and once there are more than max_entries entries the least recently used ones are deleted.
+
+    As entries are pickles, only point a TableCache at a directory that it alone writes to.
+
+        Public methods:
+            __init__: Constructor.
+            fingerprint: Computes the cache key for a column and a set of analysis options.
+            get: Returns a cached entry, or None if there isn't one.
+            put: Stores an entry, evicting the least recently used entries if the cache is full.
+            clear: Deletes every entry.
+    """
+
+    __FORMAT_VERSION = 3 # included in every fingerprint, so that changing what is stored invalidates old entries.
+    __SUFFIX = '.pkl'
+
+    def __init__(self, directory: str, max_entries: int = 1000):
+        """Constructor for TableCache.  Creates the cache directory if it doesn't exist.
+
+        Args:
+            directory (str): Directory in which entries are stored.
+            max_entries (int, optional): Maximum number of entries kept. Defaults to 1000.
+
+        Raises:
+            ValueError: If max_entries is not a positive integer.
+        """
+
+        if max_entries < 1:
+            raise ValueError(f"Maximum number of cache entries must be a positive integer, not {max_entries}.")
+
+        self.directory = directory
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        os.makedirs(directory, exist_ok=True)
+
+    @staticmethod
+    def fingerprint(column: pd.Series, *options) -> str:
+        """Public method that computes the cache key of a column.
+
+        Args:
+            column (pandas.Series): Column data.
+            *options: Analysis options that change the result (e.g. decimal accuracy).  Must have a stable repr().
+
+        Returns:
+            str: Hexadecimal sha256 digest of the cache format version, the options, the column name and dtype, and the hashes of the column values in order.
+        """
+
+        digest = hashlib.sha256()
+        digest.update(repr((TableCache.__FORMAT_VERSION, options, column.name, str(column.dtype), column.shape[0])).encode())
+        digest.update(pd.util.hash_pandas_object(column, index=False).to_numpy().tobytes())
+        return digest.hexdigest()
+
+    def __path(self, key: str) -> str:
+        """Private method giving the file path of an entry."""
+
+        return os.path.join(self.directory, key + self.__SUFFIX)
+
+    def get(self, key: str) -> object | None:
+        """Public method that returns a cached entry and marks it as recently used.
+
+        Args:
+            key (str): Cache key from TableCache.fingerprint().
+
+        Returns:
+            object | None: The cached entry, or None if there is no readable entry for the key.  An entry that can't be loaded (e.g. one that is truncated, or was pickled before a class was renamed or moved) is deleted and counted as a miss.
+        """
+
+        path = self.__path(key)
+        try:
+            with open(path, 'rb') as file:
+                entry = pickle.load(file)
+            os.utime(path)
+        except FileNotFoundError:
+            self.misses += 1
+            return None
+        except Exception:
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        return entry
+
+    def put(self, key: str, entry: object):
+        """Public method that stores an entry, then evicts the least recently used entries if there are more than max_entries.
+
+        The entry is written to a temporary file and moved into place, so a reader never sees a partly written entry.
+
+        Args:
+            key (str): Cache key from TableCache.fingerprint().
+            entry (object): Entry to store.  Must be picklable.
+        """
+
+        file_descriptor, temporary_path = tempfile.mkstemp(dir=self.directory, suffix='.tmp')
+        try:
+            with os.fdopen(file_descriptor, 'wb') as file:
+                pickle.dump(entry, file, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(temporary_path, self.__path(key))
+        except BaseException:
+            os.remove(temporary_path)
+            raise
+
+        self.__evict()
+
+    def __entries(self) -> list[os.DirEntry]:
+        """Private method listing the entry files in the cache directory."""
+
+        return [entry for entry in os.scandir(self.directory) if entry.is_file() and entry.name.endswith(self.__SUFFIX)]
+
+    def __evict(self):
+        """Private method deleting the least recently used entries until at most max_entries remain."""
+
+        entries = self.__entries()
+        if len(entries) <= self.max_entries:
+            return
+
+        entries.sort(key=lambda entry: entry.stat().st_mtime)
+        for entry in entries[:len(entries) - self.max_entries]:
+            try:
+                os.remove(entry.path)
+            except FileNotFoundError:
+                pass # already evicted by another process
+
+    def clear(self):
+        """Public method that deletes every entry in the cache."""
+
+        for entry in self.__entries():
+            os.remove(entry.path)
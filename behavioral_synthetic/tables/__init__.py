@@ -1 +1 @@
-__all__ = ["BasicTable", "Table"]
\ No newline at end of file
+__all__ = ["BasicTable", "Table", "TableCache"]
\ No newline at end of file
@@ -6,6 +6,8 @@ import pandas as pd
 import numpy as np
 
 from .VariableType import VariableType
+from .PartialStatistics import CategoricalPartial
+from .general_functions import alias_table, alias_sample, count_values
 
 class CategoricalVariable(VariableType):
     """Subclass extending VariableType.  Contains methods for producing a pandas series of synthetic categorical data from a pandas series of real categorical data.
@@ -13,6 +15,10 @@ class CategoricalVariable(VariableType):
         Public methods:
             __init__: Constructor.  Extends VariableType.__init__().
             analyse: Calculates summary statistics of the real data. Overrides VariableType.analyse().
+            new_partial: Creates empty partial statistics for chunked analysis. Overrides VariableType.new_partial().
+            analyse_partial: Calculates summary statistics from the partial statistics of all blocks of the real data. Overrides VariableType.analyse_partial().
+            missing_count: Gives the number of missing values in a synthetic column, from the frequency of the value 'nan'.  Overrides VariableType.missing_count().
+            missing_rows: Chooses which rows of a synthetic column are missing.  Inherited from VariableType.
             generate: Generates a column of synthetic data from the summary statistices.  Must be called after analyse() or set() methods.  Overrides VariableType.generate().
             dictionary_out: Outputs a dictionary containing column summary statistics. Must be called after analyse() or set() methods.  Overrides VariableType.dictionary_out().
             set: Sets table definitions that aren't set by the constructor.  Used to create column definitions from stored summary statistics.
@@ -37,7 +43,7 @@ class CategoricalVariable(VariableType):
     def analyse(self):
         """Public method that extracts the summary statistics of the column and stores them internally as a frequency table for each value.
         
-        This tests that there are enough non-missing values to meet the disclosure threshold, and generates internal lists of values and corresponding probabilities.  The orginal column is then marked for deletion and the garbage collector called.  Details of the summary statistics generated may be found in the documentation for the set() method.
+        The values are counted in a single pass over the column in its own dtype (see general_functions.count_values()), and the disclosure threshold is tested from those counts, so the column is never converted to objects.  This tests that there are enough non-missing values to meet the disclosure threshold, and generates internal lists of values and corresponding probabilities.  The orginal column is then marked for deletion and the garbage collector called.  Details of the summary statistics generated may be found in the documentation for the set() method.
         
         Overrides VariableType.analyse().
 
@@ -46,35 +52,99 @@ class CategoricalVariable(VariableType):
         """
         
         # note we don't need to analyse for missingness as this will automatically account for it
-        self.column=self.column.astype('object')
+        counts, present = count_values(self.column)
         
-        if self.column.replace("", np.NaN).dropna().size < self.get_THRESHOLD():
+        if present < self.get_THRESHOLD():
             raise ValueError(f'Insuffucient number of values in series to produce disclosure safe results (less than {self.get_THRESHOLD()})')
         
-        self.column.fillna('nan', inplace=True)
-        cross_tabulation = self.column.value_counts(dropna = False, normalize=True)
+        cross_tabulation = counts.sort_values(ascending=False)/counts.sum()
         self.values = cross_tabulation.axes[0].tolist()
         self.probabilities = cross_tabulation.tolist()
+        self.__prepare_sampler()
         super().delete_column()
         
-    def generate(self, new_column_length: int) -> pd.Series:
+    def new_partial(self) -> CategoricalPartial:
+        """Public method creating empty partial statistics for analysing the column one block of rows at a time.
+        
+        Overrides VariableType.new_partial().
+
+        Returns:
+            CategoricalPartial: Empty partial statistics.
+        """
+        
+        return CategoricalPartial()
+        
+    def analyse_partial(self, partial: CategoricalPartial):
+        """Public method that sets the values and probabilities of the column from the partial statistics of all of its blocks, as analyse() does from the whole column.  Values are ordered by decreasing frequency, with ties in the order in which the values were first seen.
+        
+        Overrides VariableType.analyse_partial().
+
+        Args:
+            partial (CategoricalPartial): Partial statistics updated with every block of the column.
+
+        Raises:
+            ValueError: If the number of non-null and non-blank entries in a column is less than the disclosure variable THRESHOLD.
+        """
+        
+        if partial.present < self.get_THRESHOLD():
+            raise ValueError(f'Insuffucient number of values in series to produce disclosure safe results (less than {self.get_THRESHOLD()})')
+        
+        counts = sorted(partial.counts.items(), key=lambda item: item[1], reverse=True)
+        self.values = [value for value, _ in counts]
+        self.probabilities = [count/partial.length for _, count in counts]
+        self.__prepare_sampler()
+        super().delete_column()
+        
+    def __prepare_sampler(self):
+        """Private method that precomputes what is needed to sample the column: the frequency of the missing value 'nan', and an alias table over the frequencies of the other values, whose positions are their categorical codes.
+        """
+        
+        present = [(value, probability) for value, probability in zip(self.values, self.probabilities) if value != 'nan']
+        self.missing_frequency = sum(probability for value, probability in zip(self.values, self.probabilities) if value == 'nan')
+        categories = [value for value, _ in present]
+        self.categories_dtype = pd.CategoricalDtype(categories=pd.Index(categories))
+        if len(present) > 0:
+            probabilities = np.array([probability for _, probability in present], dtype='float64')
+            self.alias_keep, self.alias_indices = alias_table(probabilities/probabilities.sum())
+        
+    def missing_count(self, new_column_length: int) -> int:
+        """Public method giving the number of missing values in a new synthetic column: the frequency of the value 'nan' times the column length, rounded to the nearest integer.
+        
+        Overrides VariableType.missing_count().
+
+        Args:
+            new_column_length (int): The number of rows in the new column.
+
+        Returns:
+            int: Number of missing values.
+        """
+        
+        return int(round(new_column_length*self.missing_frequency))
+        
+    def generate(self, new_column_length: int, rng: np.random.Generator | None = None, n_missing: int | None = None) -> pd.Series:
         """Public method that generates a new column of synthetic data based on stored summary statistics.  Should be called after the analyse() or set() methods.
         
-        Values are randomly drawn with replacement from frequencies that include missing values and placed in a pandas Series.
+        The missing rows are chosen first, as for the other column types (see VariableType.missing_rows()).  The values of the present rows are then randomly drawn with replacement from the frequencies of the other values, using the alias table made by analyse() or set(), so each draw takes constant time however many values there are.  The draws are integer codes, from which the categorical Series is built directly without converting to the values themselves.
         
         Overrides VariableType.generate().
 
         Args:
             new_column_length (int): The number of rows required in the output column.
+            rng (numpy.random.Generator, optional): Source of randomness for the column. A freshly seeded Generator is used if None. Defaults to None.
+            n_missing (int, optional): Number of missing rows, e.g. the share of this block in a table generated in blocks.  If None, missing_count(new_column_length) rows are missing. Defaults to None.
 
         Returns:
-            Pandas.Series: A Pandas Series of object, float64 or Int64 dtype, depending on the properties of the original column.
+            Pandas.Series: A Pandas Series of category dtype, whose categories are the values of the original column.  Missing values are NaN.
         """
         
-        new_column = pd.Series(np.random.choice(self.values, new_column_length,  p=self.probabilities)).replace('nan', np.NaN)
-        new_column.name = self.COLUMN_NAME
-        #new_column = new_column.astype(str(self.dtypes))  Seems to be causing problems IOT 2024-05-14
-        return new_column
+        if rng is None:
+            rng = np.random.default_rng()
+        
+        is_missing = super().missing_rows(new_column_length, rng, n_missing)
+        codes = np.full(new_column_length, -1, dtype='int64')
+        if not is_missing.all():
+            codes[~is_missing] = alias_sample(self.alias_keep, self.alias_indices, new_column_length - int(is_missing.sum()), rng)
+        return pd.Series(pd.Categorical.from_codes(codes, dtype=self.categories_dtype), name=self.COLUMN_NAME)
     
     def dictionary_out(self) -> dict:
         """Public method. Outputs a summary of the column summary statistics in dictionary format.   Should be called after the analyse() or set() methods.
@@ -105,4 +175,5 @@ class CategoricalVariable(VariableType):
         self.probabilities = [frequencies[value] for value in frequencies]
         # renormalise probabilities in case of unusual behaviour 2024-05-14
         total = sum(self.probabilities)
-        self.probabilities = [value/total for value in self.probabilities]
\ No newline at end of file
+        self.probabilities = [value/total for value in self.probabilities]
+        self.__prepare_sampler()
\ No newline at end of file
@@ -0,0 +1,170 @@
+"""Contains the class ColumnProfile, which holds the quantities that the column type heuristics need, computed once per column.
+"""
+
+from functools import cached_property
+import warnings
+
+import numpy as np
+import pandas as pd
+
+class ColumnProfile():
+    """Profile of a single column of real data used to identify its variable type.
+
+    Each quantity is computed the first time it is asked for and then kept, so a heuristic that reads the same count, mask or trial parse more than once only pays for it once.  Quantities that a heuristic never reaches are never computed.  The full column numeric and datetime parses are kept so they can be passed on to the chosen variable type, saving its analyse() method from parsing the column a second time.
+
+    The datetime trial parse infers a single format from the data, whereas DatetimeVariable.analyse() parses each value separately, and the two can disagree (e.g. for day first dates).  The datetime parse is therefore only offered for reuse once it has been checked against a per-value parse of a sample of rows.
+
+        Public methods:
+            __init__: Constructor.
+            parses_as_numeric: Tests whether at least a given share of the column can be parsed as numbers.
+            parses_as_datetime: Tests whether at least a given share of the column can be parsed as datetimes.
+            parse_numeric: Parses a column as numbers, returning None if it cannot be parsed.
+            parse_datetime: Parses a column as datetimes, returning None if it cannot be parsed.
+
+        Public properties (computed on first access):
+            non_null_count: Number of non-null values.
+            unique_count: Number of distinct non-null values.
+            text: Column converted to str.
+            has_digit: Mask of values containing a digit.
+            has_alpha: Mask of values containing a letter.
+            has_non_alpha: Mask of values containing a character that is not a letter.
+            numeric: The column parsed as numbers, or None if it cannot be.
+            datetime: The column parsed as datetimes, or None if it cannot be.
+            reusable_datetime: The datetime parse if it agrees with the parse made by DatetimeVariable.analyse() on a sample of rows, None otherwise.
+    """
+    
+    __DATETIME_CHECK_SIZE = 1000 # number of rows on which the datetime parse is checked before reuse.
+
+    def __init__(self, column: pd.Series):
+        """Constructor for ColumnProfile.
+
+        Args:
+            column (pandas.Series): The column to be profiled.
+        """
+
+        self.column = column
+        self.length = column.shape[0]
+
+    @cached_property
+    def non_null(self) -> pd.Series:
+        return self.column.dropna()
+
+    @cached_property
+    def non_null_count(self) -> int:
+        return self.non_null.shape[0]
+
+    @cached_property
+    def unique_count(self) -> int:
+        return self.non_null.nunique()
+
+    @cached_property
+    def text(self) -> pd.Series:
+        return self.column.astype(str)
+
+    @cached_property
+    def has_digit(self) -> pd.Series:
+        return self.text.str.contains(r"[0-9]")
+
+    @cached_property
+    def has_alpha(self) -> pd.Series:
+        return self.text.str.contains(r"[a-zA-Z]")
+
+    @cached_property
+    def has_non_alpha(self) -> pd.Series:
+        return self.text.str.contains(r"[^a-zA-Z]")
+
+    @cached_property
+    def numeric(self) -> pd.Series | None:
+        return ColumnProfile.parse_numeric(self.column)
+
+    @cached_property
+    def datetime(self) -> pd.Series | None:
+        return ColumnProfile.parse_datetime(self.column)
+
+    @cached_property
+    def reusable_datetime(self) -> pd.Series | None:
+        parsed = self.datetime
+        if parsed is None or not pd.api.types.is_datetime64_dtype(parsed):
+            return None
+        
+        rows = np.unique(np.linspace(0, self.length - 1, min(self.length, self.__DATETIME_CHECK_SIZE)).astype('int64'))
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore")
+            check = pd.to_datetime(self.column.iloc[rows], errors='coerce', format='mixed')
+        return parsed if check.equals(parsed.iloc[rows]) else None
+
+    def parses_as_numeric(self, confidence: float = 1.0) -> bool:
+        """Public method that tests whether the column can be parsed as numbers.
+
+        Args:
+            confidence (float, optional): Share of the values that must parse, counting missing values as parsed.  At 1.0 the whole column must parse, which is the test used to identify numerical columns. Defaults to 1.0.
+
+        Returns:
+            bool: True if at least the given share of values are numbers.
+        """
+
+        if confidence >= 1:
+            return self.numeric is not None
+        parsed = pd.to_numeric(self.column, errors='coerce')
+        return ColumnProfile.__share_parsed(self.column, parsed) >= confidence
+
+    def parses_as_datetime(self, confidence: float = 1.0) -> bool:
+        """Public method that tests whether the column can be parsed as datetimes.
+
+        Args:
+            confidence (float, optional): Share of the values that must parse, counting missing values as parsed.  At 1.0 the whole column must parse, which is the test used to identify datetime columns. Defaults to 1.0.
+
+        Returns:
+            bool: True if at least the given share of values are datetimes.
+        """
+
+        if confidence >= 1:
+            return self.datetime is not None
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore")
+            parsed = pd.to_datetime(self.column, errors='coerce', format='mixed')
+        return ColumnProfile.__share_parsed(self.column, parsed) >= confidence
+
+    @staticmethod
+    def __share_parsed(column: pd.Series, parsed: pd.Series) -> float:
+        """Private method giving the share of values that were either parsed or missing to begin with."""
+
+        if column.shape[0] == 0:
+            return 1.0
+        return (parsed.notna() | column.isna()).mean()
+
+    @staticmethod
+    def parse_numeric(column: pd.Series) -> pd.Series | None:
+        """Public method that parses a column as numbers.
+
+        Args:
+            column (pandas.Series): Column data.
+
+        Returns:
+            pandas.Series | None: The parsed column, or None if any value is not a number.
+        """
+
+        try:
+            return pd.to_numeric(column)
+        except (RuntimeError, TypeError, NameError, IOError, ValueError):
+            return None
+
+    @staticmethod
+    def parse_datetime(column: pd.Series) -> pd.Series | None:
+        """Public method that parses a column as datetimes.
+
+        Args:
+            column (pandas.Series): Column data.
+
+        Returns:
+            pandas.Series | None: The parsed column, or None if any value is not a datetime.
+        """
+
+        try:
+            # this would normally issue "UserWarning: Could not infer format, so each element will be parsed individually, falling back to `dateutil`. To ensure parsing is consistent and as-expected, please specify a format."
+            # However, we're only interested in whether it thinks the column as a whole is datetime rather than parsing specific values so we can suppress this without worry.
+            with warnings.catch_warnings():
+                warnings.simplefilter("ignore")
+                return pd.to_datetime(column)
+        except (RuntimeError, TypeError, NameError, IOError, ValueError):
+            return None
@@ -7,9 +7,9 @@ import gc
 
 import pandas as pd
 import numpy as np
-import random
 
 from .VariableType import VariableType
+from .PartialStatistics import DatetimePartial
 
 class DatetimeVariable(VariableType):
     """Subclass extending VariableType. Contains methods for producing a pandas series of synthetic datetime data from a pandas series of real datetime data.
@@ -17,14 +17,19 @@ class DatetimeVariable(VariableType):
         Public methods:
             __init__: Constructor.  Extends VariableType.__init__().
             analyse: Calculates summary statistics of the real data. Overrides VariableType.analyse().
+            new_partial: Creates empty partial statistics for chunked analysis. Overrides VariableType.new_partial().
+            analyse_partial: Calculates summary statistics from the partial statistics of all blocks of the real data. Overrides VariableType.analyse_partial().
             generate: Generates a column of synthetic data from the summary statistices.  Must be called after analyse() or set() methods.  Overrides VariableType.generate().
             dictionary_out: Outputs a dictionary containing column summary statistics. Must be called after analyse() or set() methods.  Overrides VariableType.dictionary_out().
             set: Sets table definitions that aren't set by the constructor.  Used to create column definitions from stored summary statistics.
             analyse_missingness: Calculates the number of missing and present values in the real data Series.  Inherited from VariableType.
+            missing_rows: Chooses which rows of a synthetic column are missing.  Inherited from VariableType.
             delete_column: Marks the pandas Series containing real data for deletion and calls the garbage collector. Inherited from VariableType.
     """
     
-    def __init__(self, column: pd.Series, average_min_max = True, date_format = "%Y-%m-%d", time_format = "%X", datetime_format = "%Y-%m-%d %X"):
+    __NANOSECONDS_PER_DAY = 86400*10**9
+    
+    def __init__(self, column: pd.Series, average_min_max = True, date_format = "%Y-%m-%d", time_format = "%X", datetime_format = "%Y-%m-%d %X", parsed_column: pd.Series | None = None):
         """Constructor for DatetimeVariable, defining the properties of a datetime column.
         
         Passes column data to the superclass constructor and sets the column type to "datetime" (this may be corrected to the "date" or "time" subtypes subsequently if required).  Determines whether lower and upper bounds of data need to be determined by averaging or not, and also sets the output format for each subtype "datetime", "date" or "time".
@@ -37,6 +42,7 @@ class DatetimeVariable(VariableType):
             date_format (str, optional): Format to use if the column is of 'date' subtype. Defaults to "%Y-%m-%d".
             time_format (str, optional): Format to use if the column is of 'time' subtype. Defaults to "%X".
             datetime_format (str, optional): Format to use if the column is of 'datetime' subtype. Defaults to "%Y-%m-%d %X".
+            parsed_column (pandas.Series, optional): The column already parsed as datetimes, e.g. during type identification.  It must match the parse made in analyse(), which uses it instead of parsing the column again. Defaults to None.
         """
         
         super().__init__(column, "datetime")
@@ -44,28 +50,33 @@ class DatetimeVariable(VariableType):
         self.date_format = date_format
         self.time_format = time_format
         self.datetime_format = datetime_format
+        self.parsed_column = parsed_column
     
-    def __average_earliest(self) -> datetime:
+    def __average_earliest(self, earliest_times: pd.Series) -> datetime:
         """Private method for averaging the earliest time in a column.
 
+        Args:
+            earliest_times (pandas.Series): The THRESHOLD earliest times in the column.
+
         Returns:
             datetime: Averaged earliest time.
         """
         
-        earliest = min(self.column.dropna())
-        earliest_times = self.column.dropna().nsmallest(n=self.get_THRESHOLD(), keep='first')
+        earliest = min(earliest_times)
         average_time_delta = earliest_times.map(lambda x: (x-earliest)/self.get_THRESHOLD()).sum()
         return pd.to_datetime(earliest + average_time_delta)
     
-    def __average_latest(self) -> datetime:
+    def __average_latest(self, latest_times: pd.Series) -> datetime:
         """Private method for averaging the latest time in a column.
 
+        Args:
+            latest_times (pandas.Series): The THRESHOLD latest times in the column.
+
         Returns:
             datetime: Averaged latest time.
         """
         
-        latest = max(self.column.dropna())
-        latest_times = self.column.dropna().nlargest(n=self.get_THRESHOLD(), keep='first')
+        latest = max(latest_times)
         average_time_delta = latest_times.map(lambda x: (x - latest)/self.get_THRESHOLD()).sum()
         return pd.to_datetime(latest + average_time_delta)
     
@@ -91,64 +102,100 @@ class DatetimeVariable(VariableType):
             just_date = just_date.dropna().astype(str)
             return just_date[(just_date != todays_date)].shape[0] # if this is more than 0, then we have (some) dates
                 
-        self.column = pd.to_datetime(self.column, errors = 'coerce', format='mixed') # mixed is 'risky' according to API, but also the only way to avoid a warning.  If there's a problem, check here first!
+        if self.parsed_column is not None:
+            self.column = self.parsed_column
+        else:
+            self.column = pd.to_datetime(self.column, errors = 'coerce', format='mixed') # mixed is 'risky' according to API, but also the only way to avoid a warning.  If there's a problem, check here first!
+        self.parsed_column = None
         self.length, self.missing, self.non_missing = super().analyse_missingness()
         
         if not self.average_min_max:
             self.t_earliest = min(self.column)
             self.t_latest = max(self.column)
         else:
-            self.t_earliest = self.__average_earliest()
-            self.t_latest = self.__average_latest()
+            self.t_earliest = self.__average_earliest(self.column.dropna().nsmallest(n=self.get_THRESHOLD(), keep='first'))
+            self.t_latest = self.__average_latest(self.column.dropna().nlargest(n=self.get_THRESHOLD(), keep='first'))
             
         self.times_present = True if num_rows_with_times(self.column) > 0 else False
         self.dates_present = True if num_rows_with_dates(self.column) > 0 else False
         
         super().delete_column()
         
-    def generate(self, new_column_length: int) -> pd.Series:
+    def new_partial(self) -> DatetimePartial:
+        """Public method creating empty partial statistics for analysing the column one block of rows at a time.
+        
+        Overrides VariableType.new_partial().
+
+        Returns:
+            DatetimePartial: Empty partial statistics.
+        """
+        
+        return DatetimePartial(self.get_THRESHOLD())
+        
+    def analyse_partial(self, partial: DatetimePartial):
+        """Public method that sets the summary statistics of the column from the partial statistics of all of its blocks, as analyse() does from the whole column.
+        
+        Overrides VariableType.analyse_partial().
+
+        Args:
+            partial (DatetimePartial): Partial statistics updated with every block of the column.
+        """
+        
+        self.parsed_column = None
+        self.length, self.missing, self.non_missing = super().partial_missingness(partial)
+        
+        earliest_times = pd.Series(partial.earliest.view('datetime64[ns]'))
+        latest_times = pd.Series(partial.latest.view('datetime64[ns]'))
+        if not self.average_min_max:
+            self.t_earliest = min(earliest_times)
+            self.t_latest = max(latest_times)
+        else:
+            self.t_earliest = self.__average_earliest(earliest_times)
+            self.t_latest = self.__average_latest(latest_times)
+        
+        self.times_present = partial.times_present
+        self.dates_present = partial.dates_present
+        
+        super().delete_column()
+        
+    def generate(self, new_column_length: int, rng: np.random.Generator | None = None, n_missing: int | None = None) -> pd.Series:
         """Public method that generates a new column of synthetic data based on stored summary statistics.  Should be called after the analyse() or set() methods.
         
-        Synthetic dates, times or datetimes are determined by randomly choosing dates between an earliest and latest value with a chance of any given value being missing.  These are converted into strings whose format depends on which of the three subtypes the real data contains, and output as a pandas Series.
+        Synthetic dates, times or datetimes are determined by randomly choosing dates between an earliest and latest value, with the missing rows chosen first according to the frequency of missing values (see VariableType.missing_rows()).  These are converted into strings whose format depends on which of the three subtypes the real data contains, and output as a pandas Series.
         
         Overrides VariableType.generate()
         
         Args:
             new_column_length (int): Number of rows of synthetic data to generate.
+            rng (numpy.random.Generator, optional): Source of randomness for the column. A freshly seeded Generator is used if None. Defaults to None.
+            n_missing (int, optional): Number of missing rows, e.g. the share of this block in a table generated in blocks.  If None, missing_count(new_column_length) rows are missing. Defaults to None.
 
         Returns:
             pd.Series: Column containing synthetic data.
         """
         
-        def generate_datetime(min_time, max_time):
-            start = pd.to_datetime(min_time)
-            end = pd.to_datetime(max_time)
-            random_date = start + (end - start) * random.random()
-            return random_date
-        
-        def random_datetime_selection(min_time,max_time, nrow_non_NA, nrow):
-            probabilities=[nrow_non_NA/nrow, (nrow-nrow_non_NA)/nrow]
-            values=[generate_datetime(min_time, max_time), np.NaN]
-            return np.random.choice(values, p=probabilities)
-        
-        new_column = pd.Series([random_datetime_selection(self.t_earliest, self.t_latest, self.non_missing, self.length) for _ in range(new_column_length)])
+        if rng is None:
+            rng = np.random.default_rng()
         
-        new_column = new_column.astype('object')
-        new_column = new_column.fillna('nan').replace(pd.NaT, 'nan')
-        
-        def impose_format(dtime: pd.Timestamp | str, format: str) -> str:
-            return 'nan' if dtime == 'nan' else dtime.strftime(format)
+        # choose the missing rows, then draw uniformly distributed times for the present rows as integer nanoseconds since the epoch
+        is_missing = super().missing_rows(new_column_length, rng, n_missing)
+        earliest, latest = sorted((pd.Timestamp(self.t_earliest).value, pd.Timestamp(self.t_latest).value))
+        times = rng.integers(earliest, latest, new_column_length - int(is_missing.sum()), endpoint=True)
         
         if  (not self.times_present) and self.dates_present:
-            new_column = new_column.map(lambda x: impose_format(x,self.date_format))
+            # only the day matters, so format each distinct day once and reuse it
+            days, day_of_row = np.unique(np.floor_divide(times, self.__NANOSECONDS_PER_DAY), return_inverse=True)
+            formatted_days = pd.DatetimeIndex((days*self.__NANOSECONDS_PER_DAY).view('datetime64[ns]')).strftime(self.date_format)
+            formatted = np.asarray(formatted_days, dtype=object)[day_of_row]
         elif self.times_present and (not self.dates_present):
-            new_column = new_column.map(lambda x: impose_format(x,self.time_format))
+            formatted = np.asarray(pd.DatetimeIndex(times.view('datetime64[ns]')).strftime(self.time_format), dtype=object)
         else:
-            new_column = new_column.map(lambda x: impose_format(x, self.datetime_format))
-                
-        new_column.name = self.COLUMN_NAME
+            formatted = np.asarray(pd.DatetimeIndex(times.view('datetime64[ns]')).strftime(self.datetime_format), dtype=object)
+        
+        new_column = np.full(new_column_length, np.NaN, dtype=object)
+        new_column[~is_missing] = formatted
         
-        return new_column.replace('nan', np.NaN)
+        return pd.Series(new_column, dtype=object, name=self.COLUMN_NAME)
     
     def dictionary_out(self) -> dict:
         """Public method. Outputs a summary of the column summary statistics in dictionary format.   Should be called after the analyse() or set() methods.
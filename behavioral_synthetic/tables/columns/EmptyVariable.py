@@ -5,6 +5,7 @@ import pandas as pd
 import numpy as np
 
 from .VariableType import VariableType
+from .PartialStatistics import EmptyPartial
 
 class EmptyVariable(VariableType):
     """Subclass extending VariableType.  Contains methods for producing a pandas series of synthetic empty column data from a pandas series of empty column data.
@@ -12,6 +13,9 @@ class EmptyVariable(VariableType):
         Public methods:
             __init__: Constructor.  Extends VariableType.__init__().
             analyse: Calculates summary statistics of the real data. Overrides VariableType.analyse().
+            new_partial: Creates empty partial statistics for chunked analysis. Overrides VariableType.new_partial().
+            analyse_partial: Calculates summary statistics from the partial statistics of all blocks of the real data. Overrides VariableType.analyse_partial().
+            missing_count: Gives the number of missing values in a synthetic column, which is all of them.  Overrides VariableType.missing_count().
             generate: Generates a column of synthetic data from the summary statistices.  Must be called after analyse() or set() methods.  Overrides VariableType.generate().
             dictionary_out: Outputs a dictionary containing column summary statistics. Must be called after analyse() or set() methods.  Overrides VariableType.dictionary_out().
             delete_column: Marks the pandas Series containing real data for deletion and calls the garbage collector. Inherited from VariableType.
@@ -41,8 +45,44 @@ class EmptyVariable(VariableType):
         """
         
         super().delete_column()
+        
+    def new_partial(self) -> EmptyPartial:
+        """Public method creating empty partial statistics for analysing the column one block of rows at a time.
+        
+        Overrides VariableType.new_partial().
+
+        Returns:
+            EmptyPartial: Empty partial statistics.
+        """
+        
+        return EmptyPartial()
+        
+    def analyse_partial(self, partial: EmptyPartial):
+        """Public method that completes the analysis from the partial statistics of all blocks of the column.  As with analyse(), there is nothing to store.
+        
+        Overrides VariableType.analyse_partial().
+
+        Args:
+            partial (EmptyPartial): Partial statistics updated with every block of the column.
+        """
+        
+        super().delete_column()
+    
+    def missing_count(self, new_column_length: int) -> int:
+        """Public method giving the number of missing values in a new synthetic column.  Every value of an empty column is missing.
+        
+        Overrides VariableType.missing_count().
+
+        Args:
+            new_column_length (int): The number of rows in the new column.
+
+        Returns:
+            int: Number of missing values, i.e. new_column_length.
+        """
+        
+        return new_column_length
     
-    def generate(self, new_column_length: int) -> pd.Series:
+    def generate(self, new_column_length: int, rng: np.random.Generator | None = None, n_missing: int | None = None) -> pd.Series:
         """Public method that generates a new column of synthetic data based on stored summary statistics.  Should be called after the analyse() or set() methods.
         
         A pandas Series of the required length consisting entirly of np.NaN values is generated and assigned the same name as the real data column.
@@ -51,6 +91,8 @@ class EmptyVariable(VariableType):
         
         Args:
             new_column_length (int): The number of rows required in the output column.
+            rng (numpy.random.Generator, optional): Unused, as there is nothing random about an empty column.  Accepted for consistency with the other column types. Defaults to None.
+            n_missing (int, optional): Unused, as every row is missing.  Accepted for consistency with the other column types. Defaults to None.
 
         Returns:
             Pandas.Series: A Pandas Series consisting of np.NaN values.
@@ -5,6 +5,7 @@ import pandas as pd
 import numpy as np
 
 from .VariableType import VariableType
+from .PartialStatistics import NumericalPartial
 
 class NumericalVariable(VariableType):
     """Subclass extending VariableType.  Contains methods for producing a pandas series of synthetic numerical data from a pandas series of real numerical data.
@@ -12,14 +13,17 @@ class NumericalVariable(VariableType):
         Public methods:
             __init__: Constructor.  Extends VariableType.__init__().
             analyse: Calculates summary statistics of the real data. Overrides VariableType.analyse().
+            new_partial: Creates empty partial statistics for chunked analysis. Overrides VariableType.new_partial().
+            analyse_partial: Calculates summary statistics from the partial statistics of all blocks of the real data. Overrides VariableType.analyse_partial().
             generate: Generates a column of synthetic data from the summary statistices.  Must be called after analyse() or set() methods.  Overrides VariableType.generate().
             dictionary_out: Outputs a dictionary containing column summary statistics. Must be called after analyse() or set() methods.  Overrides VariableType.dictionary_out().
             set: Sets table definitions that aren't set by the constructor.  Used to create column definitions from stored summary statistics.
             analyse_missingness: Calculates the number of missing and present values in the real data Series.  Inherited from VariableType.
+            missing_rows: Chooses which rows of a synthetic column are missing.  Inherited from VariableType.
             delete_column: Marks the pandas Series containing real data for deletion and calls the garbage collector. Inherited from VariableType.
     """
     
-    def __init__(self, column: pd.Series, decimal_precision: int, average_min_max=True):
+    def __init__(self, column: pd.Series, decimal_precision: int, average_min_max=True, parsed_column: pd.Series | None = None):
         """Constructor function for NumericalVariable, defining the properties of a numerical column.
 
         Passes column data to superclass constructor and sets column type to "numerical".  Sets the decimal precision and whether maximum and minimum values will be determined as usual or from averaging across a set of largest or smallest values respectively.
@@ -30,35 +34,49 @@ class NumericalVariable(VariableType):
             column (pandas.Series): The column from which synthetic data is to be generated.
             decimal_precision (int): The numerical precision of the output.
             average_min_max (bool, optional): Are the minimum and maximum values to be averaged from THRESHOLD (currently set to 10) values in line with typical disclosure practise (True) or from single values, which is permissible if there are structural reasons for the maximum and the minimum (False). Defaults to True.
+            parsed_column (pandas.Series, optional): The column already parsed as numbers, e.g. during type identification.  If given, analyse() uses it instead of parsing the column again. Defaults to None.
         """
         
         super().__init__(column, "numeric")
         self.decimal_precision = decimal_precision
         self.average_min_max = average_min_max # do we average the max and minimum or not?
+        self.parsed_column = parsed_column
         
-    def __average_min(self) -> float:
-        """Private method generating an averaged minimum over the THRESHOLD smallest non-missing values.
-
-        Returns:
-            float: The averaged minimum.
-        """
+    def __summary_statistics(self, values: np.ndarray) -> dict:
+        """Private method computing every summary statistic needed by analyse() from the non-missing values in a single set of array operations.
         
-        if self.non_missing < self.get_THRESHOLD():
-            raise ValueError(f'Insuffucient number of values in series to produce disclosure safe average minimum (less than {self.get_THRESHOLD()})')
-        smallest = self.column.dropna().nsmallest(n=self.get_THRESHOLD(), keep='first')
-        return smallest.mean()
-    
-    def __average_max(self):
-        """Private method generating an averaged maximum over the THRESHOLD largest non-missing values.
+        The THRESHOLD smallest and largest values are found with np.partition rather than by sorting, and are used for the averaged minimum and maximum.
+
+        Args:
+            values (numpy.ndarray): Non-missing column values as float64.
+
+        Raises:
+            ValueError: If there are fewer than THRESHOLD values, as the averaged minimum and maximum would not be disclosure safe.
 
         Returns:
-            float: The averaged maximum.
+            dict: count, mean, standard_deviation, minimum, maximum, average_minimum, average_maximum, negative_count, positive_count and is_integer.
         """
         
-        if self.non_missing < self.get_THRESHOLD():
-            raise ValueError(f'Insuffucient number of values in series to produce disclosure safe average maximum (less than {self.get_THRESHOLD()})')
-        smallest = self.column.dropna().nlargest(n=self.get_THRESHOLD(), keep='first')
-        return smallest.mean()
+        count = values.size
+        threshold = self.get_THRESHOLD()
+        if count < threshold:
+            raise ValueError(f'Insuffucient number of values in series to produce disclosure safe average minimum and maximum (less than {threshold})')
+        
+        mean = values.mean()
+        partitioned = np.partition(values, (threshold - 1, count - threshold))
+        
+        return {
+            "count": count,
+            "mean": mean,
+            "standard_deviation": np.sqrt(np.square(values - mean).sum()/(count - 1)) if count > 1 else np.NaN,
+            "minimum": partitioned[0:threshold].min(),
+            "maximum": partitioned[count - threshold:].max(),
+            "average_minimum": partitioned[0:threshold].mean(),
+            "average_maximum": partitioned[count - threshold:].mean(),
+            "negative_count": np.count_nonzero(values < 0),
+            "positive_count": np.count_nonzero(values > 0),
+            "is_integer": bool(np.all(np.floor(values) == values)),
+        }
     
     def analyse(self):
         """Public method that extracts the summary statistics of the column and stores them internally.
@@ -68,76 +86,108 @@ class NumericalVariable(VariableType):
         Overrides VariableType.analyse().
         """
         
-        temp = pd.to_numeric(self.column, errors = "coerce" )
-        self.column = temp.copy(deep=True)
+        self.column = pd.to_numeric(self.column, errors = "coerce" ) if self.parsed_column is None else self.parsed_column
+        self.parsed_column = None
         self.length, self.missing, self.non_missing = super().analyse_missingness()
         
-        self.is_integer = True if str(self.column.dtypes) == 'int64' or all(y.is_integer() or pd.isnull(y) for y in self.column) else False
+        values = self.column.to_numpy(dtype='float64', na_value=np.NaN)
+        statistics = self.__summary_statistics(values[~np.isnan(values)])
+        self.__set_statistics(statistics, is_integer_dtype=str(self.column.dtypes) == 'int64')
+        
+        super().delete_column() # frees up memory.
+        
+    def new_partial(self) -> NumericalPartial:
+        """Public method creating empty partial statistics for analysing the column one block of rows at a time.
+        
+        Overrides VariableType.new_partial().
+
+        Returns:
+            NumericalPartial: Empty partial statistics.
+        """
+        
+        return NumericalPartial(self.get_THRESHOLD())
+        
+    def analyse_partial(self, partial: NumericalPartial):
+        """Public method that sets the summary statistics of the column from the partial statistics of all of its blocks, as analyse() does from the whole column.
+        
+        Overrides VariableType.analyse_partial().
+
+        Args:
+            partial (NumericalPartial): Partial statistics updated with every block of the column.
+        """
+        
+        self.parsed_column = None
+        self.length, self.missing, self.non_missing = super().partial_missingness(partial)
+        self.__set_statistics(partial.summary_statistics())
+        super().delete_column()
+        
+    def __set_statistics(self, statistics: dict, is_integer_dtype: bool = False):
+        """Private method that stores the summary statistics used to generate data.
+
+        Args:
+            statistics (dict): Summary statistics, as returned by the private summary statistics method.
+            is_integer_dtype (bool, optional): Whether the parsed column has an integer dtype. Defaults to False.
+        """
+        
+        self.is_integer = is_integer_dtype or statistics["is_integer"]
         self.decimal_precision = 0 if self.is_integer else self.decimal_precision
         
         # calculate numerical properties
-        self.mean = self.column.dropna().mean()
-        self.standard_deviation = self.column.dropna().std()
+        self.mean = statistics["mean"]
+        self.standard_deviation = statistics["standard_deviation"]
         if self.average_min_max:
-            self.max_value = self.__average_max()
-            self.min_value = self.__average_min()
+            self.max_value = statistics["average_maximum"]
+            self.min_value = statistics["average_minimum"]
         else:
-            self.max_value = self.column.dropna().max()
-            self.min_value = self.column.dropna().min()
+            self.max_value = statistics["maximum"]
+            self.min_value = statistics["minimum"]
         
         # enforce structural positivity and negativity of all values
-        nrow_negative_values = self.column[self.column < 0].dropna().shape[0] 
-        nrow_positive_values = self.column[self.column > 0].dropna().shape[0] 
-        self.all_values_negative = True if (nrow_negative_values > 0 & nrow_positive_values == 0) else False
-        self.all_values_positive = True if (nrow_positive_values > 0 & nrow_negative_values == 0) else False
+        self.all_values_negative = statistics["negative_count"] > 0 and statistics["positive_count"] == 0
+        self.all_values_positive = statistics["positive_count"] > 0 and statistics["negative_count"] == 0
         
-        super().delete_column() # frees up memory.
-        
-    def generate(self, new_column_length: int) -> pd.Series:
+    def generate(self, new_column_length: int, rng: np.random.Generator | None = None, n_missing: int | None = None) -> pd.Series:
         """Public method that generates a new column of synthetic data based on stored summary statistics.  Should be called after the analyse() or set() methods.
         
-        Values are generated from the summary statistics according to the frequency of missing data and the mean and standard deviation of the non-missing data.  If all real data values were positive (negative), then values below (above) zero are truncated at the minimum (maximum) value.  If the real data was integer, it is converted to Int64 type, otherwise to Float64, and output in a pandas Series.
+        Values are generated from the summary statistics according to the frequency of missing data and the mean and standard deviation of the non-missing data.  The missing rows are chosen first (see VariableType.missing_rows()), and values are only drawn for the present rows.  If all real data values were positive (negative), then values below (above) zero are truncated at the minimum (maximum) value.  If the real data was integer, it is converted to Int64 type, otherwise to Float64, and output in a pandas Series.
 
         Overrides VariableType.generate().
 
         Args:
             new_column_length (int): The number of rows required in the output column.
+            rng (numpy.random.Generator, optional): Source of randomness for the column. A freshly seeded Generator is used if None. Defaults to None.
+            n_missing (int, optional): Number of missing rows, e.g. the share of this block in a table generated in blocks.  If None, missing_count(new_column_length) rows are missing. Defaults to None.
 
         Returns:
             Pandas.Series: A Pandas Series of float64 or Int64 dtype, depending on whether the input is real numbers or integers respectively.
         """
         
-        # randomly reproduce missingness
-        def random_numerical_selection(x_mean, x_sd, nrow_non_NA, nrow):
+        if rng is None:
             rng = np.random.default_rng()
-            probabilities=[nrow_non_NA/nrow, (nrow-nrow_non_NA)/nrow]
-            values=[rng.normal(x_mean, x_sd), np.NaN]
-            return rng.choice(values, p=probabilities)
-        
-        new_column = [random_numerical_selection(self.mean, self.standard_deviation, self.non_missing, self.length) for _ in range(new_column_length)]
         
-        new_column = pd.Series(new_column)
+        # choose the missing rows, then draw the values of the present rows in one batch
+        is_missing = super().missing_rows(new_column_length, rng, n_missing)
+        values = rng.normal(self.mean, self.standard_deviation, new_column_length - int(is_missing.sum()))
         
-        # impose structural positivity or negativitry on randomly generated values
+        # impose structural positivity or negativity on randomly generated values
         if self.all_values_negative:
-            new_column.loc[(new_column > 0)] = self.max_value
+            values[values > 0] = self.max_value
         if self.all_values_positive:
-            new_column.loc[(new_column < 0)] = self.min_value
-            
-        # impose caps on min/max
-        new_column.loc[(new_column > self.max_value)] = self.max_value # this may enforce structural positivity and negativity by default, but will leave code for that in for now.
-        new_column.loc[(new_column < self.min_value)] = self.min_value  
+            values[values < 0] = self.min_value
             
-        new_column = new_column.replace(np.NaN, 'nan') # we do this because otherwise different NaN types cause a headache.
+        # impose caps on min/max (in this order, so the minimum wins if the two are ever swapped)
+        values = np.minimum(values, self.max_value)
+        values = np.maximum(values, self.min_value)
         
-        # impose integerness or floatness on the column    
+        # impose integerness or floatness on the column
         if self.is_integer:
-            new_column.fillna(pd.NA, inplace=True)
-            new_column = new_column.map(lambda x: int(x) if x!='nan' else pd.NA)
-            new_column = new_column.astype('Int64')
+            integers = np.zeros(new_column_length, dtype='int64')
+            integers[~is_missing] = np.trunc(values)
+            new_column = pd.Series(pd.arrays.IntegerArray(integers, is_missing))
         else:
-            new_column = new_column.map(lambda x: round(x, int(self.decimal_precision)) if x!='nan' else np.NaN)
-            new_column = new_column.astype('float64')
+            floats = np.full(new_column_length, np.NaN)
+            floats[~is_missing] = np.round(values, int(self.decimal_precision))
+            new_column = pd.Series(floats, dtype='float64')
             
         new_column.name=self.COLUMN_NAME
             
@@ -0,0 +1,433 @@
+"""Contains the partial statistics classes, which accumulate the sufficient statistics of a column one block of rows at a time.
+
+Each column type has a partial statistics class holding everything its analyse() method needs, in a form that can be updated from a block of rows and merged with the partial statistics of other blocks.  A column can therefore be analysed without ever being held in memory in full, and blocks can be analysed in separate worker processes and merged afterwards.  The partial statistics are turned into an analysed column by the analyse_partial() method of the matching VariableType subclass.
+"""
+
+from abc import ABC, abstractmethod
+from datetime import date
+import warnings
+
+import numpy as np
+import pandas as pd
+
+from .general_functions import count_values
+
+class PartialStatistics(ABC):
+    """Base class for partial statistics.  Keeps the counts of rows, missing values and present values used in the disclosure check of every column type.
+
+        Public methods:
+            __init__: Constructor.
+            update: Abstract method. Adds a block of rows.
+            merge: Abstract method. Adds the partial statistics of other blocks.
+            update_missingness: Adds the counts of a block of rows.
+            merge_missingness: Adds the counts of another partial.
+    """
+
+    def __init__(self):
+        """Constructor for the base class.  Sets all counts to zero."""
+
+        self.length = 0 # number of rows
+        self.missing = 0 # number of null values
+        self.present = 0 # number of values neither null nor blank, which must meet the disclosure threshold
+
+    def update_missingness(self, column: pd.Series):
+        """Public method that adds the counts of a block of rows.
+
+        Args:
+            column (pandas.Series): Block of column data, after any parsing done by the column type.
+        """
+
+        is_present = column.notna()
+        if column.dtype == object:
+            is_present &= (column != "")
+        self.length += column.shape[0]
+        self.missing += int(column.isnull().sum())
+        self.present += int(is_present.sum())
+
+    def merge_missingness(self, other: 'PartialStatistics'):
+        """Public method that adds the counts of another partial.
+
+        Args:
+            other (PartialStatistics): Partial statistics of other blocks of the same column.
+        """
+
+        self.length += other.length
+        self.missing += other.missing
+        self.present += other.present
+
+    @abstractmethod
+    def update(self, column: pd.Series) -> 'PartialStatistics':
+        """Abstract method. Placeholder for public method adding a block of rows.
+
+        Raises:
+            NotImplementedError: If accessed via this class rather than a subclass.
+        """
+        raise NotImplementedError
+
+    @abstractmethod
+    def merge(self, other: 'PartialStatistics') -> 'PartialStatistics':
+        """Abstract method. Placeholder for public method adding the partial statistics of other blocks.
+
+        Raises:
+            NotImplementedError: If accessed via this class rather than a subclass.
+        """
+        raise NotImplementedError
+
+def _merge_moments(count_a: int, mean_a: float, m2_a: float, count_b: int, mean_b: float, m2_b: float) -> tuple[int, float, float]:
+    """Combines the count, mean and sum of squared deviations of two sets of values (Chan et al.'s parallel form of Welford's algorithm)."""
+
+    count = count_a + count_b
+    if count_a == 0 or count_b == 0:
+        return (count, mean_a, m2_a) if count_b == 0 else (count, mean_b, m2_b)
+    delta = mean_b - mean_a
+    mean = mean_a + delta*count_b/count
+    m2 = m2_a + m2_b + delta*delta*count_a*count_b/count
+    return count, mean, m2
+
+def _moments(values: np.ndarray) -> tuple[int, float, float]:
+    """Count, mean and sum of squared deviations of a set of values."""
+
+    if values.size == 0:
+        return 0, 0.0, 0.0
+    mean = values.mean()
+    return values.size, mean, np.square(values - mean).sum()
+
+def _smallest(values: np.ndarray, k: int) -> np.ndarray:
+    """The k smallest values, in ascending order."""
+
+    if values.size > k:
+        values = np.partition(values, k - 1)[0:k]
+    return np.sort(values)
+
+def _largest(values: np.ndarray, k: int) -> np.ndarray:
+    """The k largest values, in descending order."""
+
+    if values.size > k:
+        values = np.partition(values, values.size - k)[values.size - k:]
+    return np.sort(values)[::-1]
+
+class NumericalPartial(PartialStatistics):
+    """Partial statistics of a numerical column: the moments of the values, the THRESHOLD smallest and largest values, the numbers of negative and positive values and whether all values are integers."""
+
+    def __init__(self, threshold: int):
+        """Constructor for NumericalPartial.
+
+        Args:
+            threshold (int): Number of smallest and largest values kept, i.e. the disclosure threshold used for the averaged minimum and maximum.
+        """
+
+        super().__init__()
+        self.threshold = threshold
+        self.count = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.smallest = np.empty(0, dtype='float64')
+        self.largest = np.empty(0, dtype='float64')
+        self.negative_count = 0
+        self.positive_count = 0
+        self.is_integer = True
+
+    def update(self, column: pd.Series) -> 'NumericalPartial':
+        """Public method that adds a block of rows.  Values are parsed as in NumericalVariable.analyse().
+
+        Args:
+            column (pandas.Series): Block of column data.
+
+        Returns:
+            NumericalPartial: self.
+        """
+
+        column = pd.to_numeric(column, errors="coerce")
+        self.update_missingness(column)
+
+        values = column.to_numpy(dtype='float64', na_value=np.NaN)
+        values = values[~np.isnan(values)]
+        block = NumericalPartial(self.threshold)
+        block.count, block.mean, block.m2 = _moments(values)
+        block.smallest = _smallest(values, self.threshold)
+        block.largest = _largest(values, self.threshold)
+        block.negative_count = np.count_nonzero(values < 0)
+        block.positive_count = np.count_nonzero(values > 0)
+        block.is_integer = bool(np.all(np.floor(values) == values))
+        self.__merge_values(block)
+        return self
+
+    def merge(self, other: 'NumericalPartial') -> 'NumericalPartial':
+        """Public method that adds the partial statistics of other blocks.
+
+        Args:
+            other (NumericalPartial): Partial statistics of other blocks of the same column.
+
+        Returns:
+            NumericalPartial: self.
+        """
+
+        self.merge_missingness(other)
+        self.__merge_values(other)
+        return self
+
+    def __merge_values(self, other: 'NumericalPartial'):
+        """Private method combining everything but the missingness counts."""
+
+        self.count, self.mean, self.m2 = _merge_moments(self.count, self.mean, self.m2, other.count, other.mean, other.m2)
+        self.smallest = _smallest(np.concatenate([self.smallest, other.smallest]), self.threshold)
+        self.largest = _largest(np.concatenate([self.largest, other.largest]), self.threshold)
+        self.negative_count += other.negative_count
+        self.positive_count += other.positive_count
+        self.is_integer = self.is_integer and other.is_integer
+
+    def summary_statistics(self) -> dict:
+        """Public method giving the summary statistics in the form returned by the private NumericalVariable summary statistics method.
+
+        Raises:
+            ValueError: If there are fewer than THRESHOLD values, as the averaged minimum and maximum would not be disclosure safe.
+
+        Returns:
+            dict: count, mean, standard_deviation, minimum, maximum, average_minimum, average_maximum, negative_count, positive_count and is_integer.
+        """
+
+        if self.count < self.threshold:
+            raise ValueError(f'Insuffucient number of values in series to produce disclosure safe average minimum and maximum (less than {self.threshold})')
+
+        return {
+            "count": self.count,
+            "mean": self.mean,
+            "standard_deviation": np.sqrt(self.m2/(self.count - 1)) if self.count > 1 else np.NaN,
+            "minimum": self.smallest[0],
+            "maximum": self.largest[0],
+            "average_minimum": self.smallest.mean(),
+            "average_maximum": self.largest.mean(),
+            "negative_count": self.negative_count,
+            "positive_count": self.positive_count,
+            "is_integer": self.is_integer,
+        }
+
+class CategoricalPartial(PartialStatistics):
+    """Partial statistics of a categorical column: the count of each value, with missing values counted as the value 'nan'.  Values are kept in the order they were first seen."""
+
+    def __init__(self):
+        """Constructor for CategoricalPartial."""
+
+        super().__init__()
+        self.counts = {}
+
+    def update(self, column: pd.Series) -> 'CategoricalPartial':
+        """Public method that adds a block of rows.  Values are prepared as in CategoricalVariable.analyse().
+
+        Args:
+            column (pandas.Series): Block of column data.
+
+        Returns:
+            CategoricalPartial: self.
+        """
+
+        counts, present = count_values(column)
+        self.length += column.shape[0]
+        self.missing += int(column.isnull().sum())
+        self.present += present
+        self.__merge_counts(counts.items())
+        return self
+
+    def merge(self, other: 'CategoricalPartial') -> 'CategoricalPartial':
+        """Public method that adds the partial statistics of other blocks.
+
+        Args:
+            other (CategoricalPartial): Partial statistics of other blocks of the same column.
+
+        Returns:
+            CategoricalPartial: self.
+        """
+
+        self.merge_missingness(other)
+        self.__merge_counts(other.counts.items())
+        return self
+
+    def __merge_counts(self, counts):
+        """Private method adding (value, count) pairs to the counts."""
+
+        for value, count in counts:
+            self.counts[value] = self.counts.get(value, 0) + int(count)
+
+class StringPartial(PartialStatistics):
+    """Partial statistics of a string column: the moments and extremes of the string lengths, and the count of each character in each position (used if the strings turn out to be patterned)."""
+
+    def __init__(self):
+        """Constructor for StringPartial."""
+
+        super().__init__()
+        self.count = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.min_length = None
+        self.max_length = None
+        self.position_counts = [] # one dictionary of character counts per position
+
+    def update(self, column: pd.Series) -> 'StringPartial':
+        """Public method that adds a block of rows.  Values are prepared as in StringVariable.analyse().
+
+        Args:
+            column (pandas.Series): Block of column data.
+
+        Returns:
+            StringPartial: self.
+        """
+
+        column = column.replace('', np.NaN)
+        self.update_missingness(column)
+
+        text = column.astype(str)
+        strings = text[(text != 'nan') & (text != '')].to_numpy(dtype=str)
+        lengths = np.char.str_len(strings)
+        block = StringPartial()
+        block.count, block.mean, block.m2 = _moments(lengths.astype('float64'))
+        if lengths.size > 0:
+            block.min_length = int(lengths.min())
+            block.max_length = int(lengths.max())
+            block.position_counts = StringPartial.__count_characters(strings, lengths)
+        self.__merge_values(block)
+        return self
+
+    @staticmethod
+    def __count_characters(strings: np.ndarray, lengths: np.ndarray) -> list[dict]:
+        """Private method counting the characters in each position of the strings.
+
+        Strings of equal length are viewed as a matrix of character codes, and every (position, character) pair is counted in a single sort.  Grouping by length means no string is padded to the width of a longer one.
+        """
+
+        order = np.argsort(lengths, kind='stable')
+        distinct_lengths, starts = np.unique(lengths[order], return_index=True)
+        keys = []
+        for length, group in zip(distinct_lengths.tolist(), np.split(order, starts[1:])):
+            if length == 0:
+                continue
+            codes = np.ascontiguousarray(strings[group].astype(f'<U{length}')).view('uint32').reshape(group.size, length).astype('int64')
+            keys.append((np.arange(length)*0x110000 + codes).ravel())
+        keys, counts = np.unique(np.concatenate(keys), return_counts=True)
+
+        position_counts = [{} for _ in range(int(distinct_lengths.max()))]
+        for key, count in zip(keys.tolist(), counts.tolist()):
+            position, code = divmod(key, 0x110000)
+            position_counts[position][chr(code)] = count
+        return position_counts
+
+    def merge(self, other: 'StringPartial') -> 'StringPartial':
+        """Public method that adds the partial statistics of other blocks.
+
+        Args:
+            other (StringPartial): Partial statistics of other blocks of the same column.
+
+        Returns:
+            StringPartial: self.
+        """
+
+        self.merge_missingness(other)
+        self.__merge_values(other)
+        return self
+
+    def __merge_values(self, other: 'StringPartial'):
+        """Private method combining everything but the missingness counts."""
+
+        self.count, self.mean, self.m2 = _merge_moments(self.count, self.mean, self.m2, other.count, other.mean, other.m2)
+        self.min_length = other.min_length if self.min_length is None else (self.min_length if other.min_length is None else min(self.min_length, other.min_length))
+        self.max_length = other.max_length if self.max_length is None else (self.max_length if other.max_length is None else max(self.max_length, other.max_length))
+        for position, counts in enumerate(other.position_counts):
+            if position == len(self.position_counts):
+                self.position_counts.append({})
+            for character, count in counts.items():
+                self.position_counts[position][character] = self.position_counts[position].get(character, 0) + count
+
+class DatetimePartial(PartialStatistics):
+    """Partial statistics of a datetime column: the THRESHOLD earliest and latest times, and whether any value has a time of day or a date other than today."""
+
+    __NANOSECONDS_PER_DAY = 86400*10**9
+
+    def __init__(self, threshold: int):
+        """Constructor for DatetimePartial.
+
+        Args:
+            threshold (int): Number of earliest and latest times kept, i.e. the disclosure threshold used for the averaged earliest and latest times.
+        """
+
+        super().__init__()
+        self.threshold = threshold
+        self.earliest = np.empty(0, dtype='int64') # nanoseconds since the epoch
+        self.latest = np.empty(0, dtype='int64')
+        self.times_present = False
+        self.dates_present = False
+
+    def update(self, column: pd.Series) -> 'DatetimePartial':
+        """Public method that adds a block of rows.  Values are parsed as in DatetimeVariable.analyse().
+
+        Args:
+            column (pandas.Series): Block of column data.
+
+        Returns:
+            DatetimePartial: self.
+        """
+
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore")
+            column = pd.to_datetime(column, errors = 'coerce', format='mixed')
+        self.update_missingness(column)
+
+        times = column.dropna().to_numpy(dtype='datetime64[ns]').view('int64')
+        days, time_of_day = np.divmod(times, self.__NANOSECONDS_PER_DAY)
+        block = DatetimePartial(self.threshold)
+        block.earliest = _smallest(times, self.threshold)
+        block.latest = _largest(times, self.threshold)
+        # as in DatetimeVariable.analyse(): a time of day is one that isn't midnight to the microsecond, and a date is one that isn't today's (which pandas attaches to times without a date)
+        block.times_present = bool(np.any(time_of_day//1000 != 0))
+        block.dates_present = bool(np.any(days != pd.Timestamp(date.today()).value//self.__NANOSECONDS_PER_DAY))
+        self.__merge_values(block)
+        return self
+
+    def merge(self, other: 'DatetimePartial') -> 'DatetimePartial':
+        """Public method that adds the partial statistics of other blocks.
+
+        Args:
+            other (DatetimePartial): Partial statistics of other blocks of the same column.
+
+        Returns:
+            DatetimePartial: self.
+        """
+
+        self.merge_missingness(other)
+        self.__merge_values(other)
+        return self
+
+    def __merge_values(self, other: 'DatetimePartial'):
+        """Private method combining everything but the missingness counts."""
+
+        self.earliest = _smallest(np.concatenate([self.earliest, other.earliest]), self.threshold)
+        self.latest = _largest(np.concatenate([self.latest, other.latest]), self.threshold)
+        self.times_present = self.times_present or other.times_present
+        self.dates_present = self.dates_present or other.dates_present
+
+class EmptyPartial(PartialStatistics):
+    """Partial statistics of an empty column, which only counts rows."""
+
+    def update(self, column: pd.Series) -> 'EmptyPartial':
+        """Public method that adds a block of rows.
+
+        Args:
+            column (pandas.Series): Block of column data.
+
+        Returns:
+            EmptyPartial: self.
+        """
+
+        self.update_missingness(column)
+        return self
+
+    def merge(self, other: 'EmptyPartial') -> 'EmptyPartial':
+        """Public method that adds the partial statistics of other blocks.
+
+        Args:
+            other (EmptyPartial): Partial statistics of other blocks of the same column.
+
+        Returns:
+            EmptyPartial: self.
+        """
+
+        self.merge_missingness(other)
+        return self
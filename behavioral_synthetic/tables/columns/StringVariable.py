@@ -5,6 +5,7 @@ import pandas as pd
 import numpy as np
 
 from .VariableType import VariableType
+from .PartialStatistics import StringPartial
 from .general_functions import paste0
 
 class StringVariable(VariableType):
@@ -13,11 +14,14 @@ class StringVariable(VariableType):
         Public methods:
             __init__: Constructor.  Extends VariableType.__init__().
             analyse: Calculates summary statistics of the real data. Overrides VariableType.analyse().
+            new_partial: Creates empty partial statistics for chunked analysis. Overrides VariableType.new_partial().
+            analyse_partial: Calculates summary statistics from the partial statistics of all blocks of the real data. Overrides VariableType.analyse_partial().
             generate: Generates a column of synthetic data from the summary statistices.  Must be called after analyse() or set() methods.  Overrides VariableType.generate().
             dictionary_out: Outputs a dictionary containing column summary statistics. Must be called after analyse() or set() methods.  Overrides VariableType.dictionary_out().
             set_pattern: Sets table definitions that aren't set by the constructor for strings with patterns.  Used to create column definitions from stored summary statistics.
             set_no_patterns: Sets table definitions that aren't set by the constructor for unpatterned strings.  Used to create column definitions from stored summary statistics.
             analyse_missingness: Calculates the number of missing and present values in the real data Series.  Inherited from VariableType.
+            missing_rows: Chooses which rows of a synthetic column are missing.  Inherited from VariableType.
             delete_column: Marks the pandas Series containing real data for deletion and calls the garbage collector. Inherited from VariableType.
     """
     
@@ -47,6 +51,18 @@ class StringVariable(VariableType):
         #Cross tabulate each column and extract values and associated frequencies
         frequencies = column_split.apply(pd.Series.value_counts, normalize=True)
         self.frequencies = frequencies.fillna(0)
+        self.__prepare_pattern_sampler()
+        
+    def __prepare_pattern_sampler(self):
+        """Private method that precomputes what is needed to sample patterned strings: the characters as a numpy array and, for each position, the cumulative distribution of those characters.
+        
+        Each position is renormalised, as frequencies read in from a definition are rounded and need not sum to exactly one.
+        """
+        
+        frequencies = self.frequencies.fillna(0).iloc[:, 0:int(self.max_character_length)].to_numpy(dtype='float64')
+        cumulative = np.cumsum(frequencies, axis=0)
+        self.pattern_cumulative = (cumulative/cumulative[-1, :]).T # one row per position
+        self.pattern_characters = np.array([str(character) for character in self.frequencies.axes[0]])
     
         
     def analyse(self):
@@ -74,75 +90,128 @@ class StringVariable(VariableType):
             
         super().delete_column()
         
-    def __no_pattern_generate(self, new_column_length: int) -> pd.Series:
+    def new_partial(self) -> StringPartial:
+        """Public method creating empty partial statistics for analysing the column one block of rows at a time.
+        
+        Overrides VariableType.new_partial().
+
+        Returns:
+            StringPartial: Empty partial statistics.
+        """
+        
+        return StringPartial()
+        
+    def analyse_partial(self, partial: StringPartial):
+        """Public method that sets the summary statistics of the column from the partial statistics of all of its blocks, as analyse() does from the whole column.  The character frequencies in each position are only used if the strings turn out to be patterned.
+        
+        Overrides VariableType.analyse_partial().
+
+        Args:
+            partial (StringPartial): Partial statistics updated with every block of the column.
+        """
+        
+        self.length, self.missing, self.non_missing = super().partial_missingness(partial)
+        
+        self.av_character_length = partial.mean if partial.count > 0 else np.NaN
+        self.sd_character_length = np.sqrt(partial.m2/(partial.count - 1)) if partial.count > 1 else np.NaN
+        self.max_character_length = partial.max_length
+        self.min_character_length = partial.min_length
+        
+        self.text_pattern = False if (self.sd_character_length > self.PATTERN_THRESHOLD*self.av_character_length) else True
+        if self.text_pattern:
+            frequencies = pd.DataFrame(partial.position_counts).T
+            frequencies.columns = paste0('position', range(1,(self.max_character_length+1)))
+            self.frequencies = (frequencies/frequencies.sum()).sort_index().fillna(0)
+            self.__prepare_pattern_sampler()
+            
+        super().delete_column()
+        
+    def __no_pattern_generate(self, new_column_length: int, rng: np.random.Generator, n_missing: int | None) -> pd.Series:
         """Private method used to generate synthetic data columns when there is no pattern present in the strings.
 
         Args:
             new_column_length (int): number of rows in the column.
+            rng (numpy.random.Generator): Source of randomness for the column.
+            n_missing (int | None): Number of missing rows, as in generate().
 
         Returns:
             pandas.Series: synthetic data output.
         """
         
-        def str_of_len(random_len: int, placeholder: str) -> str:
-            output = ''
-            while len(output) < random_len:
-                output += placeholder
-            return f'{output[0:random_len-1]}'
-            
-        def random_length_str(max_len: int, min_len: int, placeholder: str) -> str:
-            return str_of_len(np.random.default_rng().integers(min_len, max_len+1), placeholder)
-        
-        def random_string_selection(max_character_length: int, min_character_length: int, placeholder_text: str, nrow_non_NA: int, nrow:int) -> str:
-            probabilities=[nrow_non_NA/nrow, (nrow-nrow_non_NA)/nrow]
-            values=[random_length_str(max_character_length, min_character_length, placeholder_text), np.NaN]
-            return np.random.choice(values, p=probabilities)
-                                           
-        new_column = [random_string_selection(self.max_character_length, self.min_character_length, self.PLACEHOLDER_TEXT,self.non_missing, self.length) for _ in range(new_column_length)]
-        new_column = pd.Series(new_column).replace('nan', np.NaN)
-        return new_column
+        min_length = int(self.min_character_length)
+        max_length = int(self.max_character_length)
+        
+        # every value is a prefix of the repeated placeholder, so build each possible value once and index into them
+        # (a drawn length of n gives the first n-1 characters, as it always has)
+        repeated = self.PLACEHOLDER_TEXT * (max_length//len(self.PLACEHOLDER_TEXT) + 1)
+        values_by_length = np.array([repeated[0:length-1] if length > 0 else '' for length in range(min_length, max_length+1)], dtype=object)
+        
+        is_missing = super().missing_rows(new_column_length, rng, n_missing)
+        lengths = rng.integers(min_length, max_length+1, new_column_length - int(is_missing.sum()))
+        
+        new_column = np.full(new_column_length, np.NaN, dtype=object)
+        new_column[~is_missing] = values_by_length[lengths - min_length]
+        return pd.Series(new_column, dtype=object)
     
-    def __with_pattern_generate(self, new_column_length: int) -> pd.Series:
+    def __with_pattern_generate(self, new_column_length: int, rng: np.random.Generator, n_missing: int | None) -> pd.Series:
         """Private method used to generate synthetic data columns when there is no pattern present in the strings.
 
         Args:
             new_column_length (int): Number of rows in the column.
+            rng (numpy.random.Generator): Source of randomness for the column.
+            n_missing (int | None): Number of missing rows, as in generate().
 
         Returns:
             pd.Series: Column containing synthetic data.
         """
             
-        def random_pattern(frequencies: pd.DataFrame, max_character_length: int) -> str:
-            return ''.join([np.random.choice(frequencies.axes[0].tolist(), p=frequencies.iloc[:, i].tolist()) for i in range(max_character_length)])
-        
-        def random_string_selection(frequencies: pd.DataFrame, max_character_length:int, nrow_non_NA: int, nrow: int) -> str:
-            probabilities=[nrow_non_NA/nrow, (nrow-nrow_non_NA)/nrow]
-            values=[random_pattern(frequencies, max_character_length), np.NaN]
-            return np.random.choice(values, p=probabilities)
+        is_missing = super().missing_rows(new_column_length, rng, n_missing)
+        
+        # sample a code for every present row and position in one batch by inverting the cumulative distribution of each position
+        uniform = rng.random((new_column_length - int(is_missing.sum()), self.pattern_cumulative.shape[0]))
+        codes = np.empty(uniform.shape, dtype='int64')
+        for position, cumulative in enumerate(self.pattern_cumulative):
+            codes[:, position] = np.searchsorted(cumulative, uniform[:, position], side='right')
+        codes = np.minimum(codes, self.pattern_characters.size - 1) # guards against rounding at the top of the distribution
+        
+        characters = self.pattern_characters[codes]
+        if characters.dtype.itemsize == np.dtype('<U1').itemsize:
+            # single characters: reinterpret each row of the (rows x positions) array as one fixed width string
+            strings = np.ascontiguousarray(characters).view(f'<U{characters.shape[1]}').ravel()
+        else:
+            strings = characters[:, 0]
+            for position in range(1, characters.shape[1]):
+                strings = np.char.add(strings, characters[:, position])
         
-        new_column = pd.Series([random_string_selection(self.frequencies, self.max_character_length, self.non_missing, self.length) for _ in range(new_column_length)])
+        new_column = np.full(new_column_length, np.NaN, dtype=object)
+        new_column[~is_missing] = strings
     
-        return new_column.replace('nan', np.NaN)
+        return pd.Series(new_column, dtype=object)
     
-    def generate(self, new_column_length: int) -> pd.Series:
+    def generate(self, new_column_length: int, rng: np.random.Generator | None = None, n_missing: int | None = None) -> pd.Series:
         """Public method that generates a new column of synthetic data based on stored summary statistics.  Should be called after the analyse() or set() methods.
         
-        Missing values are generated according to their frequency.  Non-missing values in patterned columns are generated according to the frequency of characters in each position in the column. Non-missing values in unpattered columns consist of strings of random length (determined from the mean and standard deviation of the lengths of the strings in the real data) assembled from the placeholder text defined internally.
+        Missing rows are chosen first according to their frequency (see VariableType.missing_rows()), and values are only generated for the present rows.  Non-missing values in patterned columns are generated according to the frequency of characters in each position in the column. Non-missing values in unpattered columns consist of strings of random length (determined from the mean and standard deviation of the lengths of the strings in the real data) assembled from the placeholder text defined internally.
         
         Overrides VariableType.generate()
         
         Args:
             new_column_length (int): The number of rows required in the output column.
+            rng (numpy.random.Generator, optional): Source of randomness for the column. A freshly seeded Generator is used if None. Defaults to None.
+            n_missing (int, optional): Number of missing rows, e.g. the share of this block in a table generated in blocks.  If None, missing_count(new_column_length) rows are missing. Defaults to None.
 
         Returns:
             Pandas.Series: A Pandas Series of object dtype.
 
         """
         
+        if rng is None:
+            rng = np.random.default_rng()
+        
         if self.text_pattern:
-            new_column = self.__with_pattern_generate(new_column_length)
+            new_column = self.__with_pattern_generate(new_column_length, rng, n_missing)
         else:
-            new_column = self.__no_pattern_generate(new_column_length)
+            new_column = self.__no_pattern_generate(new_column_length, rng, n_missing)
             
         new_column.name = self.COLUMN_NAME
         
@@ -220,6 +289,7 @@ class StringVariable(VariableType):
         
         
         self.max_character_length = max_length
+        self.__prepare_pattern_sampler()
         
         self.length = number_of_rows
         self.missing = round(missing_freq*number_of_rows, 0)
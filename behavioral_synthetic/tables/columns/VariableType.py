@@ -7,16 +7,23 @@ import gc
 
 import pandas as pd
 
+from .PartialStatistics import PartialStatistics
+
 class VariableType(ABC):
     """Base class for all column variable classes. Stores code used by all column type classes.
     
         Public methods:
         __init__: Constructor method.
         analyse_missingness: Calculates the number of missing and present values in the real data Series.
+        partial_missingness: Gives the number of missing and present values from partial statistics.
+        missing_count: Gives the number of missing values in a synthetic column, matching the missing value frequency of the real data.
+        missing_rows: Chooses which rows of a synthetic column are missing, matching the missing value frequency of the real data.
         delete_column: Marks the pandas Series containing real data for deletion and calls the garbage collector.
         analyse: Abstract method. Placeholder for subclass analysis method.
         generate: Abstract method. Placeholder for subclass synthetic data generation method.
         dictionary_out: Abstract method. Placeholder for subclass summary statistics output method.
+        new_partial: Placeholder for subclass method creating empty partial statistics for chunked analysis.
+        analyse_partial: Placeholder for subclass method analysing the column from partial statistics.
         get_THRESHOLD(): outputs value of disclosure threshold constant.
     """
     
@@ -55,6 +62,55 @@ class VariableType(ABC):
         non_missing_values = column_length - missing_values
         return column_length, missing_values, non_missing_values
     
+    def partial_missingness(self, partial: PartialStatistics) -> Tuple[int, int, int]:
+        """Public method that gives the frequencies of missing and present values from partial statistics, applying the same disclosure test as analyse_missingness().  Called by subclass methods.
+
+        Args:
+            partial (PartialStatistics): Partial statistics of the whole column.
+
+        Raises:
+            ValueError: If the number of non-null entries in a column is less than the disclosure variable __THRESHOLD.
+
+        Returns:
+            Tuple[int, int, int]: The tuple (column_length, missing_values, non_missing_values).
+        """
+        if partial.present < self.__THRESHOLD:
+           raise ValueError(f'Insuffucient number of values in series to produce disclosure safe values (less than {self.__THRESHOLD})')
+        return partial.length, partial.missing, partial.length - partial.missing
+    
+    def missing_count(self, new_column_length: int) -> int:
+        """Public method giving the number of missing values in a new synthetic column: the missing value frequency of the real data times the column length, rounded to the nearest integer, so a column of the original length has exactly as many missing values as the real data.
+        
+        A table generated in blocks works this out once for the whole table, and shares it between the blocks (see general_functions.split_count()), so that rounding in each block doesn't bias the total.
+
+        Args:
+            new_column_length (int): The number of rows in the new column.
+
+        Returns:
+            int: Number of missing values.
+        """
+        return int(round(new_column_length*(self.length - self.non_missing)/self.length))
+    
+    def missing_rows(self, new_column_length: int, rng: np.random.Generator, n_missing: int | None = None) -> np.ndarray:
+        """Public method that chooses which rows of a new synthetic column are missing.  Called by subclass generate() methods, which then only generate values for the present rows.
+        
+        The positions of the missing rows are drawn uniformly without replacement in a single call (drawing the present rows instead when they are fewer).
+
+        Args:
+            new_column_length (int): The number of rows in the new column.
+            rng (numpy.random.Generator): Source of randomness for the column.
+            n_missing (int, optional): Number of missing rows, e.g. the share of this block in a table generated in blocks.  If None, missing_count(new_column_length) rows are missing. Defaults to None.
+
+        Returns:
+            numpy.ndarray: Boolean mask that is True for missing rows.
+        """
+        missing_count = self.missing_count(new_column_length) if n_missing is None else n_missing
+        choose_missing = missing_count <= new_column_length//2
+        chosen = rng.choice(new_column_length, missing_count if choose_missing else new_column_length - missing_count, replace=False, shuffle=False)
+        is_missing = np.full(new_column_length, not choose_missing)
+        is_missing[chosen] = choose_missing
+        return is_missing
+    
     def delete_column(self):
         """Public method that marks the column containing real data for deletion before calling the garbage collector.  Use after column has been analysed, typically as part of a subclass method.
         """
@@ -71,11 +127,37 @@ class VariableType(ABC):
         raise NotImplementedError
     
     @abstractmethod
-    def generate(self, new_column_length: int) -> pd.Series:
+    def new_partial(self) -> PartialStatistics:
+        """Abstract method. Placeholder for public method creating empty partial statistics for the column type, used to analyse a column one block of rows at a time.  Each block is added with the update() method of the partial statistics, and the result passed to analyse_partial().
+
+        Raises:
+            NotImplementedError: If new_partial() is accessed via this class rather than a subclass.
+
+        Returns:
+            PartialStatistics: Empty partial statistics of the subclass matching the column type.
+        """
+        raise NotImplementedError
+    
+    @abstractmethod
+    def analyse_partial(self, partial: PartialStatistics):
+        """Abstract method. Placeholder for public method that sets the summary statistics of the column from the partial statistics of all of its blocks, as analyse() does from the whole column.
+
+        Args:
+            partial (PartialStatistics): Partial statistics created by new_partial() and updated with every block of the column.
+
+        Raises:
+            NotImplementedError: If analyse_partial() is accessed via this class rather than a subclass.
+        """
+        raise NotImplementedError
+    
+    @abstractmethod
+    def generate(self, new_column_length: int, rng: np.random.Generator | None = None, n_missing: int | None = None) -> pd.Series:
         """Abstract method. Placeholder for public method used to generate synthetic data for a column.  An implemented version should be called after analyse().
 
         Args:
             new_column_length (int): The number of rows required in the output column.
+            rng (numpy.random.Generator, optional): Source of randomness for the column. A freshly seeded Generator is used if None. Defaults to None.
+            n_missing (int, optional): Number of missing rows, e.g. the share of this block in a table generated in blocks.  If None, missing_count(new_column_length) rows are missing. Defaults to None.
 
         Raises:
             NotImplementedError: If generate() is accessed via this class rather than a subclass.
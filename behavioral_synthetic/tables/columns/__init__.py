@@ -1 +1 @@
-__all__ = ["VariableType", "CategoricalVariable", "DatetimeVariable", "EmptyVariable", "NumericalVariable", "StringVariable"]
\ No newline at end of file
+__all__ = ["VariableType", "ColumnProfile", "PartialStatistics", "CategoricalVariable", "DatetimeVariable", "EmptyVariable", "NumericalVariable", "StringVariable"]
\ No newline at end of file
@@ -1,12 +1,12 @@
 """This module contains functions that are generally helpful when generating synthetic data.
 """
 
+import numpy as np
 import pandas as pd
 import string
-import secrets
-import random
 import subprocess
 import os
+from typing import Iterator
 
 RSCRIPT_TO_RUN="QA_code.R"
 
@@ -49,6 +49,57 @@ def read_data(x: str) -> pd.DataFrame:
     else:
         raise Exception("Sorry, file type not supported. Try converting to csv, xlsx, txt or pkl.")
     
+def read_data_chunks(x: str, chunksize: int, usecols: list[str] | None = None, **read_options) -> Iterator[pd.DataFrame]:
+    """Reads in data from a file as a sequence of dataframes of at most chunksize rows, so that the whole file never has to be held in memory.  File suffixes handled are as in read_data().
+    
+    csv, txt and tsv files are read with the pandas chunked reader, sas7bdat files with pandas.read_sas(chunksize=...), dta files with pandas.read_stata(chunksize=...) and sav files with pyreadstat's row limits (pyreadstat being the library pandas.read_spss() uses).  xls, xlsx and pkl files can't be read in parts, so they are read in full by read_data() and then split into blocks.
+
+    Args:
+        x (str): File path.
+        chunksize (int): Maximum number of rows in each dataframe.
+        usecols (list[str], optional): Columns to read.  If None, every column is read. Defaults to None.
+        **read_options: Further keyword arguments passed to the pandas (or pyreadstat) read function, e.g. encoding or dtype.
+
+    Raises:
+        ValueError: If chunksize is not a positive integer.
+        Exception: Unsupported file type, or a spreadsheet with more than one sheet.
+
+    Yields:
+        pd.DataFrame: Dataframes containing consecutive rows of the file data.
+    """
+    
+    if chunksize < 1:
+        raise ValueError(f"Chunk size must be a positive integer, not {chunksize}.")
+    
+    if (x.endswith(('csv', 'txt'))):
+        with pd.read_csv(x, chunksize=chunksize, usecols=usecols, **read_options) as reader:
+            yield from reader
+    elif (x.endswith(('tsv'))):
+        with pd.read_csv(x, sep='\t', chunksize=chunksize, usecols=usecols, **read_options) as reader:
+            yield from reader
+    elif (x.endswith('sas7bdat')):
+        with pd.read_sas(x, chunksize=chunksize, **read_options) as reader:
+            for chunk in reader:
+                yield chunk if usecols is None else chunk[usecols]
+    elif (x.endswith('sav')):
+        import pyreadstat # only needed for SPSS files, as for pandas.read_spss()
+        read_options.setdefault('apply_value_formats', True) # as pandas.read_spss() does by default
+        for chunk, _ in pyreadstat.read_file_in_chunks(pyreadstat.read_sav, x, chunksize=chunksize, usecols=usecols, **read_options):
+            yield chunk
+    elif (x.endswith('dta')):
+        with pd.read_stata(x, chunksize=chunksize, columns=usecols, **read_options) as reader:
+            yield from reader
+    elif (x.endswith(('xlsx', 'xls', 'pkl'))):
+        data = read_data(x)
+        if isinstance(data, dict):
+            raise Exception(f"Sorry, {x} has more than one sheet, so it can't be read as a single table.")
+        if usecols is not None:
+            data = data[usecols]
+        for start in range(0, len(data.index), chunksize):
+            yield data.iloc[start:start + chunksize]
+    else:
+        raise Exception("Sorry, file type not supported. Try converting to csv, xlsx, txt or pkl.")
+
 
 def paste0(string: str, values: list) -> list[str]:
     """This imitates the R function 'paste0' (essentially appending values to strings).
@@ -64,11 +115,101 @@ def paste0(string: str, values: list) -> list[str]:
     texts = [string + str(num1) for num1 in values]
     return texts
 
+def count_values(column: pd.Series) -> tuple[pd.Series, int]:
+    """Counts each distinct value of a column in a single pass, using pandas.factorize() on the column in its own dtype rather than converting it to objects first, so the work beyond the factorization scales with the number of distinct values.
+    
+    Missing values are counted as the value 'nan', as CategoricalVariable stores them.
+
+    Args:
+        column (pandas.Series): Column data.
+
+    Returns:
+        tuple[pandas.Series, int]: Count of each value, indexed by the values (as objects) in the order they first appear, and the number of values that are neither missing nor blank.
+    """
+    
+    codes, uniques = pd.factorize(column, use_na_sentinel=False)
+    counts = np.bincount(codes, minlength=len(uniques))
+    values = pd.Index(uniques).astype(object)
+    is_missing = np.asarray(values.isna())
+    is_blank = np.array([isinstance(value, str) and value == '' for value in values], dtype=bool)
+    present = int(counts[~(is_missing | is_blank)].sum())
+    
+    value_counts = pd.Series(counts, index=values.where(~is_missing, 'nan'))
+    if not value_counts.index.is_unique: # the string 'nan' as well as missing values
+        value_counts = value_counts.groupby(level=0, sort=False).sum()
+    return value_counts, present
+
+def alias_table(probabilities: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """Builds a Walker alias table (using Vose's method) for sampling from a discrete distribution in constant time per draw.
+    
+    Each outcome i is given a bucket holding a probability of keeping i and an alias outcome to return otherwise.  The probabilities are renormalised, so they only need to be proportional to the distribution.
+
+    Args:
+        probabilities (numpy.ndarray): Probability (or weight) of each outcome.  Must be non-negative with a positive sum.
+
+    Returns:
+        tuple[numpy.ndarray, numpy.ndarray]: Probability of keeping each bucket's own outcome, and the alias outcome of each bucket.
+    """
+    
+    size = len(probabilities)
+    scaled = np.asarray(probabilities, dtype='float64')*size/np.sum(probabilities)
+    keep = np.ones(size, dtype='float64')
+    alias = np.arange(size, dtype='int64')
+    small = [i for i in range(size) if scaled[i] < 1.0]
+    large = [i for i in range(size) if scaled[i] >= 1.0]
+    while small and large:
+        less, more = small.pop(), large.pop()
+        keep[less] = scaled[less]
+        alias[less] = more
+        scaled[more] = (scaled[more] + scaled[less]) - 1.0
+        (small if scaled[more] < 1.0 else large).append(more)
+    # anything left over is 1 up to rounding error, so keeps its own outcome
+    return keep, alias
+
+def alias_sample(keep: np.ndarray, alias: np.ndarray, size: int, rng: np.random.Generator) -> np.ndarray:
+    """Draws outcomes from an alias table built by alias_table().
+
+    Args:
+        keep (numpy.ndarray): Probability of keeping each bucket's own outcome.
+        alias (numpy.ndarray): Alias outcome of each bucket.
+        size (int): Number of draws.
+        rng (numpy.random.Generator): Source of randomness.
+
+    Returns:
+        numpy.ndarray: Index of the outcome of each draw.
+    """
+    
+    buckets = rng.integers(0, len(keep), size)
+    return np.where(rng.random(size) < keep[buckets], buckets, alias[buckets])
+
+def split_count(count: int, rows: int, sample: int, rng: np.random.Generator) -> int:
+    """Splits a number of marked rows (e.g. missing values) between a sample of the rows and the rest, as drawing the sample without replacement would.  Splitting the rows of a table block by block in this way places exactly count marked rows in the whole table.
+
+    Args:
+        count (int): Number of marked rows.
+        rows (int): Total number of rows.
+        sample (int): Number of rows in the sample.
+        rng (numpy.random.Generator): Source of randomness.  Not used if the sample is empty or is all of the rows.
+
+    Returns:
+        int: Number of marked rows in the sample.
+    """
+    
+    if sample == 0 or sample == rows:
+        return count if sample == rows else 0
+    if count < 10**9 and rows - count < 10**9: # the limit of numpy's hypergeometric sampler
+        return int(rng.hypergeometric(count, rows - count, sample))
+    # for larger tables, a binomial draw limited to the feasible counts is indistinguishable in practice
+    return int(min(max(rng.binomial(sample, count/rows), count - (rows - sample), 0), count, sample))
+
 def index_to_column(dataframe: pd.DataFrame) -> pd.Series:
     index_list = dataframe.index.to_list()
     return pd.Series(index_list)
 
-def unique_id(min_length: int, max_length: int, letters: bool, numbers: bool) -> str:
+def unique_id(min_length: int, max_length: int, letters: bool, numbers: bool, rng: np.random.Generator | None = None) -> str:
+    if rng is None:
+        rng = np.random.default_rng()
+    
     if not (letters or numbers):
         raise ValueError("one or both of 'letters' and 'numbers' must be true")
     elif (letters and numbers):
@@ -81,30 +222,37 @@ def unique_id(min_length: int, max_length: int, letters: bool, numbers: bool) ->
     if min_length == max_length:
         length = min_length
     else:
-        length = random.randrange(min_length, max_length + 1)
+        length = rng.integers(min_length, max_length + 1)
         
-    return ''.join(secrets.choice(alphabet) for _ in range(length))
+    return ''.join(rng.choice(list(alphabet), length))
 
-def individual_ids(min_length: int, max_length: int, column_length: int, letters: bool, numbers: bool) -> pd.Series:
+def individual_ids(min_length: int, max_length: int, column_length: int, letters: bool, numbers: bool, rng: np.random.Generator | None = None) -> pd.Series:
+    if rng is None:
+        rng = np.random.default_rng()
+    
     id_set = set()
     set_size = 0
     while set_size < column_length:
-        id = unique_id(min_length, max_length, letters, numbers)
+        id = unique_id(min_length, max_length, letters, numbers, rng)
         id_set.add(id)
         set_size = len(id_set)
         
-    return pd.Series([element for element in id_set])
+    id_list = sorted(id_set) # sorted so that the order of the ids doesn't depend on set ordering
+    return pd.Series(rng.permutation(np.array(id_list, dtype=object)))
 
-def group_ids(min_length: int, max_length: int, group_size: int, column_length: int, letters: bool, numbers: bool) -> pd.Series:
+def group_ids(min_length: int, max_length: int, group_size: int, column_length: int, letters: bool, numbers: bool, rng: np.random.Generator | None = None) -> pd.Series:
+    if rng is None:
+        rng = np.random.default_rng()
+    
     id_set = set()
     set_size = 0
     while set_size < group_size:
-        id = unique_id(min_length, max_length, letters, numbers)
+        id = unique_id(min_length, max_length, letters, numbers, rng)
         id_set.add(id)
         set_size = len(id_set)
         
-    id_list = list(id_set)
-    return pd.Series([random.choice(id_list) for _ in range(column_length)])    
+    id_list = sorted(id_set) # sorted so that the ids drawn don't depend on set ordering
+    return pd.Series(rng.choice(id_list, column_length))    
 
 def run_Rscript(settings: dict):
     
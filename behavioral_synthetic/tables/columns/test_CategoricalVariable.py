@@ -134,7 +134,8 @@ class TestCategoricalVariable():
         assert len(test_dict) == len(expected_dict)
         
         test_column = column.generate(self.string_series.size)
-        assert test_column.dtypes == self.string_series.dtypes
+        assert isinstance(test_column.dtypes, pd.CategoricalDtype)
+        assert set(test_column.cat.categories) == set(self.string_series.dropna())
         assert any(test_column != self.string_series)
     
     def test_string_categories_with_error(self):
@@ -160,7 +161,8 @@ class TestCategoricalVariable():
         assert len(test_dict) == len(expected_dict)
         
         test_column = column.generate(self.string_series_with_errors.size)
-        assert test_column.dtypes == self.string_series_with_errors.dtypes
+        assert isinstance(test_column.dtypes, pd.CategoricalDtype)
+        assert set(test_column.cat.categories) == set(self.string_series_with_errors.dropna())
         assert any(test_column != self.string_series_with_errors)
     
     def test_string_categories_with_blanks(self):
@@ -188,7 +190,8 @@ class TestCategoricalVariable():
         assert len(test_dict) == len(expected_dict)
         
         test_column = column.generate(self.string_series_with_blanks.size)
-        assert test_column.dtypes == self.string_series_with_blanks.dtypes
+        assert isinstance(test_column.dtypes, pd.CategoricalDtype)
+        assert set(test_column.cat.categories) == set(self.string_series_with_blanks.dropna())
         assert any(test_column != self.string_series_with_blanks)
     
     def test_string_categories_with_blanks_errors(self):
@@ -217,7 +220,8 @@ class TestCategoricalVariable():
         assert len(test_dict) == len(expected_dict)
         
         test_column = column.generate(self.string_series_with_blanks_errors.size)
-        assert test_column.dtypes == self.string_series_with_blanks_errors.dtypes
+        assert isinstance(test_column.dtypes, pd.CategoricalDtype)
+        assert set(test_column.cat.categories) == set(self.string_series_with_blanks_errors.dropna())
         assert any(test_column != self.string_series_with_blanks_errors)
         
     def test_set_string_categories(self):
@@ -263,4 +267,35 @@ class TestCategoricalVariable():
         output_dict = column.dictionary_out()
         
         assert input_dict == output_dict
-            
\ No newline at end of file
+            
+            
+    def test_generate_frequencies(self):
+        column = CategoricalVariable(pd.Series([0], name="test"))
+        column.set(frequencies={"A": 0.5, 3: 0.25, "nan": 0.2, "": 0.05})
+        test_column = column.generate(100000, np.random.default_rng(0))
+        
+        assert list(test_column.cat.categories) == ["A", 3, ""]
+        assert (test_column.cat.codes == -1).mean() == pytest.approx(0.2, abs=0.01)
+        assert test_column.isna().mean() == pytest.approx(0.2, abs=0.01)
+        frequencies = test_column.value_counts(normalize=True, dropna=False)
+        assert frequencies["A"] == pytest.approx(0.5, abs=0.01)
+        assert frequencies[3] == pytest.approx(0.25, abs=0.01)
+        assert frequencies[""] == pytest.approx(0.05, abs=0.01)
+        
+    def test_seeded_generate(self):
+        column = CategoricalVariable(self.string_series_with_errors)
+        column.analyse()
+        
+        first = column.generate(1000, np.random.default_rng(5))
+        second = column.generate(1000, np.random.default_rng(5))
+        pd.testing.assert_series_equal(first, second)
+        
+    @pytest.mark.parametrize("dtype", ["category", "string"])
+    def test_non_object_dtypes(self, dtype):
+        expected = CategoricalVariable(self.string_series_with_blanks_errors)
+        expected.analyse()
+        column = CategoricalVariable(self.string_series_with_blanks_errors.astype(dtype))
+        column.analyse()
+        
+        assert column.dictionary_out() == expected.dictionary_out()
+        assert column.dtypes == dtype
\ No newline at end of file
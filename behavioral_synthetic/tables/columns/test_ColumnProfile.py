@@ -0,0 +1,36 @@
+import pandas as pd
+import numpy as np
+import pytest
+
+from .ColumnProfile import ColumnProfile
+
+class TestColumnProfile():
+    
+    column = pd.Series(["12", "4a", np.NaN, "12", "x", "7"], name="test")
+    
+    def test_counts_and_masks(self):
+        profile = ColumnProfile(self.column)
+        assert profile.length == 6
+        assert profile.non_null_count == 5
+        assert profile.unique_count == 4
+        assert profile.has_digit.tolist() == [True, True, False, True, False, True]
+        assert profile.has_alpha.tolist() == [False, True, True, False, True, False]
+        
+    def test_numeric(self):
+        assert ColumnProfile(self.column).numeric is None
+        profile = ColumnProfile(pd.Series(["1", "2.5", np.NaN]))
+        pd.testing.assert_series_equal(profile.numeric, pd.Series([1, 2.5, np.NaN]))
+        
+    def test_parse_datetime(self):
+        assert ColumnProfile.parse_datetime(self.column) is None
+        assert ColumnProfile.parse_datetime(pd.Series(["2021-01-02", "2021-03-04"])) is not None
+        
+    @pytest.mark.parametrize("values, reusable", [
+        (["2021-01-02 10:11:12", "2021-03-04 01:02:03", "nan"], True),
+        (["10:11:12", "01:02:03"], True),
+        (["25/03/2021", "02/01/2021"], False), # a single inferred day first format, but month first when parsed value by value
+    ])
+    def test_reusable_datetime(self, values, reusable):
+        profile = ColumnProfile(pd.Series(values))
+        assert profile.datetime is not None
+        assert (profile.reusable_datetime is not None) == reusable
\ No newline at end of file
@@ -363,4 +363,23 @@ class TestDatetimeVariable():
                 missing_freq = input_dict["missing_value_freq"],
                 number_of_rows = self.dates_series.size,
                 no_vals_in_threshold = input_dict['# of values in average_max_min']
-            )
\ No newline at end of file
+            )
+        
+    @pytest.mark.parametrize("type, earliest, latest, format", [
+        ('date', '2020-01-01', '2020-03-31', '%Y-%m-%d'),
+        ('time', '08:00:00', '17:30:00', '%X'),
+        ('datetime', '2020-01-01 08:00:00', '2020-01-03 17:30:00', '%Y-%m-%d %X')
+        ])
+    def test_generate_range_and_missingness(self, type, earliest, latest, format):
+        column = DatetimeVariable(pd.Series([0], name='test'), average_min_max=False)
+        column.set(type=type, earliest=earliest, latest=latest, missing_freq=0.3, number_of_rows=100, no_vals_in_threshold=THRESHOLD)
+        test_column = column.generate(20000, np.random.default_rng(11))
+        present = test_column.dropna()
+        parsed = pd.to_datetime(present, format=format)
+        
+        assert test_column.dtypes == object
+        assert test_column.name == 'test'
+        assert test_column.isnull().mean() == pytest.approx(0.3, abs=0.015)
+        assert parsed.min() >= pd.to_datetime(earliest, format=format)
+        assert parsed.max() <= pd.to_datetime(latest, format=format)
+        assert parsed.nunique() > 50
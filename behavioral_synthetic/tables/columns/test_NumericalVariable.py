@@ -246,4 +246,50 @@ class TestNumericalVariable:
                 no_vals_in_threshold = input_dict['# of values in average_max_min'],
                 missing_freq = input_dict["missing_value_freq"],
                 number_of_rows = self.float_series_with_errors.size
-            )
\ No newline at end of file
+            )
+        
+    def test_generate_distribution(self):
+        column = NumericalVariable(pd.Series([0], name='test'), decimal_precision=2, average_min_max=True)
+        column.set(mean=50.0, standard_deviation=10.0, maximum=80.0, minimum=20.0, is_integer=False, no_vals_in_threshold=THRESHOLD, missing_freq=0.25, number_of_rows=100)
+        test_column = column.generate(200000)
+        
+        assert str(test_column.dtypes) == 'float64'
+        assert test_column.isnull().mean() == pytest.approx(0.25, abs=0.01)
+        assert test_column.mean() == pytest.approx(50.0, abs=0.1)
+        assert test_column.min() >= 20.0 and test_column.max() <= 80.0
+        assert all(test_column.dropna() == test_column.dropna().round(2))
+        
+    def test_generate_integer_missing(self):
+        column = NumericalVariable(pd.Series([0], name='test'), decimal_precision=0, average_min_max=True)
+        column.set(mean=5.0, standard_deviation=2.0, maximum=9.0, minimum=1.0, is_integer=True, no_vals_in_threshold=THRESHOLD, missing_freq=0.5, number_of_rows=100)
+        test_column = column.generate(100000)
+        
+        assert str(test_column.dtypes) == 'Int64'
+        assert test_column.isna().mean() == pytest.approx(0.5, abs=0.01)
+        assert test_column.dropna().between(1, 9).all()
+
+        
+    def test_statistics_match_pandas(self):
+        series = pd.Series(np.random.default_rng(5).normal(20, 7, 5000).round(3), name='test')
+        series[::17] = np.NaN
+        column = NumericalVariable(series.copy(), self.decimal_precision)
+        column.analyse()
+        test_dict = column.dictionary_out()
+        
+        present = series.dropna()
+        assert test_dict["mean"] == round(present.mean(), 7)
+        assert test_dict["standard_deviation"] == round(present.std(), 7)
+        assert test_dict["maximum"] == round(present.nlargest(THRESHOLD, keep='first').mean(), 7)
+        assert test_dict["minimum"] == round(present.nsmallest(THRESHOLD, keep='first').mean(), 7)
+        assert test_dict["is_integer"] == False
+        
+    def test_mixed_signs(self):
+        series = pd.Series([-30, -12, -5, -1, 2, 4, 8, 15, 21, 33, 40, 3, -7], name='test')
+        column = NumericalVariable(series, self.decimal_precision, False)
+        column.analyse()
+        
+        assert not column.all_values_negative
+        assert not column.all_values_positive
+        test_column = column.generate(5000, np.random.default_rng(1))
+        assert (test_column < 0).any() and (test_column > 0).any()
+        assert (test_column.between(-30, 40) & (test_column != 40)).mean() > 0.9
@@ -0,0 +1,88 @@
+import pandas as pd
+import numpy as np
+import pytest
+
+from .PartialStatistics import NumericalPartial, CategoricalPartial, StringPartial, DatetimePartial, EmptyPartial
+from .NumericalVariable import NumericalVariable
+from .CategoricalVariable import CategoricalVariable
+from .StringVariable import StringVariable
+from .DatetimeVariable import DatetimeVariable
+
+THRESHOLD = 10  # This needs to match the value given in the VariableType base abstract class
+
+def _split_and_merge(partial_class, column, *args):
+    """Builds the partial statistics of a column from three blocks, merged in order."""
+    
+    blocks = [column.iloc[:5], column.iloc[5:12], column.iloc[12:]]
+    merged = partial_class(*args)
+    for block in blocks:
+        merged.merge(partial_class(*args).update(block))
+    return merged
+
+class TestPartialStatistics:
+    
+    numeric_series = pd.Series([4.5, np.NaN, 45.1, 11, 10, 1, -3.25, np.NaN, 7, 8, 9, 100, 12, 13, 14, 15, 16, 17, 18, 19], name='test')
+    categorical_series = pd.Series(['a', 'b', 'a', np.NaN, 'c', 'b', 'a', 'a', 'c', 'b', 'a', 'd', 'a', 'b', 'a', 'c', 'a', 'b', 'a', 'a'], name='test')
+    string_series = pd.Series(['AB12', 'AC34', 'AB56', '', 'AD78', 'AB90', 'AC11', 'AB22', 'AD33', 'AB44', 'AC55', 'AB66', 'AB77', 'AD88', 'AB99', 'AC00'], name='test')
+    datetime_series = pd.Series(pd.date_range('2001-01-01 10:30', periods=20, freq='37h').astype(str), name='test')
+    
+    def test_numerical_merge(self):
+        merged = _split_and_merge(NumericalPartial, self.numeric_series, THRESHOLD)
+        values = self.numeric_series.dropna().to_numpy()
+        
+        assert merged.length == 20
+        assert merged.missing == 2
+        assert merged.count == 18
+        assert merged.mean == pytest.approx(values.mean())
+        assert merged.m2 / (merged.count - 1) == pytest.approx(values.var(ddof=1))
+        assert list(merged.smallest) == list(np.sort(values)[:THRESHOLD])
+        assert list(merged.largest) == list(np.sort(values)[::-1][:THRESHOLD])
+        assert merged.negative_count == 1
+        assert not merged.is_integer
+        
+    def test_numerical_matches_analyse(self):
+        column = NumericalVariable(self.numeric_series, 3, True)
+        column.analyse()
+        partial_column = NumericalVariable(self.numeric_series, 3, True)
+        partial_column.analyse_partial(_split_and_merge(NumericalPartial, self.numeric_series, THRESHOLD))
+        
+        assert partial_column.dictionary_out() == pytest.approx(column.dictionary_out())
+        
+    def test_categorical_matches_analyse(self):
+        column = CategoricalVariable(self.categorical_series)
+        column.analyse()
+        partial_column = CategoricalVariable(self.categorical_series)
+        partial_column.analyse_partial(_split_and_merge(CategoricalPartial, self.categorical_series))
+        
+        assert partial_column.dictionary_out() == column.dictionary_out()
+        
+    def test_string_position_counts(self):
+        merged = _split_and_merge(StringPartial, self.string_series)
+        
+        assert merged.missing == 1
+        assert merged.count == 15
+        assert merged.min_length == merged.max_length == 4
+        assert merged.position_counts[0] == {'A': 15}
+        assert merged.position_counts[1] == {'B': 8, 'C': 4, 'D': 3}
+        
+    def test_string_matches_analyse(self):
+        column = StringVariable(self.string_series)
+        column.analyse()
+        partial_column = StringVariable(self.string_series)
+        partial_column.analyse_partial(_split_and_merge(StringPartial, self.string_series))
+        
+        assert partial_column.dictionary_out() == column.dictionary_out()
+        
+    def test_datetime_matches_analyse(self):
+        column = DatetimeVariable(self.datetime_series, average_min_max=True)
+        column.analyse()
+        partial_column = DatetimeVariable(self.datetime_series, average_min_max=True)
+        partial_column.analyse_partial(_split_and_merge(DatetimePartial, self.datetime_series, THRESHOLD))
+        
+        assert partial_column.dictionary_out() == column.dictionary_out()
+        
+    def test_empty_merge(self):
+        merged = _split_and_merge(EmptyPartial, pd.Series([np.NaN] * 20, name='test'))
+        
+        assert merged.length == merged.missing == 20
+        assert merged.present == 0
\ No newline at end of file
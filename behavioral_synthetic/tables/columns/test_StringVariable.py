@@ -187,4 +187,36 @@ class TestStringVariable():
         
         output_dict = temp_column.dictionary_out()
         
-        assert input_dict == output_dict
\ No newline at end of file
+        assert input_dict == output_dict
+        
+    def test_generate_patterned_distribution(self):
+        temp_column = StringVariable(pd.Series([0], name = 'test'))
+        temp_column.set_pattern(
+            pattern = True,
+            character_frequencies = {'character_number_0': {'a': 0.5, 'b': 0.5, 'c': 0.0}, 'character_number_1': {'a': 0.0, 'b': 0.0, 'c': 1.0}, 'character_number_2': {'a': 0.3333333, 'b': 0.3333333, 'c': 0.3333333}},
+            max_length = 3,
+            missing_freq = 0.2,
+            number_of_rows = 100
+        )
+        test_column = temp_column.generate(50000, np.random.default_rng(3))
+        present = test_column.dropna()
+        
+        assert test_column.dtypes == object
+        assert test_column.isnull().mean() == pytest.approx(0.2, abs=0.01)
+        assert present.str.len().eq(3).all()
+        assert set(present.str[0]) == {'a', 'b'}
+        assert set(present.str[1]) == {'c'}
+        assert (present.str[0] == 'a').mean() == pytest.approx(0.5, abs=0.02)
+        assert (present.str[2] == 'c').mean() == pytest.approx(1.0/3.0, abs=0.02)
+        
+    def test_generate_unpatterned_distribution(self):
+        temp_column = StringVariable(pd.Series([0], name = 'test'))
+        temp_column.set_no_pattern(pattern = False, min_length = 3, max_length = 30, missing_freq = 0.1, number_of_rows = 100)
+        test_column = temp_column.generate(50000, np.random.default_rng(8))
+        present = test_column.dropna()
+        
+        assert test_column.dtypes == object
+        assert test_column.isnull().mean() == pytest.approx(0.1, abs=0.01)
+        assert present.str.len().between(2, 29).all()
+        assert set(present.str.len()) == set(range(2, 30))
+        assert all(("sample text"*3).startswith(value) for value in present.unique())
@@ -4,6 +4,7 @@ import pytest
 import re
 
 from .VariableType import VariableType
+from .general_functions import split_count
 
 THRESHOLD = 10  # This needs to match the value given in the VariableType base abstract class
 
@@ -21,6 +22,12 @@ class inheriting_class(VariableType):
     def analyse(self):
         return super().analyse()
     
+    def new_partial(self):
+        return super().new_partial()
+    
+    def analyse_partial(self, partial):
+        return super().analyse_partial(partial)
+    
     def generate(self, new_column_length: int) -> pd.Series:
         return super().generate(new_column_length)
     
@@ -62,6 +69,13 @@ class TestVariableType():
         with pytest.raises(NotImplementedError):
             test_column.generate(self.series.size)
     
+    def test_partial(self):
+        test_column = inheriting_class(self.series)
+        with pytest.raises(NotImplementedError):
+            test_column.new_partial()
+        with pytest.raises(NotImplementedError):
+            test_column.analyse_partial(None)
+    
     def test_generate(self):
         test_column = inheriting_class(self.series)
         with pytest.raises(NotImplementedError):
@@ -70,4 +84,35 @@ class TestVariableType():
     def test_dictionary_out(self):
         test_column = inheriting_class(self.series)
         with pytest.raises(NotImplementedError):
-            test_column.dictionary_out()
\ No newline at end of file
+            test_column.dictionary_out()
+            
+    @pytest.mark.parametrize("new_column_length", [16, 1000, 3])
+    def test_missing_rows(self, new_column_length):
+        test_column = inheriting_class(self.series_missing)
+        test_column.length, test_column.missing, test_column.non_missing = test_column.analyse_missingness()
+        is_missing = test_column.missing_rows(new_column_length, np.random.default_rng(0))
+        
+        assert is_missing.shape == (new_column_length,)
+        assert is_missing.sum() == round(new_column_length*3/16)
+        
+    def test_missing_rows_mostly_missing(self):
+        test_column = inheriting_class(self.series_missing)
+        test_column.length, test_column.missing, test_column.non_missing = 16, 13, 3
+        is_missing = test_column.missing_rows(1600, np.random.default_rng(0))
+        
+        assert is_missing.sum() == 1300
+        
+    def test_missing_rows_given_count(self):
+        test_column = inheriting_class(self.series_missing)
+        test_column.length, test_column.missing, test_column.non_missing = test_column.analyse_missingness()
+        assert test_column.missing_count(1000) == 188
+        assert test_column.missing_rows(1000, np.random.default_rng(0), n_missing=7).sum() == 7
+        assert test_column.missing_rows(1000, np.random.default_rng(0), n_missing=990).sum() == 990
+        
+    def test_split_count(self):
+        rng = np.random.default_rng(0)
+        assert split_count(5, 100, 100, rng) == 5 and split_count(5, 100, 0, rng) == 0
+        counts = [split_count(12, 1000, 100, rng) for _ in range(2000)]
+        assert min(counts) >= 0 and max(counts) <= 12
+        assert np.mean(counts) == pytest.approx(1.2, abs=0.1)
+        assert split_count(10**9 - 10, 2*10**9, 2*10**9 - 5, rng) >= 10**9 - 15 # binomial draw limited to the feasible counts
\ No newline at end of file
@@ -0,0 +1,148 @@
+"""This module contains writers that append blocks of synthetic data to a file on disk, so that a table never has to be held in memory in full.
+
+Delimited text (tsv, csv) is written with pandas.  The columnar formats (parquet, feather) require pyarrow, which is only imported when one of them is used.
+"""
+
+import json
+import os
+
+import pandas as pd
+
+WRITER_FORMATS = ['tsv', 'csv', 'parquet', 'feather']
+METADATA_KEY = b'synthetic_metadata' # key under which the metadata header is stored in columnar files
+
+def format_from_path(path: str) -> str:
+    """Infers the output format from a file suffix.  Suffixes handled are: tsv, txt (treated as tsv), csv, parquet, pq, feather, arrow.
+
+    Args:
+        path (str): File path.
+
+    Raises:
+        ValueError: Unsupported file type.
+
+    Returns:
+        str: One of the values in WRITER_FORMATS.
+    """
+
+    suffix = os.path.splitext(path)[1].lower().lstrip('.')
+    match suffix:
+        case 'tsv' | 'txt':
+            return 'tsv'
+        case 'csv':
+            return 'csv'
+        case 'parquet' | 'pq':
+            return 'parquet'
+        case 'feather' | 'arrow':
+            return 'feather'
+        case _:
+            raise ValueError(f"Cannot infer an output format from the suffix of {path}. Use one of {WRITER_FORMATS}.")
+
+def metadata_to_str(metadata: dict | str) -> str:
+    """Converts metadata to the single line of text stored in the file header.  Dictionaries are converted to json.
+
+    Args:
+        metadata (dict | str): Metadata to be stored.
+
+    Returns:
+        str: Metadata as a single line of text.
+    """
+
+    text = json.dumps(metadata) if isinstance(metadata, dict) else str(metadata)
+    return text.replace('\n', ' ')
+
+class DelimitedWriter:
+    """Appends blocks of synthetic data to a delimited text file.  The column header is written with the first block only, unless header is False (e.g. for all but the first shard of a table, so that the shard files concatenate into one table).
+
+    If metadata is given, it is written first as a single line starting with '# ', matching the header that the generation notebook used to prepend by rewriting the file.  Files written with metadata can be read back using pandas.read_csv(..., comment='#').
+    """
+
+    def __init__(self, path: str, sep: str = '\t', metadata: dict | str | None = None, header: bool = True):
+        self.sep = sep
+        self.header_written = not header
+        self.file = open(path, 'w', newline='')
+        if metadata is not None:
+            self.file.write(f"# {metadata_to_str(metadata)}\n")
+
+    def write(self, block: pd.DataFrame):
+        block.to_csv(self.file, sep=self.sep, index=False, header=not self.header_written)
+        self.header_written = True
+
+    def close(self):
+        self.file.close()
+
+class ArrowWriter:
+    """Appends blocks of synthetic data to a parquet or feather (Arrow IPC) file using pyarrow.
+
+    The schema is fixed by the first block.  Object columns are stored as strings so that the schema cannot change between blocks when, for example, one block happens to contain only missing values.  Metadata, if given, is stored in the schema metadata under METADATA_KEY.
+    """
+
+    def __init__(self, path: str, format: str, metadata: dict | str | None = None):
+        try:
+            import pyarrow
+        except ImportError as error:
+            raise ImportError(f"Writing {format} files requires pyarrow, which is not installed.") from error
+
+        self.pyarrow = pyarrow
+        self.path = path
+        self.format = format
+        self.metadata = None if metadata is None else metadata_to_str(metadata)
+        self.schema = None
+        self.writer = None
+
+    def __to_arrow(self, block: pd.DataFrame):
+        block = block.copy(deep=False)
+        for column in block.columns[block.dtypes == object]:
+            block[column] = block[column].astype('string')
+
+        if self.schema is None:
+            table = self.pyarrow.Table.from_pandas(block, preserve_index=False)
+            metadata = dict(table.schema.metadata or {})
+            if self.metadata is not None:
+                metadata[METADATA_KEY] = self.metadata.encode()
+            self.schema = table.schema.with_metadata(metadata)
+
+        return self.pyarrow.Table.from_pandas(block, schema=self.schema, preserve_index=False)
+
+    def write(self, block: pd.DataFrame):
+        table = self.__to_arrow(block)
+        if self.writer is None:
+            if self.format == 'parquet':
+                import pyarrow.parquet
+                self.writer = pyarrow.parquet.ParquetWriter(self.path, self.schema)
+            else:
+                import pyarrow.ipc
+                self.writer = pyarrow.ipc.new_file(self.path, self.schema)
+        self.writer.write_table(table)
+
+    def close(self):
+        if self.writer is not None:
+            self.writer.close()
+
+def open_writer(path: str, format: str | None = None, metadata: dict | str | None = None, header: bool = True) -> DelimitedWriter | ArrowWriter:
+    """Opens a writer that appends blocks of synthetic data to a file.
+
+    Args:
+        path (str): File path.
+        format (str, optional): One of 'tsv', 'csv', 'parquet' or 'feather'.  If None, it is inferred from the file suffix. Defaults to None.
+        metadata (dict | str, optional): Metadata written to the file header. Defaults to None.
+        header (bool, optional): If False, delimited files are written without the column header.  Columnar files always store their schema. Defaults to True.
+
+    Raises:
+        ValueError: Unsupported output format.
+
+    Returns:
+        DelimitedWriter | ArrowWriter: A writer with write(block) and close() methods.
+    """
+
+    if format is None:
+        format = format_from_path(path)
+
+    match format:
+        case 'tsv':
+            return DelimitedWriter(path, sep='\t', metadata=metadata, header=header)
+        case 'csv':
+            return DelimitedWriter(path, sep=',', metadata=metadata, header=header)
+        case 'parquet' | 'feather':
+            return ArrowWriter(path, format, metadata=metadata)
+        case _:
+            raise ValueError(f"Output format {format} is not supported. Use one of {WRITER_FORMATS}.")
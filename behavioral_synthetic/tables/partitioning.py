@@ -0,0 +1,108 @@
+"""This module splits a data file holding several datasets (e.g. one per project) by the value of a key column, in a single pass over the file.
+
+The file is read in blocks of rows by general_functions.read_data_chunks(), and each block is grouped by the key once, so splitting out any number of datasets costs one scan of the file rather than one per dataset, and no dataset is ever held in memory in full.  Each dataset can either be written to its own file or analysed straight into its own Table.
+"""
+
+from typing import Hashable, Iterable, Iterator
+
+import pandas as pd
+
+from .Table import Table
+from .file_writers import open_writer
+from .columns.general_functions import read_data_chunks
+
+def partition_blocks(chunks: Iterable[pd.DataFrame], key: str, keys: Iterable[Hashable], chunksize: int | None = None) -> Iterator[tuple[Hashable, pd.DataFrame]]:
+    """Groups each block of rows by the key column and yields the rows of every wanted key value.
+
+    If chunksize is given, the rows of each key value are held back until there are chunksize of them and then yielded as one block (the last block of each key value may be shorter), so that a key value with only a few rows in each block read still gives blocks large enough to identify its column types from.  Otherwise each group is yielded as it is found.
+
+    Args:
+        chunks (Iterable[pandas.DataFrame]): Blocks of rows, all with the key column.
+        key (str): Name of the key column.
+        keys (Iterable[Hashable]): Key values to keep.  Rows with any other value (or a missing one) are dropped.
+        chunksize (int, optional): Number of rows in each block yielded. Defaults to None.
+
+    Yields:
+        tuple[Hashable, pandas.DataFrame]: Key value and a block of its rows, in file order.
+    """
+
+    keys = set(keys)
+    pending = {}
+    for chunk in chunks:
+        chunk = chunk[chunk[key].isin(keys).to_numpy()]
+        for value, group in chunk.groupby(key, sort=False):
+            if chunksize is None:
+                yield value, group
+                continue
+            blocks = pending.setdefault(value, [])
+            blocks.append(group)
+            rows = sum(len(block.index) for block in blocks)
+            if rows >= chunksize:
+                combined = pd.concat(blocks, ignore_index=True)
+                for start in range(0, rows - chunksize + 1, chunksize):
+                    yield value, combined.iloc[start:start + chunksize]
+                pending[value] = [combined.iloc[rows - rows % chunksize:]]
+    for value, blocks in pending.items():
+        remainder = pd.concat(blocks, ignore_index=True)
+        if len(remainder.index) > 0:
+            yield value, remainder
+
+def split_file(path: str, key: str, output_paths: dict[Hashable, str], chunksize: int = 100000, usecols: list[str] | None = None, **read_options) -> dict[Hashable, int]:
+    """Writes the rows of each key value to its own file, in a single pass over the source file.
+
+    The output format of each file is inferred from its suffix, as in file_writers.open_writer().  Key values with no rows get no file.
+
+    Args:
+        path (str): Source file path.  File suffixes handled are as in general_functions.read_data().
+        key (str): Name of the key column, e.g. 'Project'.
+        output_paths (dict[Hashable, str]): Output file path of each key value to keep.
+        chunksize (int, optional): Number of rows read at a time. Defaults to 100000.
+        usecols (list[str], optional): Columns to read and write.  If given, it must include the key column. Defaults to None.
+        **read_options: Further keyword arguments passed to the read function, e.g. encoding, dtype or na_values.
+
+    Returns:
+        dict[Hashable, int]: Number of rows written for each key value in output_paths.
+    """
+
+    rows_written = {value: 0 for value in output_paths}
+    writers = {}
+    try:
+        for value, block in partition_blocks(read_data_chunks(path, chunksize, usecols=usecols, **read_options), key, output_paths):
+            if value not in writers:
+                writers[value] = open_writer(output_paths[value])
+            writers[value].write(block)
+            rows_written[value] += len(block.index)
+    finally:
+        for writer in writers.values():
+            writer.close()
+    return rows_written
+
+def analyse_file_partitions(path: str, key: str, table_names: dict[Hashable, str], decimal_accuracy: int | None = None, columns_lists: dict[Hashable, list[dict]] | None = None, chunksize: int = 100000, usecols: list[str] | None = None, **read_options) -> dict[Hashable, Table]:
+    """Analyses the rows of each key value as its own Table, in a single pass over the source file.
+
+    Each key value's rows are regrouped into blocks of chunksize rows and added to its table with Table.analyse_chunk(), so its column types are identified from its first chunksize rows.  At most chunksize rows of each key value are held in memory at once.  The key column is analysed along with the others, as it would be in a file written by split_file().
+
+    Args:
+        path (str): Source file path.  File suffixes handled are as in general_functions.read_data().
+        key (str): Name of the key column, e.g. 'Project'.
+        table_names (dict[Hashable, str]): Table name of each key value to keep.
+        decimal_accuracy (int, optional): Number of decimal places to use in numerical data columns, if the column types are identified by the heuristics. Defaults to None.
+        columns_lists (dict[Hashable, list[dict]], optional): Column descriptions of each key value, as in Table.analyse_with_column_list().  Key values without one use the heuristics. Defaults to None.
+        chunksize (int, optional): Number of rows read and analysed at a time. Defaults to 100000.
+        usecols (list[str], optional): Columns to read and analyse.  If given, it must include the key column. Defaults to None.
+        **read_options: Further keyword arguments passed to the read function, e.g. encoding, dtype or na_values.
+
+    Returns:
+        dict[Hashable, Table]: Analysed table of each key value in table_names that has at least one row.
+    """
+
+    if columns_lists is None:
+        columns_lists = {}
+    tables = {}
+    for value, block in partition_blocks(read_data_chunks(path, chunksize, usecols=usecols, **read_options), key, table_names, chunksize=chunksize):
+        if value not in tables:
+            tables[value] = Table(table=pd.DataFrame(), table_name=table_names[value])
+        tables[value].analyse_chunk(block, decimal_accuracy=decimal_accuracy, columns_list=columns_lists.get(value))
+    for table in tables.values():
+        table.finalise_chunked_analysis()
+    return tables
@@ -110,4 +110,43 @@ class TestBasicTable():
     def dictionary_out(self):
         table = dummy_class(self.test_table, table_name='test_table', table_type='test_table_type')
         with pytest.raises(NotImplementedError):
-            table.dictionary_out()
\ No newline at end of file
+            table.dictionary_out()
+            
+    def test_strip_table_whitespace(self):
+        table = pd.DataFrame({
+            "A": [" a ", np.NaN, 3],
+            "B": pd.array([" b", None, "c "], dtype='string'),
+            "C": pd.Categorical([" x", "y ", " x"]),
+            "D": [1.5, np.NaN, 2.0],
+        })
+        stripped = dummy_class(table, table_name='test_table', table_type='test_table_type').table
+        assert stripped["A"].tolist() == ["a", "nan", "3"]
+        assert stripped["B"].tolist() == ["b", "<NA>", "c"]
+        assert stripped["C"].tolist() == ["x", "y", "x"]
+        assert stripped["C"].dtype == 'category'
+        assert stripped["D"].dtype == 'float64'
+        assert np.isnan(stripped["D"][1])
+            
+    def test_sampled_identification(self):
+        numbers = pd.Series(np.arange(1000).astype(str), name="numbers")
+        report = []
+        column_type = BasicTable.identify_column_type(numbers, 2, sample_size=50, report=report)
+        assert column_type.COLUMN_TYPE == "numeric"
+        assert report == []
+        
+    def test_sampled_identification_disagreement(self):
+        dates = pd.date_range("2000-01-01", periods=1000, freq="D").strftime("%Y-%m-%d").to_series(index=range(1000), name="dates")
+        dates[::100] = [f"ref {i}" for i in range(10)] # 1% of values with numbers that are not dates
+        report = []
+        column_type = BasicTable.identify_column_type(dates, 2, sample_size=200, confidence=0.9, report=report)
+        assert column_type.COLUMN_TYPE == "string"
+        assert report == [{"Name": "dates", "sample_type": "datetime", "full_type": "string"}]
+        
+    @pytest.mark.parametrize("sample_size, confidence, message", [
+        (0, 1.0, "Sample size must be a positive integer, not 0."),
+        (10, 0, "Confidence must be greater than 0 and at most 1, not 0."),
+        (10, 1.5, "Confidence must be greater than 0 and at most 1, not 1.5."),
+    ])
+    def test_sampled_identification_errors(self, sample_size, confidence, message):
+        with pytest.raises(ValueError, match=re.escape(message)):
+            BasicTable.identify_column_type(self.test_table["D"], 2, sample_size=sample_size, confidence=confidence)
\ No newline at end of file
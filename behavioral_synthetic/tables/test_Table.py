@@ -3,7 +3,9 @@ import numpy as np
 import re
 import pytest
 
+from . import Table as Table_module
 from .Table import Table
+from .TableCache import TableCache
 
 class TestTable():
     test_table = pd.DataFrame.from_dict({
@@ -268,7 +270,8 @@ class TestTable():
         
         pass
     
-    def test_with_col_input(self):
+    @pytest.mark.parametrize("n_jobs", [None, 2])
+    def test_with_col_input(self, n_jobs):
         columns = [ 
             {
                 "Type": "empty"
@@ -307,12 +310,134 @@ class TestTable():
                 }
             ]
         table = Table(table=self.test_table, table_name="testTable")
-        table.analyse_with_column_list(columns_list=columns)
+        table.analyse_with_column_list(columns_list=columns, n_jobs=n_jobs)
         
         new_dict = table.dictionary_out()
         
         assert new_dict == self.test_dict
     
+    @pytest.mark.parametrize("backend", ['process', 'thread'])
+    def test_from_table_parallel(self, backend):
+        table = Table(table=self.test_table.copy(), table_name="testTable")
+        table.analyse(decimal_accuracy=3, n_jobs=2, backend=backend)
+        
+        assert table.dictionary_out() == self.test_dict
+        
+    def test_parallel_backend_error(self):
+        table = Table(table=self.test_table.copy(), table_name="testTable")
+        with pytest.raises(ValueError, match=re.escape("Parallel backend fork is not supported.")):
+            table.analyse(decimal_accuracy=3, n_jobs=2, backend='fork')
+    
+    def test_update_columns(self):
+        changed_table = self.test_table.copy()
+        changed_table["D"] = changed_table["D"]*2
+        changed_table["E"] = changed_table["E"].str.upper()
+        expected = Table(table=changed_table.copy(), table_name="testTable")
+        expected.analyse(decimal_accuracy=3)
+        
+        table = Table(table=self.test_table.copy(), table_name="testTable")
+        table.analyse(decimal_accuracy=3)
+        unchanged_column_type = table.column_types[0]
+        table.update_columns(changed_table[["E", "D"]])
+        
+        assert table.dictionary_out() == expected.dictionary_out()
+        assert table.column_types[0] is unchanged_column_type
+        assert table.table["D"].tolist() == changed_table["D"].tolist()
+        
+    def test_update_columns_errors(self):
+        table = Table(table=self.test_table.copy(), table_name="testTable")
+        with pytest.raises(ValueError, match=re.escape("Table testTable has not been analysed, so its columns cannot be updated.")):
+            table.update_columns(self.test_table[["D"]])
+        with pytest.raises(ValueError, match=re.escape("Table testTable has not been analysed, so its columns cannot be updated.")):
+            table.update_columns(self.test_table[["D"]], columns_list=[{"Name": "D", "Type": "numeric", "decimal_accuracy": 3}])
+        
+        table.analyse(decimal_accuracy=3)
+        with pytest.raises(ValueError, match=re.escape("Columns ['Z'] are not in table testTable.")):
+            table.update_columns(pd.DataFrame({"Z": self.test_table["D"]}))
+        with pytest.raises(ValueError, match=re.escape("Table testTable has 15 rows, but the updated columns have 5.")):
+            table.update_columns(self.test_table[["D"]].head())
+    
+    def test_from_table_cached(self, tmp_path):
+        cache = TableCache(str(tmp_path))
+        table = Table(table=self.test_table.copy(), table_name="testTable")
+        table.analyse(decimal_accuracy=3, cache=cache)
+        assert (cache.hits, cache.misses) == (0, 9)
+        
+        table = Table(table=self.test_table.copy(), table_name="testTable")
+        table.analyse(decimal_accuracy=3, cache=cache)
+        assert (cache.hits, cache.misses) == (9, 9)
+        assert table.dictionary_out() == self.test_dict
+        
+        changed_table = self.test_table.copy()
+        changed_table["D"] = changed_table["D"] + 1
+        table = Table(table=changed_table, table_name="testTable")
+        table.analyse(decimal_accuracy=3, cache=cache)
+        assert (cache.hits, cache.misses) == (17, 10)
+        assert table.dictionary_out()["Column_details"][3]["mean"] != self.test_dict["Column_details"][3]["mean"]
+        
+        table = Table(table=self.test_table.copy(), table_name="testTable")
+        table.analyse(decimal_accuracy=2, cache=cache) # different options are different entries
+        assert cache.misses == 19
+    
+    def test_from_table_sampled(self):
+        table = Table(table=self.test_table.copy(), table_name="testTable")
+        table.analyse(decimal_accuracy=3, sample_size=5)
+        
+        assert table.dictionary_out() == self.test_dict
+        assert table.type_inference_report == []
+    
+    @pytest.mark.parametrize("n_jobs", [None, 2])
+    def test_from_table_chunks(self, n_jobs):
+        chunks = [self.test_table.iloc[:8], self.test_table.iloc[8:12], self.test_table.iloc[12:]]
+        table = Table(table=pd.DataFrame(), table_name="testTable")
+        table.analyse_chunks(chunks, decimal_accuracy=3, n_jobs=n_jobs, backend='thread')
+        
+        assert table.TABLE_ROWS == self.test_table.shape[0]
+        assert table.dictionary_out() == self.test_dict
+    
+    def test_from_table_chunk_by_chunk(self):
+        table = Table(table=pd.DataFrame(), table_name="testTable")
+        table.analyse_chunk(self.test_table.iloc[:10], decimal_accuracy=3) # the types are identified from the first block
+        for start in range(10, self.test_table.shape[0], 2):
+            table.analyse_chunk(self.test_table.iloc[start:start + 2])
+        table.finalise_chunked_analysis()
+        
+        assert table.dictionary_out() == self.test_dict
+    
+    @pytest.mark.parametrize("suffix, separator", [('csv', ','), ('tsv', '\t')])
+    def test_from_path(self, tmp_path, suffix, separator):
+        path = tmp_path / f"testTable.{suffix}"
+        self.test_table.to_csv(path, sep=separator, index=False)
+        expected = Table(table=pd.read_csv(path, sep=separator), table_name="testTable")
+        expected.analyse(decimal_accuracy=3)
+        
+        table = Table.from_path(str(path), decimal_accuracy=3, chunksize=10, n_jobs=2, backend='thread')
+        
+        assert table.dictionary_out() == expected.dictionary_out()
+        
+    def test_from_path_filtered(self, tmp_path):
+        path = tmp_path / "combined.csv"
+        combined = pd.concat([self.test_table.assign(Project=1), self.test_table.assign(Project=2)]).sort_index(kind='stable')
+        combined.to_csv(path, index=False)
+        expected = Table(table=pd.read_csv(path).query("Project == 2").reset_index(drop=True)[["B", "D", "Project"]], table_name="testTable")
+        expected.analyse(decimal_accuracy=3)
+        
+        table = Table.from_path(str(path), table_name="testTable", decimal_accuracy=3, chunksize=10, usecols=["B", "D", "Project"], filter=lambda chunk: chunk["Project"] == 2) # each block of 10 rows read holds 5 matching rows, which are regrouped
+        
+        assert table.TABLE_ROWS == self.test_table.shape[0]
+        assert table.dictionary_out() == expected.dictionary_out()
+    
+    def test_chunks_errors(self):
+        table = Table(table=pd.DataFrame(), table_name="testTable")
+        with pytest.raises(ValueError, match="no blocks"):
+            table.analyse_chunks([], decimal_accuracy=3)
+        with pytest.raises(ValueError, match="decimal accuracy or a list of column descriptions"):
+            table.analyse_chunk(self.test_table)
+        with pytest.raises(ValueError, match="no chunked analysis to finalise"):
+            table.finalise_chunked_analysis()
+        with pytest.raises(ValueError, match="but the first block had"):
+            table.analyse_chunks([self.test_table, self.test_table[["A", "B"]]], decimal_accuracy=3)
+    
     def test_from_dict(self):
         table = Table(table=pd.DataFrame(), table_name="")
         table.read_in_table(table_definition=self.test_dict)
@@ -320,6 +445,93 @@ class TestTable():
         new_dict = table.dictionary_out()
         assert new_dict == self.test_dict
         
+    def test_seeded_generate(self):
+        table = Table(table=pd.DataFrame(), table_name="")
+        table.read_in_table(table_definition=self.test_dict)
+        
+        first = table.generate(200, seed=1234)
+        second = table.generate(200, seed=1234)
+        different = table.generate(200, seed=4321)
+        
+        assert list(first.columns) == [column['Name'] for column in self.test_dict['Column_details']]
+        pd.testing.assert_frame_equal(first, second)
+        assert not first.drop(columns='A').equals(different.drop(columns='A'))
+        
+    @pytest.mark.parametrize("backend", ['process', 'thread'])
+    def test_parallel_generate(self, backend):
+        table = Table(table=pd.DataFrame(), table_name="")
+        table.read_in_table(table_definition=self.test_dict)
+        
+        serial = table.generate(200, seed=1234)
+        parallel = table.generate(200, seed=1234, n_jobs=3, backend=backend)
+        pd.testing.assert_frame_equal(serial, parallel)
+        
+        serial_chunks = pd.concat(table.generate_chunks(200, chunk_size=70, seed=5))
+        parallel_chunks = pd.concat(table.generate_chunks(200, chunk_size=70, seed=5, n_jobs=3, backend=backend))
+        pd.testing.assert_frame_equal(serial_chunks, parallel_chunks)
+        
+    def test_generate_chunks_reuse_pool(self, monkeypatch):
+        pools = []
+        class CountingExecutor(Table_module.ThreadPoolExecutor):
+            def __init__(self, *args, **kwargs):
+                pools.append(self)
+                super().__init__(*args, **kwargs)
+        monkeypatch.setattr(Table_module, "ThreadPoolExecutor", CountingExecutor)
+        table = Table(table=pd.DataFrame(), table_name="")
+        table.read_in_table(table_definition=self.test_dict)
+        
+        chunks = list(table.generate_chunks(250, chunk_size=100, seed=99, n_jobs=2, backend='thread'))
+        
+        assert len(chunks) == 3 and len(pools) == 1
+        pd.testing.assert_frame_equal(pd.concat(chunks), pd.concat(table.generate_chunks(250, chunk_size=100, seed=99)))
+        
+    def test_generate_chunks(self):
+        table = Table(table=pd.DataFrame(), table_name="")
+        table.read_in_table(table_definition=self.test_dict)
+        
+        chunks = list(table.generate_chunks(250, chunk_size=100, seed=99))
+        
+        assert [len(chunk) for chunk in chunks] == [100, 100, 50]
+        combined = pd.concat(chunks)
+        assert list(combined.index) == list(range(250))
+        assert list(combined.columns) == [column['Name'] for column in self.test_dict['Column_details']]
+        pd.testing.assert_frame_equal(combined, pd.concat(table.generate_chunks(250, chunk_size=100, seed=99)))
+    
+    @pytest.mark.parametrize("chunk_size", [2000, 30000, 200000])
+    def test_generate_chunks_missing_total(self, chunk_size):
+        table_definition = {'Table_name': 'sparse', 'Table_type': 'normal_table', 'Number_of_rows': 200000, 'Column_details': [
+            dict(self.test_dict['Column_details'][3], missing_value_freq=0.00006), # 12 missing values, less than 0.5 in each block of 2000 rows
+            {'N': 0.6, 'Y': 0.3998, 'nan': 0.0002, 'Type': 'categorical', 'Name': 'B'}
+            ]}
+        table = Table(table=pd.DataFrame(), table_name="")
+        table.read_in_table(table_definition=table_definition)
+        
+        missing = sum(chunk.isna().sum() for chunk in table.generate_chunks(200000, chunk_size=chunk_size, seed=4))
+        
+        assert missing.to_dict() == {'D': 12, 'B': 40}
+        assert table.generate(200000, seed=4).isna().sum().to_dict() == {'D': 12, 'B': 40}
+        
+    def test_generate_chunks_size_error(self):
+        table = Table(table=pd.DataFrame(), table_name="")
+        table.read_in_table(table_definition=self.test_dict)
+        with pytest.raises(ValueError, match=re.escape("Chunk size must be a positive integer, not 0.")):
+            next(table.generate_chunks(10, chunk_size=0))
+        
+    def test_generate_to_file(self, tmp_path):
+        table = Table(table=pd.DataFrame(), table_name="")
+        table.read_in_table(table_definition=self.test_dict)
+        path = str(tmp_path / "synthetic.tsv")
+        expected_path = str(tmp_path / "expected.tsv")
+        
+        table.generate_to_file(path, 250, chunk_size=100, seed=7, metadata={"Date generated": "today"})
+        pd.concat(table.generate_chunks(250, chunk_size=100, seed=7)).to_csv(expected_path, sep='\t', index=False)
+        
+        with open(path, 'r') as file:
+            assert file.readline() == '# {"Date generated": "today"}\n'
+        written = pd.read_csv(path, sep='\t', comment='#')
+        expected = pd.read_csv(expected_path, sep='\t')
+        pd.testing.assert_frame_equal(written, expected)
+        
     def test_table_dict_type_error(self):
         table = Table(table=pd.DataFrame(), table_name="")
         message = f"Type of column A is ey: this is not an allowed value."
@@ -669,4 +881,81 @@ class TestTable():
         new_dict = table.dictionary_out()
         
         assert new_dict["Column_details"][0]['Pattern'] != 'True'
-        assert new_dict["Column_details"][0]['Pattern'] 
\ No newline at end of file
+        assert new_dict["Column_details"][0]['Pattern'] 
+        
+    def test_generate_range(self, monkeypatch):
+        monkeypatch.setattr(Table_module, "RANGE_BLOCK_SIZE", 40)
+        table = Table(table=pd.DataFrame(), table_name="")
+        table.read_in_table(table_definition=self.test_dict)
+        
+        full = table.generate_range(0, 250, 250, seed=11)
+        
+        assert list(full.index) == list(range(250))
+        assert list(full.columns) == [column['Name'] for column in self.test_dict['Column_details']]
+        for start, stop in [(0, 40), (35, 125), (120, 250), (100, 100)]:
+            pd.testing.assert_frame_equal(table.generate_range(start, stop, 250, seed=11), full.iloc[start:stop])
+        pd.testing.assert_frame_equal(table.generate_range(35, 125, 250, seed=11, n_jobs=3, backend='thread'), full.iloc[35:125])
+        assert not table.generate_range(0, 250, 250, seed=12).drop(columns='A').equals(full.drop(columns='A'))
+        
+    def test_generate_range_missing_total(self, monkeypatch):
+        monkeypatch.setattr(Table_module, "RANGE_BLOCK_SIZE", 1000)
+        table_definition = {'Table_name': 'sparse', 'Table_type': 'normal_table', 'Number_of_rows': 200000, 'Column_details': [
+            dict(self.test_dict['Column_details'][3], missing_value_freq=0.00006), # 12 missing values, less than 0.5 in each block
+            {'N': 0.6, 'Y': 0.3998, 'nan': 0.0002, 'Type': 'categorical', 'Name': 'B'}
+            ]}
+        table = Table(table=pd.DataFrame(), table_name="")
+        table.read_in_table(table_definition=table_definition)
+        
+        full = table.generate_range(0, 200000, 200000, seed=4)
+        ranges = [table.generate_range(start, stop, 200000, seed=4) for start, stop in [(0, 12345), (12345, 150500), (150500, 200000)]]
+        
+        assert full.isna().sum().to_dict() == {'D': 12, 'B': 40}
+        pd.testing.assert_frame_equal(pd.concat(ranges), full)
+        
+    def test_generate_range_errors(self):
+        table = Table(table=pd.DataFrame(), table_name="")
+        table.read_in_table(table_definition=self.test_dict)
+        with pytest.raises(ValueError, match=re.escape("A seed is required to generate a range of rows.")):
+            table.generate_range(0, 10, 10, seed=None)
+        with pytest.raises(ValueError, match=re.escape("Rows 10 to 5 are not a valid range of row numbers in a table of 10 rows.")):
+            table.generate_range(10, 5, 10, seed=1)
+        with pytest.raises(ValueError, match=re.escape("Rows -1 to 5 are not a valid range of row numbers in a table of 10 rows.")):
+            table.generate_range(-1, 5, 10, seed=1)
+        with pytest.raises(ValueError, match=re.escape("Rows 5 to 11 are not a valid range of row numbers in a table of 10 rows.")):
+            table.generate_range(5, 11, 10, seed=1)
+        
+    def test_generate_shard(self, monkeypatch):
+        monkeypatch.setattr(Table_module, "RANGE_BLOCK_SIZE", 40)
+        table = Table(table=pd.DataFrame(), table_name="")
+        table.read_in_table(table_definition=self.test_dict)
+        
+        shards = [table.generate_shard(i, 3, 250, seed=8) for i in range(3)]
+        
+        assert [len(shard) for shard in shards] == [83, 83, 84]
+        pd.testing.assert_frame_equal(pd.concat(shards), table.generate_range(0, 250, 250, seed=8))
+        
+    def test_generate_shard_to_file(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(Table_module, "RANGE_BLOCK_SIZE", 40)
+        table = Table(table=pd.DataFrame(), table_name="")
+        table.read_in_table(table_definition=self.test_dict)
+        paths = [str(tmp_path / f"shard{i}.tsv") for i in range(3)]
+        expected_path = str(tmp_path / "expected.tsv")
+        
+        written = [table.generate_shard_to_file(path, i, 3, 250, seed=8, chunk_size=50) for i, path in enumerate(paths)]
+        expected = table.generate_range(0, 250, 250, seed=8)
+        expected.to_csv(expected_path, sep='\t', index=False)
+        
+        contents = []
+        for path in paths:
+            with open(path, 'r') as file:
+                contents.append(file.read())
+        with open(expected_path, 'r') as file:
+            assert "".join(contents) == file.read()
+        assert [(entry["start"], entry["stop"], entry["rows"]) for entry in written] == [(0, 83, 83), (83, 166, 83), (166, 250, 84)]
+        assert {name: sum(entry["missing"][name] for entry in written) for name in expected.columns} == expected.isna().sum().to_dict()
+        
+    def test_shard_range_errors(self):
+        with pytest.raises(ValueError, match=re.escape("Number of shards must be a positive integer, not 0.")):
+            Table_module.shard_range(0, 0, 100)
+        with pytest.raises(ValueError, match=re.escape("Shard 3 is not one of the 3 shards.")):
+            Table_module.shard_range(3, 3, 100)
\ No newline at end of file
@@ -0,0 +1,85 @@
+import os
+import re
+import time
+
+import pandas as pd
+import numpy as np
+import pytest
+
+from .TableCache import TableCache
+from . import test_TableCache as test_module
+
+class MovedEntry():
+    pass
+
+class TestTableCache():
+    
+    column = pd.Series(["a", "b", "nan", "c"], name="test")
+    
+    def test_fingerprint(self):
+        key = TableCache.fingerprint(self.column, 3)
+        assert key == TableCache.fingerprint(self.column.copy(), 3)
+        assert key == TableCache.fingerprint(self.column.set_axis([5, 6, 7, 8]), 3) # the index is not part of the data
+        assert key != TableCache.fingerprint(self.column, 4)
+        assert key != TableCache.fingerprint(self.column.rename("other"), 3)
+        assert key != TableCache.fingerprint(pd.Series(["a", "b", "nan", "d"], name="test"), 3)
+        assert key != TableCache.fingerprint(self.column.astype('category'), 3)
+        
+    def test_get_and_put(self, tmp_path):
+        cache = TableCache(str(tmp_path / "cache"))
+        assert cache.get("key") is None
+        cache.put("key", {"value": [1, 2]})
+        assert cache.get("key") == {"value": [1, 2]}
+        assert (cache.hits, cache.misses) == (1, 1)
+        
+    def test_unreadable_entry(self, tmp_path):
+        cache = TableCache(str(tmp_path))
+        with open(tmp_path / "key.pkl", 'wb') as file:
+            file.write(b"not a pickle")
+        assert cache.get("key") is None
+        assert not os.path.exists(tmp_path / "key.pkl")
+        
+    @pytest.mark.parametrize("renamed", [b"gone_TableCache", None])
+    def test_stale_entry(self, tmp_path, monkeypatch, renamed):
+        cache = TableCache(str(tmp_path))
+        cache.put("key", MovedEntry())
+        if renamed is None:
+            monkeypatch.delattr(test_module, "MovedEntry") # the class has moved: AttributeError on loading
+        else:
+            with open(tmp_path / "key.pkl", 'rb') as file:
+                entry = file.read()
+            with open(tmp_path / "key.pkl", 'wb') as file:
+                file.write(entry.replace(b"test_TableCache", renamed)) # the module has moved: ModuleNotFoundError on loading
+        assert cache.get("key") is None
+        assert not os.path.exists(tmp_path / "key.pkl")
+        
+    def test_truncated_entry(self, tmp_path):
+        cache = TableCache(str(tmp_path))
+        cache.put("key", {"value": list(range(100))})
+        with open(tmp_path / "key.pkl", 'rb') as file:
+            entry = file.read()
+        with open(tmp_path / "key.pkl", 'wb') as file:
+            file.write(entry[:len(entry) // 2])
+        assert cache.get("key") is None
+        assert cache.misses == 1
+        
+    def test_least_recently_used_eviction(self, tmp_path):
+        cache = TableCache(str(tmp_path), max_entries=2)
+        cache.put("first", 1)
+        cache.put("second", 2)
+        past = time.time() - 100
+        os.utime(tmp_path / "first.pkl", (past, past))
+        os.utime(tmp_path / "second.pkl", (past - 100, past - 100))
+        cache.get("second") # now the most recently used
+        cache.put("third", 3)
+        assert sorted(os.listdir(tmp_path)) == ["second.pkl", "third.pkl"]
+        
+    def test_clear(self, tmp_path):
+        cache = TableCache(str(tmp_path))
+        cache.put("key", 1)
+        cache.clear()
+        assert cache.get("key") is None
+        
+    def test_max_entries_error(self, tmp_path):
+        with pytest.raises(ValueError, match=re.escape("Maximum number of cache entries must be a positive integer, not 0.")):
+            TableCache(str(tmp_path), max_entries=0)
\ No newline at end of file
@@ -0,0 +1,87 @@
+import json
+import re
+
+import pandas as pd
+import numpy as np
+import pytest
+
+from .file_writers import open_writer, format_from_path, METADATA_KEY
+
+class TestFileWriters():
+
+    blocks = [
+        pd.DataFrame({"A": [1.5, np.NaN], "B": ["x", "y"], "C": pd.array([1, None], dtype='Int64')}, index=pd.RangeIndex(0, 2)),
+        pd.DataFrame({"A": [2.5, 3.0], "B": [np.NaN, np.NaN], "C": pd.array([3, 4], dtype='Int64')}, index=pd.RangeIndex(2, 4)),
+    ]
+    metadata = {"Date generated": "2024-05-14T10:00:00"}
+
+    def test_format_from_path(self):
+        assert format_from_path("out.tsv") == 'tsv'
+        assert format_from_path("out.CSV") == 'csv'
+        assert format_from_path("out.parquet") == 'parquet'
+        assert format_from_path("out.feather") == 'feather'
+
+    def test_format_from_path_error(self):
+        with pytest.raises(ValueError, match=re.escape("Cannot infer an output format from the suffix of out.json.")):
+            format_from_path("out.json")
+
+    def test_unsupported_format(self, tmp_path):
+        with pytest.raises(ValueError, match=re.escape("Output format json is not supported.")):
+            open_writer(str(tmp_path / "out.tsv"), format='json')
+
+    def test_tsv_with_metadata(self, tmp_path):
+        path = str(tmp_path / "out.tsv")
+        writer = open_writer(path, metadata=self.metadata)
+        for block in self.blocks:
+            writer.write(block)
+        writer.close()
+
+        with open(path, 'r') as file:
+            assert file.readline() == "# " + json.dumps(self.metadata) + "\n"
+
+        written = pd.read_csv(path, sep='\t', comment='#')
+        assert list(written.columns) == ["A", "B", "C"]
+        assert len(written.index) == 4
+        assert written["C"].tolist()[2:] == [3, 4]
+
+    def test_csv(self, tmp_path):
+        path = str(tmp_path / "out.csv")
+        writer = open_writer(path)
+        for block in self.blocks:
+            writer.write(block)
+        writer.close()
+
+        written = pd.read_csv(path)
+        pd.testing.assert_series_equal(written["A"], pd.concat(self.blocks, ignore_index=True)["A"])
+
+    @pytest.mark.parametrize("format", ['parquet', 'feather'])
+    def test_columnar(self, tmp_path, format):
+        pytest.importorskip("pyarrow")
+        path = str(tmp_path / f"out.{format}")
+        writer = open_writer(path, metadata=self.metadata)
+        for block in self.blocks:
+            writer.write(block)
+        writer.close()
+
+        written = pd.read_parquet(path) if format == 'parquet' else pd.read_feather(path)
+        expected = pd.concat(self.blocks, ignore_index=True)
+        assert len(written.index) == 4
+        assert written["B"].isna().tolist() == [False, False, True, True]
+        pd.testing.assert_series_equal(written["C"], expected["C"])
+
+        if format == 'parquet':
+            import pyarrow.parquet
+            schema = pyarrow.parquet.read_schema(path)
+            assert json.loads(schema.metadata[METADATA_KEY]) == self.metadata
+
+
+    def test_tsv_without_header(self, tmp_path):
+        path = str(tmp_path / "out.tsv")
+        writer = open_writer(path, header=False)
+        for block in self.blocks:
+            writer.write(block)
+        writer.close()
+
+        written = pd.read_csv(path, sep='\t', header=None)
+        assert written.shape == (4, 3)
+        assert written[0].tolist()[2:] == [2.5, 3.0]
\ No newline at end of file
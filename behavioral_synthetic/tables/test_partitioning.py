@@ -0,0 +1,47 @@
+import pandas as pd
+import numpy as np
+import pytest
+
+from .partitioning import partition_blocks, split_file, analyse_file_partitions
+from .Table import Table
+from . import test_Table
+
+class TestPartitioning():
+    
+    combined = pd.concat([test_Table.TestTable.test_table.assign(Project=project) for project in [1, 2, 3]]).sort_index(kind='stable').reset_index(drop=True)
+    
+    def test_partition_blocks(self):
+        chunks = [self.combined.iloc[start:start + 7] for start in range(0, self.combined.shape[0], 7)]
+        blocks = list(partition_blocks(chunks, "Project", [1, 3], chunksize=4))
+        
+        assert {value for value, _ in blocks} == {1, 3}
+        assert all(len(block.index) == 4 for _, block in blocks[:-2])
+        for project in [1, 3]:
+            rows = pd.concat([block for value, block in blocks if value == project], ignore_index=True)
+            pd.testing.assert_frame_equal(rows, self.combined[self.combined["Project"] == project].reset_index(drop=True))
+    
+    def test_split_file(self, tmp_path):
+        path = tmp_path / "combined.tsv"
+        self.combined.to_csv(path, sep='\t', index=False)
+        output_paths = {project: str(tmp_path / f"project_{project}.tsv") for project in [1, 2, 4]}
+        
+        rows_written = split_file(str(path), "Project", output_paths, chunksize=10)
+        
+        assert rows_written == {1: 15, 2: 15, 4: 0}
+        source = pd.read_csv(path, sep='\t')
+        for project in [1, 2]:
+            written = pd.read_csv(output_paths[project], sep='\t')
+            pd.testing.assert_frame_equal(written, source[source["Project"] == project].reset_index(drop=True))
+    
+    def test_analyse_file_partitions(self, tmp_path):
+        path = tmp_path / "combined.tsv"
+        self.combined.to_csv(path, sep='\t', index=False)
+        source = pd.read_csv(path, sep='\t')
+        
+        tables = analyse_file_partitions(str(path), "Project", {1: "first", 3: "third", 4: "fourth"}, decimal_accuracy=3, chunksize=10)
+        
+        assert sorted(tables) == [1, 3]
+        for project, name in [(1, "first"), (3, "third")]:
+            expected = Table(table=source[source["Project"] == project].reset_index(drop=True), table_name=name)
+            expected.analyse(decimal_accuracy=3)
+            assert tables[project].dictionary_out() == expected.dictionary_out()
\ No newline at end of file
@@ -0,0 +1,59 @@
+import json
+import os
+
+import pandas as pd
+import pytest
+
+from .batch_runner import run_batches, read_manifest, plan_jobs, main, MANIFEST_NAME
+from .tables import test_Table
+
+class TestBatchRunner():
+    
+    def write_batch(self, directory, names):
+        source_directory = directory / "json"
+        source_directory.mkdir(parents=True)
+        for name in names:
+            with open(source_directory / f"{name}.json", 'w') as file:
+                json.dump(test_Table.TestTable.test_dict, file)
+        return str(source_directory), str(directory / "tsv")
+    
+    @pytest.mark.parametrize("n_jobs", [None, 2])
+    def test_run_batches(self, tmp_path, n_jobs):
+        batches = [self.write_batch(tmp_path / batch, ["first", "second"]) for batch in ["BATCH1", "BATCH2"]]
+        
+        results = run_batches(batches, n_jobs=n_jobs, seed=1)
+        
+        assert len(results["generated"]) == 4 and results["failed"] == []
+        for _, target_directory in batches:
+            manifest = read_manifest(target_directory)
+            assert sorted(manifest) == ["first.tsv", "second.tsv"]
+            assert manifest["first.tsv"]["rows"] == test_Table.TestTable.test_dict["Number_of_rows"]
+            assert manifest["first.tsv"]["sha256"] == manifest["second.tsv"]["sha256"] # same definition and seed
+            written = pd.read_csv(os.path.join(target_directory, "first.tsv"), sep='\t')
+            assert written.shape[0] == test_Table.TestTable.test_dict["Number_of_rows"]
+    
+    def test_resume(self, tmp_path):
+        batch = self.write_batch(tmp_path, ["first", "second"])
+        run_batches([batch], seed=1)
+        
+        assert plan_jobs(*batch) == []
+        with open(os.path.join(batch[1], "second.tsv"), 'a') as file:
+            file.write("corrupted\n")
+        assert plan_jobs(*batch) == [(os.path.join(batch[0], "second.json"), os.path.join(batch[1], "second.tsv"))]
+        assert len(plan_jobs(*batch, overwrite=True)) == 2
+        
+        results = run_batches([batch], seed=1)
+        assert results["generated"] == [os.path.join(batch[1], "second.tsv")]
+        assert plan_jobs(*batch) == []
+    
+    def test_failed_table(self, tmp_path):
+        batch = self.write_batch(tmp_path, ["first"])
+        with open(os.path.join(batch[0], "broken.json"), 'w') as file:
+            file.write("{")
+        
+        exit_status = main(["--batch", *batch, "--seed", "1"])
+        
+        assert exit_status == 1
+        assert sorted(read_manifest(batch[1])) == ["first.tsv"]
+        assert any(name.startswith("SD_generation_log_") for name in os.listdir(batch[1]))
+        assert MANIFEST_NAME in os.listdir(batch[1])
\ No newline at end of file
@@ -0,0 +1,154 @@
+import json
+import os
+
+import pandas as pd
+import pytest
+
+from .shard_runner import plan_shards, run_shards, merge_shards, read_plan, shard_manifest_path, main, PLAN_SUFFIX
+from .batch_runner import read_manifest, plan_jobs
+from .tables.Table import Table
+from .tables import test_Table
+
+class TestShardRunner():
+    
+    def write_source(self, directory, table_definition=test_Table.TestTable.test_dict):
+        source_directory = directory / "json"
+        source_directory.mkdir(parents=True)
+        source_path = source_directory / "large.json"
+        with open(source_path, 'w') as file:
+            json.dump(table_definition, file)
+        return str(source_directory), str(source_path), str(directory / "tsv")
+    
+    @pytest.mark.parametrize("n_jobs", [None, 2])
+    def test_run_and_merge(self, tmp_path, n_jobs):
+        source_directory, source_path, target_directory = self.write_source(tmp_path)
+        plan_path = plan_shards(source_path, target_directory, n_shards=3, seed=5)
+        
+        results = run_shards(plan_path, n_jobs=n_jobs)
+        merged = merge_shards(plan_path)
+        
+        assert sorted(results["generated"]) == [0, 1, 2] and results["failed"] == []
+        total_rows = test_Table.TestTable.test_dict["Number_of_rows"]
+        table = Table(table=pd.DataFrame(), table_name="")
+        table.read_in_table(test_Table.TestTable.test_dict)
+        expected_path = str(tmp_path / "expected.tsv")
+        table.generate_range(0, total_rows, total_rows, seed=5).to_csv(expected_path, sep='\t', index=False)
+        with open(os.path.join(target_directory, "large.tsv"), 'r') as written, open(expected_path, 'r') as expected:
+            assert written.read() == expected.read()
+        
+        assert merged["rows"] == total_rows
+        assert merged["missing"] == {name: int(count) for name, count in pd.read_csv(expected_path, sep='\t').isna().sum().items()}
+        assert merged["missing"] == {column.COLUMN_NAME: column.missing_count(total_rows) for column in table.column_types}
+        assert read_manifest(target_directory)["large.tsv"] == merged
+        assert plan_jobs(source_directory, target_directory) == []
+    
+    def test_partial_run(self, tmp_path):
+        _, source_path, target_directory = self.write_source(tmp_path)
+        plan_path = plan_shards(source_path, target_directory, n_shards=3, seed=5)
+        
+        assert run_shards(plan_path, shards=[0, 2])["generated"] == [0, 2]
+        with pytest.raises(ValueError, match="shard 1 has not been generated"):
+            merge_shards(plan_path)
+        
+        assert run_shards(plan_path)["generated"] == [1]
+        assert run_shards(plan_path)["generated"] == []
+        assert merge_shards(plan_path)["rows"] == test_Table.TestTable.test_dict["Number_of_rows"]
+    
+    def test_corrupted_shard(self, tmp_path):
+        _, source_path, target_directory = self.write_source(tmp_path)
+        plan_path = plan_shards(source_path, target_directory, n_shards=2, seed=5)
+        run_shards(plan_path)
+        plan = read_plan(plan_path)
+        with open(os.path.join(target_directory, plan["shards"][1]["file"]), 'a') as file:
+            file.write("corrupted\n")
+        
+        with pytest.raises(ValueError, match="shard 1 does not match its checksum"):
+            merge_shards(plan_path)
+        assert run_shards(plan_path)["generated"] == [1]
+        merge_shards(plan_path)
+    
+    def test_blank_category(self, tmp_path):
+        table_definition = {'Table_name': 'large', 'Table_type': 'normal_table', 'Number_of_rows': 1000, 'Column_details': [
+            {'Name': 'A', 'Type': 'categorical', 'a': 0.4, 'b': 0.4, '': 0.2},
+            {'Name': 'B', 'Type': 'categorical', 'N': 0.5, 'nan': 0.5}
+            ]}
+        _, source_path, target_directory = self.write_source(tmp_path, table_definition)
+        plan_path = plan_shards(source_path, target_directory, n_shards=2, seed=5)
+        
+        assert run_shards(plan_path)["failed"] == []
+        merged = merge_shards(plan_path)
+        
+        assert merged["missing"] == {'A': 0, 'B': 500}
+        assert pd.read_csv(os.path.join(target_directory, "large.tsv"), sep='\t', dtype=str, keep_default_na=False)['A'].eq('').sum() > 0
+    
+    def test_unsorted_categories(self, tmp_path):
+        table_definition = {'Table_name': 'large', 'Table_type': 'normal_table', 'Number_of_rows': 1000, 'Column_details': [
+            {'Name': 'A', 'Type': 'categorical', 'z': 0.1, 'a': 0.5, 'm': 0.4},
+            {'Type': 'categorical', 'Name': 'B', '3': 0.3, '1': 0.3, '2': 0.2, 'nan': 0.2}
+            ]}
+        _, source_path, target_directory = self.write_source(tmp_path, table_definition)
+        plan_path = plan_shards(source_path, target_directory, n_shards=2, seed=5)
+        run_shards(plan_path)
+        merge_shards(plan_path)
+        
+        with open(source_path, 'r') as file:
+            source = json.load(file)
+        table = Table(table=pd.DataFrame(), table_name="")
+        table.read_in_table(source)
+        expected_path = str(tmp_path / "expected.tsv")
+        table.generate_range(0, 1000, 1000, seed=5).to_csv(expected_path, sep='\t', index=False)
+        with open(os.path.join(target_directory, "large.tsv"), 'r') as written, open(expected_path, 'r') as expected:
+            assert written.read() == expected.read()
+    
+    @pytest.mark.parametrize("recount", [True, False])
+    def test_wrong_missing_counts(self, tmp_path, recount):
+        _, source_path, target_directory = self.write_source(tmp_path)
+        plan_path = plan_shards(source_path, target_directory, n_shards=2, seed=5)
+        run_shards(plan_path)
+        plan = read_plan(plan_path)
+        manifest_path = shard_manifest_path(plan_path, plan, 1)
+        with open(manifest_path, 'r') as file:
+            entry = json.load(file)
+        column = next(column for column, count in entry["missing"].items() if count > 0)
+        entry["missing"][column] -= 1
+        with open(manifest_path, 'w') as file:
+            json.dump(entry, file)
+        
+        with pytest.raises(ValueError, match=f"column {column} has"):
+            merge_shards(plan_path, recount=recount)
+    
+    def test_wrong_empty_counts(self, tmp_path):
+        _, source_path, target_directory = self.write_source(tmp_path)
+        plan_path = plan_shards(source_path, target_directory, n_shards=2, seed=5)
+        run_shards(plan_path)
+        plan = read_plan(plan_path)
+        manifest_path = shard_manifest_path(plan_path, plan, 0)
+        with open(manifest_path, 'r') as file:
+            entry = json.load(file)
+        entry["empty"][next(iter(entry["empty"]))] += 1
+        with open(manifest_path, 'w') as file:
+            json.dump(entry, file)
+        
+        merge_shards(plan_path, recount=False)
+        with pytest.raises(ValueError, match="shard 0 does not have the row or empty field counts"):
+            merge_shards(plan_path)
+    
+    def test_plan(self, tmp_path):
+        _, source_path, target_directory = self.write_source(tmp_path)
+        
+        plan = read_plan(plan_shards(source_path, target_directory, n_shards=4))
+        
+        assert isinstance(plan["seed"], int)
+        assert plan["shards"][0]["start"] == 0 and plan["shards"][-1]["stop"] == plan["total_rows"]
+        assert all(previous["stop"] == shard["start"] for previous, shard in zip(plan["shards"][:-1], plan["shards"][1:]))
+    
+    def test_main(self, tmp_path):
+        _, source_path, target_directory = self.write_source(tmp_path)
+        plan_path = os.path.join(target_directory, f"large{PLAN_SUFFIX}")
+        
+        assert main(["plan", source_path, target_directory, "--n-shards", "2", "--seed", "3"]) == 0
+        assert main(["merge", plan_path]) == 1
+        assert main(["run", plan_path]) == 0
+        assert main(["merge", plan_path, "--skip-recount"]) == 0
+        assert main(["merge", plan_path]) == 0
+        assert "large.tsv" in os.listdir(target_directory)
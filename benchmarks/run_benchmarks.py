@@ -0,0 +1,245 @@
+"""Benchmarks the main stages of the library on synthetic fixtures: building a Table, Table.analyse(), Table.dictionary_out(), Table.read_in_table() and Table.generate().
+
+Each fixture is a table whose columns are all of one variable type, at a given number of rows and columns.  Every fixture is benchmarked in a fresh worker process, so the peak resident memory recorded after each stage belongs to that fixture alone (it includes the memory of the stages before it, as the peak can only grow).  Results are written as json, and can be compared against an earlier results file to catch slow downs before a release.
+
+Run from the repository root, e.g.:
+    python -m benchmarks.run_benchmarks --preset standard --output benchmarks/results/standard.json
+    python -m benchmarks.run_benchmarks --preset standard --compare benchmarks/results/standard.json
+"""
+
+import argparse
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+from behavioral_synthetic.batch_runner import peak_memory_mb
+from behavioral_synthetic.tables.Table import Table
+
+VARIABLE_TYPES = ['numeric', 'categorical', 'datetime', 'text', 'empty']
+STAGES = ['construct', 'analyse', 'dictionary_out', 'read_in_table', 'generate']
+PRESETS = { # (rows, columns) of the fixtures benchmarked for each variable type
+    'quick': [(10_000, 10)],
+    'standard': [(10_000, 10), (10_000, 100), (10_000, 1000), (1_000_000, 10)],
+    'full': [(10_000, 10), (10_000, 100), (10_000, 1000), (1_000_000, 10), (1_000_000, 100), (10_000_000, 10)],
+}
+DECIMAL_ACCURACY = 3
+DISTINCT_COLUMNS = 4 # number of different columns built for each fixture; the remaining columns repeat them
+MINIMUM_COMPARED_SECONDS = 0.05 # stages faster than this in the baseline are too noisy to compare
+
+def fixture_column(variable_type: str, rows: int, rng: np.random.Generator) -> pd.Series:
+    """Builds a column of real-looking data that the heuristics in BasicTable identify as the given variable type.
+
+    Args:
+        variable_type (str): One of VARIABLE_TYPES.
+        rows (int): Number of rows.
+        rng (numpy.random.Generator): Random number generator.
+
+    Returns:
+        pandas.Series: The column data, with about 5% missing values (except for text columns, which are identifiers).
+    """
+
+    missing = rng.random(rows) < 0.05
+    match variable_type:
+        case 'numeric':
+            values = np.round(rng.normal(50, 15, rows), DECIMAL_ACCURACY)
+            values[missing] = np.NaN
+            return pd.Series(values)
+        case 'categorical':
+            values = rng.choice(np.array(['alpha', 'beta', 'gamma', 'delta', 'epsilon'], dtype=object), size=rows, p=[0.4, 0.25, 0.2, 0.1, 0.05])
+            values[missing] = np.NaN
+            return pd.Series(values)
+        case 'datetime':
+            seconds = rng.integers(946684800, 1704067200, rows) # 2000 to 2024
+            values = pd.to_datetime(seconds, unit='s').strftime('%Y-%m-%d %H:%M:%S').to_numpy(dtype=object)
+            values[missing] = np.NaN
+            return pd.Series(values)
+        case 'text':
+            return pd.Series(np.char.add('ID', rng.integers(10**7, 10**8, rows).astype(str)).astype(object))
+        case 'empty':
+            return pd.Series(np.full(rows, np.NaN))
+        case _:
+            raise ValueError(f"Variable type {variable_type} is not one of {VARIABLE_TYPES}.")
+
+def fixture_table(variable_type: str, rows: int, columns: int, seed: int = 0) -> pd.DataFrame:
+    """Builds a fixture table whose columns are all of one variable type.
+
+    Args:
+        variable_type (str): One of VARIABLE_TYPES.
+        rows (int): Number of rows.
+        columns (int): Number of columns.
+        seed (int, optional): Seed of the fixture data. Defaults to 0.
+
+    Returns:
+        pandas.DataFrame: The fixture table.
+    """
+
+    rng = np.random.default_rng(seed)
+    distinct = [fixture_column(variable_type, rows, rng) for _ in range(min(columns, DISTINCT_COLUMNS))]
+    return pd.DataFrame({f"{variable_type}_{i}": distinct[i % len(distinct)] for i in range(columns)})
+
+def run_case(case: tuple[str, int, int]) -> dict:
+    """Worker function: benchmarks every stage on one fixture.
+
+    Args:
+        case (tuple[str, int, int]): Variable type, number of rows and number of columns of the fixture.
+
+    Returns:
+        dict: Time taken by each stage in seconds, peak resident memory in MiB after building the fixture and after each stage, and the variable types the columns were identified as.
+    """
+
+    variable_type, rows, columns = case
+    data = fixture_table(variable_type, rows, columns)
+    seconds = {}
+    memory = {"fixture": peak_memory_mb()}
+
+    def timed(stage, function):
+        start = time.perf_counter()
+        result = function()
+        seconds[stage] = round(time.perf_counter() - start, 4)
+        memory[stage] = peak_memory_mb()
+        return result
+
+    table = timed('construct', lambda: Table(table=data, table_name=f"{variable_type}_{rows}x{columns}"))
+    del data
+    timed('analyse', lambda: table.analyse(decimal_accuracy=DECIMAL_ACCURACY))
+    definition = timed('dictionary_out', table.dictionary_out)
+    identified = sorted({column["Type"] for column in definition["Column_details"]})
+    del table
+    generator = Table(table=pd.DataFrame(), table_name="")
+    timed('read_in_table', lambda: generator.read_in_table(definition))
+    timed('generate', lambda: generator.generate(rows, seed=0))
+
+    return {
+        "variable_type": variable_type,
+        "rows": rows,
+        "columns": columns,
+        "identified_as": identified,
+        "seconds": seconds,
+        "peak_memory_mb": memory
+    }
+
+def environment() -> dict:
+    """Describes the environment the benchmarks ran in, so that results from different machines or library versions aren't compared by mistake."""
+
+    try:
+        commit = subprocess.run(['git', 'rev-parse', 'HEAD'], capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {
+        "date": datetime.now().strftime("%Y-%m-%dT%H:%M:%S"),
+        "commit": commit,
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "pandas": pd.__version__,
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count()
+    }
+
+def run_benchmarks(cases: list[tuple[str, int, int]], repeat: int = 1) -> list[dict]:
+    """Benchmarks each case repeat times, each time in a fresh worker process, keeping the fastest time and the largest peak memory of each stage.
+
+    Args:
+        cases (list[tuple[str, int, int]]): Variable type, number of rows and number of columns of each fixture.
+        repeat (int, optional): Number of runs of each case. Defaults to 1.
+
+    Returns:
+        list[dict]: Results of each case, as returned by run_case().
+    """
+
+    results = []
+    with ProcessPoolExecutor(max_workers=1, max_tasks_per_child=1) as executor:
+        for case in cases:
+            runs = [executor.submit(run_case, case).result() for _ in range(repeat)]
+            result = runs[0]
+            result["seconds"] = {stage: min(run["seconds"][stage] for run in runs) for stage in result["seconds"]}
+            result["peak_memory_mb"] = {stage: max(run["peak_memory_mb"][stage] or 0 for run in runs) for stage in result["peak_memory_mb"]}
+            print(f"{case[0]:>12} {case[1]:>10} rows {case[2]:>5} columns: " + ", ".join(f"{stage} {seconds:.3f}s" for stage, seconds in result["seconds"].items()) + f", peak {result['peak_memory_mb']['generate']:.0f} MiB", flush=True)
+            results.append(result)
+    return results
+
+def compare(results: list[dict], baseline: list[dict], tolerance: float) -> list[str]:
+    """Lists the stages that are slower than in the baseline by more than the tolerance.
+
+    Args:
+        results (list[dict]): Results of the current run.
+        baseline (list[dict]): Results of an earlier run.
+        tolerance (float): Allowed relative slow down, e.g. 0.25 for 25%.
+
+    Returns:
+        list[str]: Description of each slow down.  Cases that aren't in both runs, and stages faster than MINIMUM_COMPARED_SECONDS in the baseline, are not compared.
+    """
+
+    baseline_cases = {(result["variable_type"], result["rows"], result["columns"]): result for result in baseline}
+    slow_downs = []
+    for result in results:
+        key = (result["variable_type"], result["rows"], result["columns"])
+        if key not in baseline_cases:
+            continue
+        for stage, seconds in result["seconds"].items():
+            baseline_seconds = baseline_cases[key]["seconds"].get(stage)
+            if baseline_seconds is None or baseline_seconds < MINIMUM_COMPARED_SECONDS:
+                continue
+            if seconds > baseline_seconds * (1 + tolerance):
+                slow_downs.append(f"{key[0]} {key[1]} rows {key[2]} columns, {stage}: {seconds:.3f}s against {baseline_seconds:.3f}s")
+    return slow_downs
+
+def main(argv: list[str] | None = None) -> int:
+    """Command line entry point.
+
+    Returns:
+        int: Exit status: 1 if a comparison found a slow down or a fixture was identified as the wrong type, 0 otherwise.
+    """
+
+    parser = argparse.ArgumentParser(description="Benchmark analysis and generation on synthetic fixtures of each variable type.")
+    parser.add_argument("--preset", choices=list(PRESETS), default='quick', help="Fixture sizes to benchmark.  Ignored if --rows and --columns are given.")
+    parser.add_argument("--rows", type=int, nargs='+', default=None, help="Numbers of rows of the fixtures.")
+    parser.add_argument("--columns", type=int, nargs='+', default=None, help="Numbers of columns of the fixtures.")
+    parser.add_argument("--types", nargs='+', choices=VARIABLE_TYPES, default=VARIABLE_TYPES, help="Variable types to benchmark.")
+    parser.add_argument("--repeat", type=int, default=1, help="Number of runs of each fixture; the fastest is kept.")
+    parser.add_argument("--output", default=None, help="Path of the json results file.  Defaults to benchmarks/results/<date>.json.")
+    parser.add_argument("--compare", default=None, help="Path of an earlier json results file to compare against.")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="Allowed relative slow down when comparing, e.g. 0.25 for 25%%.")
+    arguments = parser.parse_args(argv)
+
+    if arguments.rows is not None and arguments.columns is not None:
+        sizes = [(rows, columns) for rows in arguments.rows for columns in arguments.columns]
+    else:
+        sizes = PRESETS[arguments.preset]
+    cases = [(variable_type, rows, columns) for rows, columns in sizes for variable_type in arguments.types]
+
+    results = run_benchmarks(cases, arguments.repeat)
+
+    output = arguments.output
+    if output is None:
+        output = os.path.join(os.path.dirname(os.path.abspath(__file__)), "results", f"{datetime.now().strftime('%Y-%m-%dT%H_%M_%S')}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, 'w') as file:
+        json.dump({"environment": environment(), "results": results}, file, indent=4)
+    print(f"Results written to {output}.")
+
+    status = 0
+    misidentified = [result for result in results if result["identified_as"] != [result["variable_type"]]]
+    for result in misidentified:
+        print(f"WARNING: the {result['variable_type']} fixture with {result['rows']} rows was identified as {result['identified_as']}.")
+        status = 1
+
+    if arguments.compare is not None:
+        with open(arguments.compare, 'r') as file:
+            baseline = json.load(file)["results"]
+        slow_downs = compare(results, baseline, arguments.tolerance)
+        for slow_down in slow_downs:
+            print(f"SLOWER: {slow_down}")
+        if len(slow_downs) > 0:
+            status = 1
+    return status
+
+if __name__ == "__main__":
+    sys.exit(main())